@@ -1,11 +1,6 @@
 import streamlit as st
-from ui_pages.borrower_profile import render_borrower_profile
-from ui_pages.documents import render_documents
-from ui_pages.financial_data import render_financial_data
-from ui_pages.banking_conduct import render_banking_conduct
-from ui_pages.loan_request import render_loan_request
-from ui_pages.assessment import render_assessment
-from ui_pages.ai_scorecard import render_ai_scorecard
+from ui_pages.registry import PAGES, get_renderer, start_prewarm
+from ui_pages.instrumentation import render_page
 # -------------------------------------------------
 # PAGE CONFIG
 # -------------------------------------------------
@@ -18,17 +13,6 @@ st.set_page_config(
 # -------------------------------------------------
 st.sidebar.title("Home")
 
-PAGES = [
-    "Borrower Profile",
-    "Financial Data",
-    "Banking Conduct",
-    "Loan Request",
-    "Assessment",
-    "Documents",
-    "AI Scorecard",
-    "Tools"
-]
-
 # Initialize page state
 if "page" not in st.session_state:
     st.session_state.page = "Borrower Profile"
@@ -40,6 +24,9 @@ for p in PAGES:
 
 page = st.session_state.page
 
+if "application_id" in st.session_state:
+    st.sidebar.caption(f"Application: {st.session_state.application_id}")
+
 # -------------------------------------------------
 # HEADER
 # -------------------------------------------------
@@ -48,27 +35,10 @@ st.caption("Comprehensive credit assessment platform")
 st.divider()
 
 # -------------------------------------------------
-# PAGE ROUTING
+# PAGE ROUTING (lazy imports; every render is timed, see Tools)
 # -------------------------------------------------
-if page == "Borrower Profile":
-    render_borrower_profile()
-
-elif page == "Financial Data":
-    render_financial_data()
-
-elif page == "Banking Conduct":
-    render_banking_conduct()
-
-elif page == "Loan Request":
-    render_loan_request()
-    
-elif page == "Assessment":
-    render_assessment()
-    
-elif page == "Documents":
-    render_documents()
+# page modules are imported on first navigation (see ui_pages/registry.py)
+render_page(page, lambda: get_renderer(page)())
 
-elif page == "AI Scorecard":
-    render_ai_scorecard()
-elif page == "Tools":
-    st.info("Tools page (to be implemented)")
+# after first paint: import the remaining pages in the background
+start_prewarm()
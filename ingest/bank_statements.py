@@ -0,0 +1,276 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# ---------------------------------------------------------------
+# Streaming bank-statement analyzer
+#
+# Statements (CSV / XLSX) are read in fixed-size chunks. Each chunk
+# is reduced with vectorized groupby to per-day aggregates, so what
+# stays in memory is one row per calendar day, not one per transaction.
+# Multi-year statements with hundreds of thousands of rows run in
+# constant memory per chunk.
+#
+# Output matches st.session_state.data["banking_conduct"] keys:
+#   avg_bank_balance_lakh, bounced_cheques, overdrafts,
+#   credit_utilization_pct (only when a sanctioned limit is given)
+# ---------------------------------------------------------------
+
+CHUNK_ROWS = 50_000
+AVG_BALANCE_WINDOW_DAYS = 182       # "last 6 months"
+RUPEES_PER_LAKH = 100_000
+
+COLUMN_ALIASES = {
+    "date": ["txn date", "transaction date", "value date", "date", "posting date"],
+    "narration": ["narration", "description", "particulars", "remarks", "details"],
+    "debit": ["debit", "withdrawal", "withdrawals", "dr", "withdrawal amt"],
+    "credit": ["credit", "deposit", "deposits", "cr", "deposit amt"],
+    "balance": ["balance", "closing balance", "running balance", "available balance"],
+}
+
+BOUNCE_PATTERN = re.compile(
+    r"BOUNCE|RETURN|RTN|DISHONOU?R|INSUFF|FUNDS INSUFFICIENT|UNPAID",
+    re.I,
+)
+
+SCAN_HEADER_ROWS = 30
+
+# day-first formats tried on a sample of the first chunk; the first one
+# that parses every sampled date is used for the whole statement
+DATE_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d-%m-%y",
+    "%d-%b-%Y", "%d-%b-%y", "%d %b %Y", "%d %b %y", "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M",
+]
+DATE_SAMPLE_ROWS = 200
+
+
+# ---------------- Header detection ----------------
+
+def _norm(label):
+    return " ".join(re.sub(r"[^a-z ]+", " ", str(label).lower()).split())
+
+
+def map_columns(header):
+    """
+    Maps statement headers to canonical names. Returns {index: name}.
+    """
+    found = {}
+    for i, h in enumerate(header):
+        if h is None:
+            continue
+        h = _norm(h)
+        for canon, aliases in COLUMN_ALIASES.items():
+            if canon in found.values():
+                continue
+            if any(h == a or h.startswith(a + " ") for a in aliases):
+                found[i] = canon
+                break
+    return found
+
+
+# ---------------- Chunk readers ----------------
+
+def _frames_from_rows(rows, chunk_rows):
+    header_map = None
+    buf = []
+
+    for i, row in enumerate(rows):
+        if header_map is None:
+            if i >= SCAN_HEADER_ROWS:
+                raise ValueError("No transaction header row found in statement")
+            m = map_columns(row)
+            if "date" in m.values() and ({"debit", "credit", "balance"} & set(m.values())):
+                header_map = m
+            continue
+
+        buf.append([row[j] if j < len(row) else None for j in header_map])
+        if len(buf) >= chunk_rows:
+            yield pd.DataFrame(buf, columns=list(header_map.values()))
+            buf = []
+
+    if buf:
+        yield pd.DataFrame(buf, columns=list(header_map.values()))
+
+
+def _iter_xlsx(path, chunk_rows):
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from _frames_from_rows(wb.worksheets[0].iter_rows(values_only=True), chunk_rows)
+    finally:
+        wb.close()
+
+
+def _iter_csv(path, chunk_rows):
+    import csv
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from _frames_from_rows(csv.reader(f), chunk_rows)
+
+
+def iter_statement_chunks(path, chunk_rows=CHUNK_ROWS, ext=None):
+    ext = (ext or os.path.splitext(path)[1].lstrip(".")).lower()
+    if ext == "csv":
+        return _iter_csv(path, chunk_rows)
+    if ext in ("xlsx", "xlsm"):
+        return _iter_xlsx(path, chunk_rows)
+    raise ValueError(f"Unsupported bank statement type: {ext}")
+
+
+# ---------------- Chunk reduction ----------------
+
+def _to_amount(s):
+    """
+    Parses amount strings: "1,20,000.50", "(500)", "2,000.00 Dr".
+    A trailing Dr (overdrawn balance) or parentheses make it negative.
+    """
+    s = s.astype(str).str.replace(r"[,₹\s]", "", regex=True)
+    negative = s.str.contains(r"(?i)dr$|^\(.*\)$")
+    values = pd.to_numeric(
+        s.str.replace(r"(?i)(dr|cr)$", "", regex=True).str.strip("()"),
+        errors="coerce",
+    )
+    return values.where(~negative, -values.abs())
+
+
+def detect_date_format(values):
+    """
+    First DATE_FORMATS entry that parses every non-empty sampled value,
+    or None (mixed or unknown formats).
+    """
+    sample = values.dropna().astype(str).str.strip()
+    sample = sample[sample != ""].head(DATE_SAMPLE_ROWS)
+    if sample.empty:
+        return None
+    for fmt in DATE_FORMATS:
+        if pd.to_datetime(sample, format=fmt, errors="coerce").notna().all():
+            return fmt
+    return None
+
+
+def _parse_dates(values, carry):
+    # XLSX cells usually arrive as datetimes already
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if "date_format" not in carry:
+        carry["date_format"] = detect_date_format(values)
+    fmt = carry["date_format"]
+    if fmt is not None:
+        parsed = pd.to_datetime(values.astype(str).str.strip(), format=fmt, errors="coerce", cache=True)
+        # a row in another format (or a datetime cell) falls back row-wise
+        rest = parsed.isna() & values.notna()
+        if rest.any():
+            parsed[rest] = pd.to_datetime(values[rest], errors="coerce", dayfirst=True)
+        return parsed
+    return pd.to_datetime(values, errors="coerce", dayfirst=True, cache=True)
+
+
+def _reduce_chunk(df, carry):
+    df = df.copy()
+    df["date"] = _parse_dates(df["date"], carry)
+    df = df.dropna(subset=["date"])
+    if df.empty:
+        return None
+
+    for c in ("debit", "credit", "balance"):
+        df[c] = _to_amount(df[c]) if c in df.columns else np.nan
+    df[["debit", "credit"]] = df[["debit", "credit"]].fillna(0.0)
+
+    if df["balance"].isna().all():
+        # no balance column: running balance from flows (opening assumed 0)
+        df["balance"] = carry["running"] + (df["credit"] - df["debit"]).cumsum()
+        carry["running"] = float(df["balance"].iloc[-1])
+
+    bounced = (
+        df["narration"].astype(str).str.contains(BOUNCE_PATTERN)
+        if "narration" in df.columns else pd.Series(False, index=df.index)
+    )
+
+    # file-order span, to tell ascending from newest-first statements
+    carry.setdefault("first_row_day", df["date"].iloc[0])
+    carry["last_row_day"] = df["date"].iloc[-1]
+
+    day = df["date"].dt.normalize()
+    daily = df.assign(day=day, bounced=bounced).groupby("day").agg(
+        first_balance=("balance", "first"),
+        last_balance=("balance", "last"),
+        min_balance=("balance", "min"),
+        debit=("debit", "sum"),
+        credit=("credit", "sum"),
+        bounced=("bounced", "sum"),
+        txns=("balance", "size"),
+    )
+    return daily
+
+
+def _combine(acc, daily):
+    if acc is None:
+        return daily
+    both = pd.concat([acc, daily])
+    return both.groupby(level=0).agg({
+        "first_balance": "first",
+        "last_balance": "last",
+        "min_balance": "min",
+        "debit": "sum",
+        "credit": "sum",
+        "bounced": "sum",
+        "txns": "sum",
+    })
+
+
+# ---------------- Public API ----------------
+
+def analyze_statement(path, sanctioned_limit_lakh=None, chunk_rows=CHUNK_ROWS, ext=None):
+    """
+    Streams one statement and derives banking-conduct metrics.
+
+    Returns a dict with the banking_conduct keys plus
+    transactions / period_start / period_end.
+    """
+
+    acc = None
+    carry = {"running": 0.0}
+
+    for chunk in iter_statement_chunks(path, chunk_rows, ext):
+        daily = _reduce_chunk(chunk, carry)
+        if daily is not None:
+            acc = _combine(acc, daily)
+
+    if acc is None:
+        raise ValueError("No dated transactions found in statement")
+
+    acc = acc.sort_index()
+
+    # file order tells us whether the day's closing balance is its first
+    # or last row (statements are often newest-first)
+    descending = carry["first_row_day"] > carry["last_row_day"]
+    close = acc["first_balance"] if descending else acc["last_balance"]
+
+    # one value per calendar day, carried across days without activity
+    close = close.asfreq("D").ffill()
+    avg_balance = float(
+        close.rolling(AVG_BALANCE_WINDOW_DAYS, min_periods=1).mean().iloc[-1]
+    )
+
+    # overdraft episodes: days the balance goes from >= 0 to < 0
+    negative = acc["min_balance"].reindex(close.index).fillna(close) < 0
+    overdrafts = int((negative & ~negative.shift(1, fill_value=False)).sum())
+
+    result = {
+        "avg_bank_balance_lakh": round(avg_balance / RUPEES_PER_LAKH, 2),
+        "bounced_cheques": int(acc["bounced"].sum()),
+        "overdrafts": overdrafts,
+        "transactions": int(acc["txns"].sum()),
+        "period_start": close.index[0].date(),
+        "period_end": close.index[-1].date(),
+    }
+
+    if sanctioned_limit_lakh:
+        drawn = -close.iloc[-AVG_BALANCE_WINDOW_DAYS:].clip(upper=0)
+        util = float(drawn.mean()) / (sanctioned_limit_lakh * RUPEES_PER_LAKH) * 100
+        result["credit_utilization_pct"] = round(min(max(util, 0.0), 100.0), 2)
+
+    return result
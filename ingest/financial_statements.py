@@ -0,0 +1,242 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import load_workbook
+
+# ---------------------------------------------------------------
+# Financial statement extraction from uploaded XLSX workbooks
+#
+# Workbooks are read with openpyxl in read-only / values-only mode,
+# so rows are streamed instead of loading the whole sheet model.
+# A statement is expected to have one label column and one column per
+# financial year ("FY 2024", "FY24", "2023-24", "Mar-24", ...).
+# Several workbooks are parsed in parallel in a process pool.
+#
+# Output matches st.session_state.financials:
+#   {"FY 2024": {"turnover": ..., "ebitda": ..., ...}, ...}
+# ---------------------------------------------------------------
+
+# field -> label aliases (lower-case, matched as prefixes after cleanup).
+# "Total income" is left out: it includes other income.
+LINE_ITEMS = {
+    "turnover": [
+        "revenue from operations", "turnover", "net sales", "total revenue",
+        "sales",
+    ],
+    "ebitda": ["ebitda", "operating profit", "pbdit"],
+    "net_profit": [
+        "net profit", "profit after tax", "pat", "profit for the year",
+        "profit for the period",
+    ],
+    "net_worth": [
+        "net worth", "total equity", "shareholders funds", "shareholder funds",
+        "equity attributable",
+    ],
+    "total_debt": ["total debt", "total borrowings", "borrowings", "debt"],
+    "dscr": ["dscr", "debt service coverage"],
+    "current_ratio": ["current ratio"],
+    "roce": ["roce", "return on capital employed"],
+}
+
+# fields that are amounts (scaled to ₹ Crore); the rest are ratios
+AMOUNT_FIELDS = {"turnover", "ebitda", "net_profit", "net_worth", "total_debt"}
+
+# a negative value here is an extraction error, not a loss; it is skipped
+NON_NEGATIVE_FIELDS = {"turnover", "total_debt", "dscr", "current_ratio"}
+
+# derived rows ("Debt-equity ratio", "EBITDA margin (%)", "Sales growth")
+# share a prefix with an amount alias but are not amounts
+_DERIVED_LABEL = re.compile(r"%|\b(?:ratio|margin|growth|yoy|per share|days)\b", re.I)
+
+# "Debt to equity", "Total debt / equity", "Borrowings - long term" are
+# ratios or parts of the debt, not the total
+_NOT_TOTAL_DEBT = re.compile(r"/|\b(?:equity|coverage|service|long|short|current)\b", re.I)
+
+UNIT_SCALE = {
+    "crore": 1.0,
+    "cr": 1.0,
+    "lakh": 0.01,
+    "lac": 0.01,
+    "million": 0.1,
+    "mn": 0.1,
+    "thousand": 0.0001,
+}
+
+SCAN_HEADER_ROWS = 30
+
+_FY_LONG = re.compile(r"(?:FY\s*)?((?:19|20)\d{2})\s*[-/]\s*(\d{2,4})", re.I)
+_FY_SHORT = re.compile(r"^FY\s*'?(\d{2}|\d{4})$", re.I)
+_MONTH_YEAR = re.compile(r"^(?:MAR|MARCH)[\s\-']*(\d{2}|\d{4})$", re.I)
+_YEAR = re.compile(r"^((?:19|20)\d{2})$")
+_LABEL_CLEAN = re.compile(r"[^a-z ]+")
+
+
+# ---------------- Parsing helpers ----------------
+
+def parse_fy(value):
+    """
+    Maps a column header to the ending year of the FY, or None.
+    "FY 2024", "FY24", "2023-24", "Mar-24" and 2024 all give 2024.
+    """
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if float(value).is_integer() and 1900 < value < 2100 else None
+    if hasattr(value, "year") and hasattr(value, "month"):
+        return value.year if value.month <= 3 else value.year + 1
+
+    s = str(value).strip()
+    m = _FY_LONG.search(s)
+    if m:
+        end = m.group(2)
+        return int(end) if len(end) == 4 else int(m.group(1)[:2] + end)
+    for rx in (_FY_SHORT, _MONTH_YEAR, _YEAR):
+        m = rx.match(s)
+        if m:
+            y = m.group(1)
+            return int(y) if len(y) == 4 else 2000 + int(y)
+    return None
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    s = str(value).strip().replace(",", "").replace("₹", "")
+    neg = s.startswith("(") and s.endswith(")")
+    s = s.strip("()")
+    try:
+        v = float(s)
+    except ValueError:
+        return None
+    return -v if neg else v
+
+
+def _match_field(label):
+    """
+    The field whose longest alias prefixes the label, so "Debt service
+    coverage" is dscr, not total_debt via "debt".
+    """
+
+    raw = str(label)
+    derived = bool(_DERIVED_LABEL.search(raw))
+    label = _LABEL_CLEAN.sub(" ", raw.lower()).strip()
+    label = " ".join(label.split())
+    if not label:
+        return None
+
+    best, best_len = None, 0
+    for field, aliases in LINE_ITEMS.items():
+        if derived and field in AMOUNT_FIELDS:
+            continue
+        if field == "total_debt" and _NOT_TOTAL_DEBT.search(raw):
+            continue
+        for alias in aliases:
+            if len(alias) > best_len and (label == alias or label.startswith(alias + " ")):
+                best, best_len = field, len(alias)
+    return best
+
+
+def _detect_scale(cells):
+    text = " ".join(str(c).lower() for c in cells if isinstance(c, str))
+    for unit, factor in UNIT_SCALE.items():
+        if re.search(rf"\b{unit}s?\b", text):
+            return factor
+    return 1.0
+
+
+# ---------------- Single workbook (runs in worker processes) ----------------
+
+def extract_workbook(path):
+    """
+    Extracts standard line items from every sheet of one workbook.
+    Returns {"FY 2024": {field: value}}; the first value found wins.
+    """
+
+    out = {}
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            fy_cols = None
+            scale = 1.0
+            first_fy_col = 0
+            head_seen = []
+
+            for i, row in enumerate(ws.iter_rows(values_only=True)):
+                if fy_cols is None:
+                    if i >= SCAN_HEADER_ROWS:
+                        break
+                    head_seen.extend(row)
+                    cols = {j: parse_fy(v) for j, v in enumerate(row)}
+                    cols = {j: fy for j, fy in cols.items() if fy}
+                    if cols:
+                        fy_cols = cols
+                        scale = _detect_scale(head_seen)
+                        first_fy_col = min(fy_cols)
+                    continue
+
+                # label = first text cell left of the FY columns
+                label = next(
+                    (c for c in row[:first_fy_col] if isinstance(c, str) and c.strip()),
+                    None
+                )
+                field = _match_field(label) if label else None
+                if field is None:
+                    continue
+
+                for j, fy in fy_cols.items():
+                    if j >= len(row):
+                        continue
+                    v = _to_float(row[j])
+                    if v is None or (v < 0 and field in NON_NEGATIVE_FIELDS):
+                        continue
+                    bucket = out.setdefault(f"FY {fy}", {})
+                    if field not in bucket:
+                        bucket[field] = round(v * scale, 4) if field in AMOUNT_FIELDS else v
+    finally:
+        wb.close()
+
+    return out
+
+
+def _safe_extract(path):
+    try:
+        return path, extract_workbook(path), None
+    except Exception as exc:   # a bad upload must not sink the batch
+        return path, {}, str(exc)
+
+
+# ---------------- Batch ----------------
+
+def extract_financials(paths, max_workers=None):
+    """
+    Parses several workbooks concurrently and merges them. Earlier
+    paths take precedence for a field (pass audited statements first).
+
+    Returns (financials, errors) where errors maps path -> message.
+    """
+
+    paths = list(paths)
+    if not paths:
+        return {}, {}
+
+    if len(paths) == 1:
+        results = [_safe_extract(paths[0])]
+    else:
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_safe_extract, paths))
+
+    merged, errors = {}, {}
+    for path, data, err in results:
+        if err:
+            errors[path] = err
+        for fy, fields in data.items():
+            bucket = merged.setdefault(fy, {})
+            for k, v in fields.items():
+                bucket.setdefault(k, v)
+
+    return dict(sorted(merged.items())), errors
@@ -0,0 +1,273 @@
+import json
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# Compact master frame + free-text side store
+#
+# The master workbook mixes scoring inputs with ~20 long free-text
+# columns (addresses, promoter background, business plan, ESG notes,
+# market position ...) that no scoring step reads. Ingest splits them:
+#
+#   compact frame   every other column; float64 -> float32, integers
+#                   downcast, repetitive strings -> category. Each row
+#                   keeps its master position as `row_id`.
+#   text store      SQLite, one JSON payload per row_id, fetched only
+#                   when a page asks for specific rows.
+#
+# Both are built once per master content hash under MASTER_CACHE_DIR,
+# so later loads skip parsing the workbook altogether.
+#
+# Measured on the bundled master (3,200 rows): 4.19 MB deep for the
+# full frame vs 0.89 MB compact, about 4.7x, short of 10x. Most of the
+# "free-text" columns here hold short values: 4 are entirely empty and
+# several are 2-3-valued ("Yes"/"No", "Low"/"Medium"/"High"). Moving
+# them out saves little. What remains is the scoring core: about 40
+# numeric columns, already float32, and the identifier strings, which
+# stay plain str because they are join / group keys. That core is the
+# floor. Empty text columns are dropped rather than stored.
+# ---------------------------------------------------------------
+
+CACHE_DIR = os.environ.get(
+    "MASTER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "master_cache")
+)
+
+ROW_ID = "row_id"
+
+TEXT_COLUMNS = [
+    "Registered Address",
+    "Contact Person",
+    "Email",
+    "Phone",
+    "Proposed Utilization Plan",
+    "Security Offered",
+    "Guarantors/Co-applicants",
+    "Business Plan & Cash Flow Projections",
+    "Existing Loan - Lender Name",
+    "Existing Loan - Security",
+    "Promoter Background Check",
+    "Promoter Experience & Track Record",
+    "Management Track Record Notes",
+    "Group Exposure Risk Assessment",
+    "Industry Outlook Notes",
+    "Market Position & Competitive Advantage",
+    "Customer Base Analysis",
+    "Supplier Relations & Dependencies",
+    "Operational Risk Assessment",
+    "ESG Compliance Notes",
+    "Regulatory Compliance Status",
+]
+
+# identifiers stay plain strings: they are join and group keys
+KEY_COLUMNS = ["CustomerID", "ProspectNo", "PAN", "GSTIN", "Company Name", "CIN Number"]
+
+# a string column becomes categorical when distinct values are at most
+# this share of the rows
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _digest(path):
+    from model.registry import file_sha256
+    return file_sha256(path)[:16]
+
+
+# ---------------- Compaction ----------------
+
+def compact_frame(df):
+    """
+    Downcasts numerics and turns repetitive strings into categoricals.
+    Returns a new frame; column names and order are unchanged.
+    """
+
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        kind = s.dtype.kind
+        if kind == "f":
+            out[col] = s.astype(np.float32)
+        elif kind in "iu":
+            out[col] = pd.to_numeric(s, downcast="integer")
+        elif kind == "O" and col not in KEY_COLUMNS and s.nunique(dropna=True) <= CATEGORY_MAX_RATIO * max(len(s), 1):
+            out[col] = s.astype("category")
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def split_master(raw):
+    """
+    raw master -> (compact frame without text columns, text frame),
+    both indexed by row_id.
+    """
+
+    raw = raw.reset_index(drop=True)
+    raw.index.name = ROW_ID
+    text_cols = [c for c in TEXT_COLUMNS if c in raw.columns]
+    # an all-empty note column carries nothing: kept out of both sides
+    stored = [c for c in text_cols if raw[c].notna().any()]
+    return compact_frame(raw.drop(columns=text_cols)), raw[stored]
+
+
+# ---------------- Text side store ----------------
+
+class TextStore:
+    """
+    Read side of the free-text store. One connection per thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def columns(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'columns'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    def fetch(self, row_ids, columns=None):
+        """
+        DataFrame indexed by row_id with the requested text columns
+        (all when None). Unknown row ids are skipped.
+        """
+
+        ids = [int(i) for i in row_ids]
+        wanted = columns or self.columns()
+        rows = []
+        # stay well under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows += self._conn().execute(
+                f"SELECT row_id, payload FROM text WHERE row_id IN ({marks})", chunk
+            ).fetchall()
+
+        frame = pd.DataFrame(
+            [{ROW_ID: rid, **{c: json.loads(p).get(c) for c in wanted}} for rid, p in rows],
+            columns=[ROW_ID] + list(wanted),
+        ).set_index(ROW_ID)
+        # caller's order, without the ids that were not found
+        return frame.loc[[i for i in ids if i in frame.index]]
+
+    def iter_rows(self, columns=None, batch=5000):
+        """
+        Yields (row_ids, DataFrame of text) in row_id order, `batch` rows
+        at a time, so a full pass never holds all the text in memory.
+        """
+
+        wanted = columns or self.columns()
+        cur = self._conn().execute("SELECT row_id, payload FROM text ORDER BY row_id")
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            ids = [r for r, _ in rows]
+            yield ids, pd.DataFrame(
+                [{c: json.loads(p).get(c) for c in wanted} for _, p in rows],
+                index=pd.Index(ids, name=ROW_ID),
+                columns=list(wanted),
+            )
+
+
+def _write_text_store(path, text):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE text (row_id INTEGER PRIMARY KEY, payload TEXT NOT NULL)")
+        conn.execute("INSERT INTO meta VALUES ('columns', ?)", (json.dumps(list(text.columns)),))
+        records = text.astype(object).where(text.notna(), None)
+        conn.executemany(
+            "INSERT INTO text VALUES (?, ?)",
+            (
+                (int(rid), json.dumps({c: (None if v is None else str(v)) for c, v in zip(text.columns, vals)}))
+                for rid, vals in zip(records.index, records.itertuples(index=False, name=None))
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+# ---------------- Build / load ----------------
+
+def _paths(digest, cache_dir):
+    return (
+        os.path.join(cache_dir, f"{digest}.frame.pkl"),
+        os.path.join(cache_dir, f"{digest}.text.sqlite"),
+    )
+
+
+def ingest_master(path, cache_dir=CACHE_DIR):
+    """
+    Builds (or reuses) the compact frame and text store for the
+    master at `path`. Returns (compact frame, TextStore).
+    """
+
+    os.makedirs(cache_dir, exist_ok=True)
+    frame_path, text_path = _paths(_digest(path), cache_dir)
+
+    if not (os.path.exists(frame_path) and os.path.exists(text_path)):
+        raw = pd.read_excel(path)
+        raw.columns = [c.strip() for c in raw.columns]
+        compact, text = split_master(raw)
+
+        _write_text_store(text_path, text)
+        tmp = f"{frame_path}.tmp.{os.getpid()}"
+        compact.to_pickle(tmp)
+        os.replace(tmp, frame_path)
+        return compact, TextStore(text_path)
+
+    return pd.read_pickle(frame_path), TextStore(text_path)
+
+
+@lru_cache(maxsize=2)
+def _cached(path, digest):
+    return ingest_master(path)
+
+
+def load_compact_master(path):
+    """
+    Compact master for `path`, held once per process per content hash.
+    Callers get a shallow copy so they can add columns freely.
+    """
+
+    frame, _ = _cached(path, _digest(path))
+    return frame.copy(deep=False)
+
+
+def get_text_store(path):
+    return _cached(path, _digest(path))[1]
+
+
+def memory_report(path):
+    """
+    Deep memory (MB) of the full workbook frame vs the compact frame
+    (about 4.7x on the bundled master; see the module header).
+    """
+
+    raw = pd.read_excel(path)
+    compact = load_compact_master(path)
+    full = raw.memory_usage(deep=True).sum() / 2**20
+    small = compact.memory_usage(deep=True).sum() / 2**20
+    return {"full_mb": round(full, 2), "compact_mb": round(small, 2), "ratio": round(full / small, 1)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(memory_report(sys.argv[1] if len(sys.argv) > 1 else "data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx"))
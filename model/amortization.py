@@ -0,0 +1,260 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# Repayment schedules and projected DSCR
+#
+# Every schedule is closed-form in the month index, so a batch of
+# loans is one (loans x months) array operation. There is no loop
+# over loans or months.
+#
+#   EMI         level annuity payment
+#   Structured  step-up principal: month m repays m / (1 + ... + n)
+#   Bullet      interest monthly, all principal at maturity. The
+#               master's "Interest Only" mode is the same profile.
+#
+# Months past a loan's tenure are zero. The master and the loan request
+# carry an interest *type*, not a rate, so the rate comes from
+# LOAN_RATE_<TYPE> (annual %).
+#
+# Projected DSCR for each loan year = EBITDA / (year's debt service +
+# existing debt service), with EBITDA held at the latest FY unless a
+# growth rate is given.
+# ---------------------------------------------------------------
+
+MODES = ["EMI", "STRUCTURED", "BULLET"]
+
+# other labels for the MODES profiles
+MODE_ALIASES = {"INTEREST ONLY": "BULLET"}
+
+RATES = {
+    "FIXED": float(os.environ.get("LOAN_RATE_FIXED", "10.5")),
+    "FLOATING": float(os.environ.get("LOAN_RATE_FLOATING", "9.75")),
+    "HYBRID": float(os.environ.get("LOAN_RATE_HYBRID", "10.0")),
+}
+DEFAULT_RATE = RATES["FIXED"]
+
+MAX_TENURE = 360
+
+# loans per batch chunk: bounds the (loans x months) arrays
+CHUNK_LOANS = int(os.environ.get("AMORTIZATION_CHUNK", "20000"))
+
+MASTER_PATH = "data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx"
+
+
+def annual_rate(interest_type):
+    """
+    Annual % for one or many interest-type labels.
+    """
+    types = pd.Series(np.atleast_1d(interest_type), dtype=object).astype(str).str.strip().str.upper()
+    return types.map(RATES).fillna(DEFAULT_RATE).to_numpy(dtype=float)
+
+
+def mode_codes(modes):
+    """
+    Repayment-mode labels -> index into MODES; unknown modes are EMI.
+    """
+    labels = (
+        pd.Series(np.atleast_1d(modes), dtype=object).astype(str)
+        .str.upper().str.replace(r"[\s_-]+", " ", regex=True).str.strip()
+    )
+    codes = {m: i for i, m in enumerate(MODES)}
+    codes.update({alias: codes[m] for alias, m in MODE_ALIASES.items()})
+    return labels.map(codes).fillna(0).to_numpy(dtype=np.int8)
+
+
+# ---------------- Schedules ----------------
+
+def schedules(principal, rate_pct, tenure, mode):
+    """
+    Monthly schedules for n loans. Arguments are length-n arrays
+    (tenure in months, mode as MODES codes). Returns a dict of
+    (n x max tenure) arrays: opening, interest, principal, payment.
+    """
+
+    P = np.asarray(principal, dtype=float)[:, None]
+    n = np.clip(np.round(np.asarray(tenure, dtype=float)), 1, MAX_TENURE)[:, None]
+    r = (np.asarray(rate_pct, dtype=float) / 1200.0)[:, None]
+    mode = np.asarray(mode)[:, None]
+
+    T = int(n.max()) if n.size else 0
+    m = np.arange(1, T + 1, dtype=float)[None, :]
+    active = m <= n
+
+    # EMI: balance after k payments = P g^k - emi (g^k - 1) / r, g = 1 + r
+    g = 1.0 + r
+    safe_r = np.where(r > 0, r, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(r > 0, P * r / (1.0 - g ** -n), P / n)
+    gk = g ** (m - 1)
+    emi_open = np.where(r > 0, P * gk - emi * (gk - 1.0) / safe_r, P - emi * (m - 1))
+
+    # Structured: principal_m = P m / S, S = n(n+1)/2
+    S = n * (n + 1) / 2.0
+    st_open = P * (1.0 - (m - 1) * m / 2.0 / S)
+
+    # np.where broadcasts the (n x 1) mode column across months
+    opening = np.where(mode == 0, emi_open, np.where(mode == 1, st_open, P))
+    opening = np.where(active, np.maximum(opening, 0.0), 0.0)
+    interest = opening * r
+
+    principal_paid = np.where(
+        mode == 0, emi - interest,
+        np.where(mode == 1, P * m / S, np.where(m == n, P, 0.0))
+    )
+    principal_paid = np.where(active, principal_paid, 0.0)
+
+    return {
+        "opening": opening,
+        "interest": interest,
+        "principal": principal_paid,
+        "payment": interest + principal_paid,
+    }
+
+
+def annual_debt_service(payment):
+    """
+    (n x months) payments -> (n x loan years) sums of 12-month blocks.
+    """
+    n, T = payment.shape
+    years = -(-T // 12)
+    padded = np.zeros((n, years * 12))
+    padded[:, :T] = payment
+    return padded.reshape(n, years, 12).sum(axis=2)
+
+
+def projected_dscr(payment, ebitda, existing_service=0.0, ebitda_growth=0.0):
+    """
+    Per loan year: EBITDA / (debt service + existing debt service).
+    NaN for years after the loan has run off.
+    """
+
+    service = annual_debt_service(payment)
+    years = np.arange(service.shape[1])[None, :]
+    ebitda = np.asarray(ebitda, dtype=float)[:, None] * (1.0 + ebitda_growth) ** years
+    total = service + np.asarray(existing_service, dtype=float).reshape(-1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(service > 0, ebitda / total, np.nan)
+    return dscr
+
+
+# ---------------- One loan (Loan Request page) ----------------
+
+def loan_schedule(amount_cr, tenure_months, repayment_mode, interest_type="Fixed", rate_pct=None):
+    """
+    Monthly schedule for one loan as a DataFrame (₹ Cr).
+    """
+
+    rate = annual_rate(interest_type) if rate_pct is None else np.array([rate_pct], dtype=float)
+    s = schedules([amount_cr], rate, [tenure_months], mode_codes(repayment_mode))
+    months = int(np.clip(tenure_months, 1, MAX_TENURE))
+    return pd.DataFrame(
+        {k: v[0, :months] for k, v in s.items()},
+        index=pd.RangeIndex(1, months + 1, name="month"),
+    )
+
+
+def yearly_summary(schedule, ebitda_cr=None, existing_service_cr=0.0):
+    """
+    Loan-year debt service (and projected DSCR when EBITDA is known).
+    """
+
+    by_year = schedule.groupby((schedule.index - 1) // 12 + 1).sum()
+    by_year.index.name = "year"
+    out = by_year[["interest", "principal", "payment"]].rename(columns={"payment": "debt_service"})
+    out["closing"] = schedule["opening"].groupby((schedule.index - 1) // 12 + 1).first() - out["principal"]
+    if ebitda_cr is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["projected_dscr"] = ebitda_cr / (out["debt_service"] + existing_service_cr)
+    return out
+
+
+# ---------------- Batch over the master ----------------
+
+def batch_schedules(loans, chunk=CHUNK_LOANS):
+    """
+    loans: DataFrame with amount, tenure, mode, interest_type, ebitda.
+    Returns one row per loan: rate, first payment, total interest,
+    year-1 debt service, min / mean projected DSCR.
+    Loans are processed `chunk` at a time, each chunk one array operation.
+    """
+
+    from model.ews_model import num
+
+    amount = loans["amount"].astype(object).apply(num).to_numpy(dtype=float)
+    tenure = loans["tenure"].astype(object).apply(num).to_numpy(dtype=float)
+    ebitda = loans["ebitda"].astype(object).apply(num).to_numpy(dtype=float)
+    rate = annual_rate(loans["interest_type"].to_numpy())
+    mode = mode_codes(loans["mode"].to_numpy())
+
+    ok = (amount > 0) & (tenure > 0)
+    out = pd.DataFrame(index=loans.index, columns=[
+        "rate_pct", "first_payment", "total_interest", "year1_service", "min_dscr", "mean_dscr",
+    ], dtype=float)
+
+    idx = np.flatnonzero(ok)
+    for start in range(0, len(idx), chunk):
+        sel = idx[start:start + chunk]
+        s = schedules(amount[sel], rate[sel], tenure[sel], mode[sel])
+        dscr = projected_dscr(s["payment"], ebitda[sel])
+        valid = ~np.isnan(dscr)
+        count = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out.iloc[sel] = np.column_stack([
+                rate[sel],
+                s["payment"][:, 0],
+                s["interest"].sum(axis=1),
+                s["payment"][:, :12].sum(axis=1),
+                np.where(count > 0, np.where(valid, dscr, np.inf).min(axis=1), np.nan),
+                np.where(valid, dscr, 0.0).sum(axis=1) / count,
+            ])
+    return out
+
+
+def master_loans(path=MASTER_PATH):
+    """
+    Latest request per borrower from the master, in batch_schedules form.
+    """
+
+    from model.ews_model import load_master
+
+    df = load_master(path)
+    latest = df.sort_values("FY").groupby("CustomerID", observed=True).tail(1)
+
+    def col(name):
+        return latest[name] if name in latest.columns else pd.Series(np.nan, index=latest.index)
+
+    return pd.DataFrame({
+        "CustomerID": latest["CustomerID"],
+        "Company Name": latest["Company Name"],
+        "amount": col("Loan Amount"),
+        "tenure": col("Tenure (Months)"),
+        "mode": col("Repayment Mode"),
+        "interest_type": col("Interest Type Preference"),
+        "ebitda": col("EBITDA (₹ Crore)"),
+    })
+
+
+def run_master_batch(path=MASTER_PATH):
+    loans = master_loans(path)
+    return loans[["CustomerID", "Company Name"]].join(batch_schedules(loans))
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 50_000
+    loans = pd.DataFrame({
+        "amount": rng.uniform(1, 500, n),
+        "tenure": rng.integers(12, 121, n),
+        "mode": rng.choice(["EMI", "Structured", "Bullet", "Interest Only"], n),
+        "interest_type": rng.choice(["Fixed", "Floating", "Hybrid"], n),
+        "ebitda": rng.uniform(5, 200, n),
+    })
+    t0 = time.perf_counter()
+    res = batch_schedules(loans)
+    print(f"{n:,} schedules in {time.perf_counter() - t0:.2f}s")
+    print(res.describe().round(2))
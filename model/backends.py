@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+
+# ---------------------------------------------------------------
+# Model backends
+#
+# Every backend exposes fit(X, y) -> self and predict(X) -> ndarray,
+# so the registry, the scorecard and the benchmark harness never
+# care which one is configured. Choose with MODEL_BACKEND:
+#
+#   ridge   sklearn SimpleImputer + Ridge (the original pipeline)
+#   hgb     sklearn HistGradientBoostingRegressor (handles NaN natively)
+#   numpy   closed-form ridge in NumPy: no sklearn at scoring time and
+#           the cheapest single-row prediction
+# ---------------------------------------------------------------
+
+DEFAULT_BACKEND = os.environ.get("MODEL_BACKEND", "ridge")
+
+
+def _as_array(X):
+    return np.asarray(X, dtype=np.float64)
+
+
+class NumpyLinear:
+    """
+    Ridge regression solved in closed form on median-imputed features.
+    Same objective as sklearn's Ridge with fit_intercept (centred X and
+    y, intercept unpenalised), so it reproduces the "ridge" backend.
+    """
+
+    def __init__(self, alpha=1.2):
+        self.alpha = alpha
+
+    def fit(self, X, y):
+        X = _as_array(X)
+        y = np.asarray(y, dtype=np.float64)
+
+        medians = np.nanmedian(X, axis=0)
+        self.medians_ = np.where(np.isnan(medians), 0.0, medians)
+        X = np.where(np.isnan(X), self.medians_, X)
+
+        x_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        Xc = X - x_mean
+
+        gram = Xc.T @ Xc + self.alpha * np.eye(X.shape[1])
+        self.coef_ = np.linalg.solve(gram, Xc.T @ (y - y_mean))
+        self.intercept_ = y_mean - x_mean @ self.coef_
+        return self
+
+    def predict(self, X):
+        X = _as_array(X)
+        X = np.where(np.isnan(X), self.medians_, X)
+        return X @ self.coef_ + self.intercept_
+
+
+def _ridge(alpha=1.2):
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ("imp", SimpleImputer(strategy="median")),
+        ("model", Ridge(alpha=alpha))
+    ])
+
+
+def _hgb(max_iter=200, learning_rate=0.05, max_leaf_nodes=31, random_state=0):
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    return HistGradientBoostingRegressor(
+        max_iter=max_iter,
+        learning_rate=learning_rate,
+        max_leaf_nodes=max_leaf_nodes,
+        random_state=random_state,
+    )
+
+
+BACKENDS = {
+    "ridge": _ridge,
+    "hgb": _hgb,
+    "numpy": NumpyLinear,
+}
+
+
+def make_backend(name=None, **params):
+    """
+    Returns an unfitted model for backend `name` (default MODEL_BACKEND).
+    """
+
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown model backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**params)
@@ -0,0 +1,156 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model.backends import make_backend
+from model.bands import band_number
+from model.ews_model import FEATURES, TARGET, MASTER_PATH, load_master, build_features, training_frame
+from model.registry import REGISTRY_DIR, file_sha256
+
+# ---------------------------------------------------------------
+# Walk-forward backtest of the FH forecast
+#
+# Fold t scores every company from its FY t features, predicting
+# FY t+1. It trains only on pairs whose target year is <= t (feature
+# year < t), i.e. exactly what was known when FY t closed. Training
+# on "FY <= t" rows directly would leak: a row's FH_Next at FY t is
+# the FY t+1 score being tested.
+#
+# The feature matrix is built once per master and scorecard version,
+# cached as .npz next to the model registry, and handed to each worker process
+# once through the pool initializer, so folds only slice arrays.
+# ---------------------------------------------------------------
+
+CACHE_DIR = os.path.join(REGISTRY_DIR, "features")
+
+# scorecard decision thresholds (ai_scorecard)
+DECISION_EDGES = [60, 75]                   # Reject | Review | Approve
+
+_SHARED = {}
+
+
+# ---------------- Feature cache ----------------
+
+def feature_matrix(path=MASTER_PATH, cache_dir=CACHE_DIR):
+    """
+    Returns {"X", "y", "fy"} arrays for every master row that has a
+    following year, cached per master content hash and scorecard.
+    """
+
+    from model.scorecard import champion
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # FH_Score is a feature: a scorecard edit must invalidate the cache too
+    cache = os.path.join(cache_dir, f"{file_sha256(path)[:16]}.{champion().digest}.npz")
+
+    if os.path.exists(cache):
+        with np.load(cache) as z:
+            return {k: z[k] for k in ("X", "y", "fy")}
+
+    train = training_frame(build_features(load_master(path), entity_col="Company Name"))
+    arrays = {
+        "X": train[FEATURES].to_numpy(dtype=np.float64),
+        "y": train[TARGET].to_numpy(dtype=np.float64),
+        "fy": train["FY"].to_numpy(dtype=np.int64),
+    }
+    tmp = f"{cache}.tmp.{os.getpid()}.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, cache)
+    return arrays
+
+
+# ---------------- Folds ----------------
+
+def _init_worker(X, y, fy):
+    _SHARED.update(X=X, y=y, fy=fy)
+
+
+def _run_fold(t, backend, params):
+    X, y, fy = _SHARED["X"], _SHARED["y"], _SHARED["fy"]
+
+    train = fy < t
+    test = fy == t
+
+    t0 = time.perf_counter()
+    model = make_backend(backend, **params).fit(X[train], y[train])
+    fit_s = time.perf_counter() - t0
+
+    return t, int(train.sum()), model.predict(X[test]), fit_s
+
+
+def _metrics(actual, pred, current):
+    if not len(actual):
+        return {}
+    return {
+        "mae": float(np.mean(np.abs(actual - pred))),
+        "persistence_mae": float(np.mean(np.abs(actual - current))),
+        "band_accuracy": float(np.mean(band_number(pred) == band_number(actual))),
+        "decision_flip_rate": float(np.mean(
+            np.searchsorted(DECISION_EDGES, pred, side="right")
+            != np.searchsorted(DECISION_EDGES, actual, side="right")
+        )),
+    }
+
+
+def run_backtest(path=MASTER_PATH, backend=None, max_workers=None, **params):
+    """
+    One row per fold (test FY t -> t+1) plus an "all" row pooled over
+    every test prediction. Columns: train_rows, test_rows, mae,
+    persistence_mae, band_accuracy, decision_flip_rate, fit_s.
+    """
+
+    data = feature_matrix(path)
+    X, y, fy = data["X"], data["y"], data["fy"]
+    current = X[:, FEATURES.index("FH_Score")]
+
+    years = sorted(int(t) for t in np.unique(fy) if (fy < t).any())
+    if not years:
+        return pd.DataFrame()
+
+    workers = min(max_workers or os.cpu_count() or 1, len(years))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(X, y, fy)
+    ) as pool:
+        folds = list(pool.map(_run_fold, years, [backend] * len(years), [params] * len(years)))
+
+    rows, all_pred, all_test = [], [], []
+    for t, n_train, pred, fit_s in folds:
+        test = fy == t
+        rows.append(dict(
+            fy=f"{t}→{t + 1}",
+            train_rows=n_train,
+            test_rows=int(test.sum()),
+            fit_s=round(fit_s, 4),
+            **_metrics(y[test], pred, current[test]),
+        ))
+        all_pred.append(pred)
+        all_test.append(np.flatnonzero(test))
+
+    idx = np.concatenate(all_test)
+    rows.append(dict(
+        fy="all",
+        train_rows=None,
+        test_rows=len(idx),
+        fit_s=round(sum(r["fit_s"] for r in rows), 4),
+        **_metrics(y[idx], np.concatenate(all_pred), current[idx]),
+    ))
+    return pd.DataFrame(rows).set_index("fy").round(4)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Walk-forward backtest of the FH forecast")
+    ap.add_argument("--master", default=MASTER_PATH)
+    ap.add_argument("--backend", default=None)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    report = run_backtest(args.master, backend=args.backend, max_workers=args.workers)
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print(report)
+    print(f"\n{time.perf_counter() - t0:.2f} s")
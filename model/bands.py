@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------
+# SB RISK BAND LADDER
+# FH score -> SB1 (best) .. SB13 (worst), 5-point bands above 35.
+# Band 0 means "no score" (NaN).
+# --------------------------------------------------
+BANDS = [
+    # band,  label,          floor
+    ("SB1",  "Excellent",    90),
+    ("SB2",  "Very Good",    85),
+    ("SB3",  "Good",         80),
+    ("SB4",  "Good",         75),
+    ("SB5",  "Satisfactory", 70),
+    ("SB6",  "Satisfactory", 65),
+    ("SB7",  "Acceptable",   60),
+    ("SB8",  "Acceptable",   55),
+    ("SB9",  "Marginal",     50),
+    ("SB10", "Marginal",     45),
+    ("SB11", "Weak",         40),
+    ("SB12", "Weak",         35),
+    ("SB13", "Poor",         0),
+]
+
+N_BANDS = len(BANDS)
+BAND_NAMES = [b for b, _, _ in BANDS]
+
+# ascending floors of SB12..SB1; searchsorted gives how many a score clears
+_EDGES = np.array([floor for _, _, floor in BANDS[:-1]][::-1], dtype=float)
+
+
+def band_number(scores):
+    """
+    Vectorized: FH score(s) -> 1..13 (SB number), 0 where the score is NaN.
+    """
+
+    scores = np.asarray(scores, dtype=float)
+    out = N_BANDS - np.searchsorted(_EDGES, scores, side="right")
+    return np.where(np.isnan(scores), 0, out)
+
+
+def band_label(score):
+    """
+    Single score -> "SB3 · Good".
+    """
+
+    n = int(band_number(score))
+    if n == 0:
+        return "Unscored"
+    band, label, _ = BANDS[n - 1]
+    return f"{band} · {label}"
+
+
+def band_ranges():
+    """
+    [(band, label, "90–100"), ...] for display.
+    """
+
+    rows = []
+    upper = 100
+    for band, label, floor in BANDS:
+        rows.append((band, label, f"{floor}–{upper}" if floor else f"<{upper + 1}"))
+        upper = floor - 1
+    return rows
+
+
+# --------------------------------------------------
+# YEAR-ON-YEAR BAND MIGRATION
+# --------------------------------------------------
+def migration_counts(df, entity_col="Company Name", fy_col="FY", score_col="FH_Score"):
+    """
+    Transition counts between consecutive FYs of the same entity, for
+    every year at once. Returns a DataFrame indexed by (to_fy, from_band)
+    with one column per to_band (SB1..SB13).
+    """
+
+    frame = df[[entity_col, fy_col, score_col]].dropna()
+    frame = frame.sort_values([entity_col, fy_col], kind="mergesort")
+
+    entity = pd.factorize(frame[entity_col])[0]
+    fy = frame[fy_col].to_numpy(dtype=np.int64)
+    band = band_number(frame[score_col].to_numpy())
+
+    # a pair is (row i-1 -> row i) of the same entity in consecutive years
+    pair = (entity[1:] == entity[:-1]) & (fy[1:] == fy[:-1] + 1)
+    src, dst, to_fy = band[:-1][pair] - 1, band[1:][pair] - 1, fy[1:][pair]
+
+    years, year_idx = np.unique(to_fy, return_inverse=True)
+    flat = (year_idx * N_BANDS + src) * N_BANDS + dst
+    counts = np.bincount(flat, minlength=len(years) * N_BANDS * N_BANDS)
+
+    index = pd.MultiIndex.from_product([years, BAND_NAMES], names=["to_fy", "from_band"])
+    return pd.DataFrame(
+        counts.reshape(len(years) * N_BANDS, N_BANDS),
+        index=index,
+        columns=pd.Index(BAND_NAMES, name="to_band"),
+    )
+
+
+def migration_matrix(counts, fy=None, normalize=True):
+    """
+    One transition matrix from migration_counts(): a single year
+    (`fy`) or all years pooled. Rows sum to 1 when normalize=True;
+    bands nobody started in stay 0.
+    """
+
+    m = counts.xs(fy, level="to_fy") if fy is not None else counts.groupby(level="from_band", sort=False).sum()
+    m = m.reindex(BAND_NAMES)
+    if normalize:
+        totals = m.sum(axis=1).replace(0, np.nan)
+        m = m.div(totals, axis=0).fillna(0.0)
+    return m
+
+
+def migration_summary(counts):
+    """
+    Per to_fy share of companies that upgraded, stayed or downgraded.
+    """
+
+    rows = []
+    for fy, m in counts.groupby(level="to_fy"):
+        a = m.to_numpy()
+        total = a.sum()
+        if not total:
+            continue
+        rows.append({
+            "to_fy": fy,
+            "pairs": int(total),
+            # rows are from-band, columns to-band, SB1 first: below the
+            # diagonal is a move to a better band
+            "upgraded": np.tril(a, -1).sum() / total,
+            "stable": np.trace(a) / total,
+            "downgraded": np.triu(a, 1).sum() / total,
+        })
+    return pd.DataFrame(rows).set_index("to_fy").round(4)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser(description="Time band migration on synthetic company-years")
+    ap.add_argument("--companies", type=int, default=500_000)
+    ap.add_argument("--years", type=int, default=6)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.companies * args.years
+    synthetic = pd.DataFrame({
+        "Company Name": np.repeat(np.arange(args.companies), args.years),
+        "FY": np.tile(np.arange(2020, 2020 + args.years), args.companies),
+        "FH_Score": np.clip(60 + 15 * rng.standard_normal(n), 0, 100),
+    })
+
+    t0 = time.perf_counter()
+    counts = migration_counts(synthetic)
+    print(f"{n:,} company-years -> {int(counts.to_numpy().sum()):,} transitions in {time.perf_counter() - t0:.2f} s")
+    print(migration_summary(counts))
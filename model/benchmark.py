@@ -0,0 +1,164 @@
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from model.backends import BACKENDS
+from model.ews_model import (
+    FEATURES, TARGET, MASTER_PATH, load_master, build_features, training_frame, fit_model, model_inputs
+)
+
+# ---------------------------------------------------------------
+# Backend benchmark
+#
+# For every backend x data scale:
+#   fit_s        wall time of one fit on all rows before the test year
+#   fit_peak_mb  peak Python heap of a second, traced fit (tracemalloc
+#                slows every allocation, so it is kept out of fit_s)
+#   model_kb     pickled model size
+#   single_us    median latency of a one-row predict (the scorecard path)
+#   batch_us_row per-row latency of one predict over the whole test year
+#   oot_mae      MAE on the held-out latest year (out-of-time)
+#
+# Scale-ups replicate the master's companies with jittered features,
+# keeping each copy's FY sequence, so the split stays out-of-time.
+#
+#   python -m model.benchmark --scales 1,10,50 --max-mae 3.0
+# ---------------------------------------------------------------
+
+SINGLE_ROW_REPEATS = 200
+
+
+def master_training_frame(path=MASTER_PATH):
+    return training_frame(build_features(load_master(path), entity_col="Company Name"))
+
+
+def scale_up(train, factor, noise=0.05, seed=0):
+    """
+    `factor` copies of the training frame; copies after the first get
+    new company names and multiplicative noise on the features.
+    """
+
+    if factor <= 1:
+        return train
+
+    rng = np.random.default_rng(seed)
+    copies = [train]
+    for i in range(1, int(factor)):
+        c = train.copy()
+        c["Company Name"] = c["Company Name"].astype(str) + f" #{i}"
+        jitter = 1 + noise * rng.standard_normal((len(c), len(FEATURES) + 1))
+        c[FEATURES + [TARGET]] = c[FEATURES + [TARGET]].to_numpy(dtype=float) * jitter
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+
+def oot_split(train):
+    test_fy = train["FY"].max()
+    return train[train["FY"] < test_fy], train[train["FY"] == test_fy]
+
+
+WARM_UP_ROWS = 200
+
+
+def bench_backend(name, past, test, ensemble=None):
+    # text=False: with MODEL_TEXT_FEATURES=1 fit_model would ignore the
+    # backend and every row would benchmark TextRidge
+    def fit(rows):
+        return fit_model(rows, name, ensemble, text=False)
+
+    # untimed fit first: the first fit of a backend pays its library
+    # imports, which would otherwise dominate fit_s and fit_peak_mb
+    fit(past.head(WARM_UP_ROWS))
+
+    t0 = time.perf_counter()
+    model = fit(past)
+    fit_s = time.perf_counter() - t0
+
+    tracemalloc.start()
+    try:
+        fit(past)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    X_test = model_inputs(model, test)
+    one = X_test.iloc[[0]]
+    model.predict(one)      # warm-up
+    single = []
+    for _ in range(SINGLE_ROW_REPEATS):
+        t = time.perf_counter()
+        model.predict(one)
+        single.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    pred = model.predict(X_test)
+    batch_s = time.perf_counter() - t
+
+    return {
+        "backend": name,
+        "train_rows": len(past),
+        "test_rows": len(test),
+        "fit_s": round(fit_s, 4),
+        "fit_peak_mb": round(peak / 2**20, 2),
+        "model_kb": round(len(pickle.dumps(model)) / 1024, 1),
+        "single_us": round(float(np.median(single)) * 1e6, 1),
+        "batch_us_row": round(batch_s / max(len(test), 1) * 1e6, 3),
+        "oot_mae": round(float(np.mean(np.abs(test[TARGET].to_numpy() - pred))), 4),
+    }
+
+
+def run_benchmark(backends=None, scales=(1,), path=MASTER_PATH, ensemble=None):
+    """
+    Returns one row per (scale, backend).
+    """
+
+    base = master_training_frame(path)
+    rows = []
+    for factor in scales:
+        past, test = oot_split(scale_up(base, factor))
+        for name in backends or list(BACKENDS):
+            rows.append(dict(bench_backend(name, past, test, ensemble), scale=factor))
+    return pd.DataFrame(rows).set_index(["scale", "backend"])
+
+
+def pick_backend(results, max_mae, scale=None):
+    """
+    Fastest single-row backend whose out-of-time MAE is within max_mae,
+    judged at `scale` (default: the largest benchmarked).
+    """
+
+    scale = scale if scale is not None else results.index.get_level_values("scale").max()
+    at_scale = results.xs(scale, level="scale")
+    ok = at_scale[at_scale["oot_mae"] <= max_mae]
+    return None if ok.empty else ok["single_us"].idxmin()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Benchmark model backends on the EWS master")
+    ap.add_argument("--master", default=MASTER_PATH)
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--scales", default="1,10")
+    ap.add_argument("--ensemble", default=None, choices=["global", "sector"])
+    ap.add_argument("--max-mae", type=float, default=None, help="accuracy bar for the recommendation")
+    args = ap.parse_args()
+
+    results = run_benchmark(
+        backends=args.backends.split(","),
+        scales=[int(s) for s in args.scales.split(",")],
+        path=args.master,
+        ensemble=args.ensemble,
+    )
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print(results)
+
+    if args.max_mae is not None:
+        choice = pick_backend(results, args.max_mae)
+        print(
+            f"\nFastest backend within MAE {args.max_mae}: {choice}"
+            if choice else f"\nNo backend meets MAE {args.max_mae}"
+        )
@@ -0,0 +1,268 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model.ews_model import MASTER_PATH, num
+
+# ---------------------------------------------------------------
+# Portfolio credit-loss simulation
+#
+#   PD   logistic in the FH score: 50% at CREDIT_PD_MID, falling with
+#        CREDIT_PD_SCALE points per e-fold, clipped to [floor, cap]
+#   LGD  1 - (1 - haircut) x collateral / EAD. Collateral comes from
+#        Collateral Value, or EAD / LTV when only the ratio is known.
+#        Unsecured exposures take CREDIT_UNSECURED_LGD.
+#   EAD  requested Loan Amount (₹ Cr)
+#
+# Defaults are correlated through a one-factor model per sector. Each
+# sector's factor loads on a common economy factor (CREDIT_SECTOR_CORR),
+# and a borrower defaults when
+#     sqrt(rho) Z_sector + sqrt(1 - rho) eps < PD quantile.
+#
+# Scenarios run in fixed blocks of SCENARIO_BLOCK, each drawn from its
+# own child of one SeedSequence. Results therefore depend only on the
+# seed, not on worker count or memory budget. The budget caps how many
+# blocks are in flight at once, which sets the number of workers. A
+# block never holds more than SCENARIO_BLOCK x BORROWER_SLICE draws.
+# ---------------------------------------------------------------
+
+PD_MID = float(os.environ.get("CREDIT_PD_MID", "35"))
+PD_SCALE = float(os.environ.get("CREDIT_PD_SCALE", "8"))
+PD_FLOOR = 0.0003
+PD_CAP = 0.999
+
+ASSET_CORR = float(os.environ.get("CREDIT_ASSET_CORR", "0.15"))
+SECTOR_CORR = float(os.environ.get("CREDIT_SECTOR_CORR", "0.5"))
+
+COLLATERAL_HAIRCUT = float(os.environ.get("CREDIT_COLLATERAL_HAIRCUT", "0.3"))
+LGD_FLOOR = 0.1
+UNSECURED_LGD = float(os.environ.get("CREDIT_UNSECURED_LGD", "0.65"))
+
+MEMORY_BUDGET_MB = int(os.environ.get("CREDIT_SIM_MEMORY_MB", "512"))
+DEFAULT_SEED = 20240331
+
+SCENARIO_BLOCK = 1024
+BORROWER_SLICE = 4096
+
+# bytes per (scenario, borrower) cell while a slice is live:
+# float32 draw + float32 gathered sector factor + bool default
+_CELL_BYTES = 13
+
+QUANTILES = [0.95, 0.99, 0.999]
+
+_SHARED = {}
+
+
+# ---------------- Risk parameters ----------------
+
+def pd_from_fh(fh):
+    fh = np.asarray(fh, dtype=float)
+    p = 1.0 / (1.0 + np.exp((fh - PD_MID) / PD_SCALE))
+    return np.clip(np.where(np.isnan(p), 0.5, p), PD_FLOOR, PD_CAP)
+
+
+def lgd_from_collateral(ead, collateral=None, ltv_pct=None):
+    ead = np.asarray(ead, dtype=float)
+    coll = np.full(ead.shape, np.nan) if collateral is None else np.asarray(collateral, dtype=float)
+    ltv = np.full(ead.shape, np.nan) if ltv_pct is None else np.asarray(ltv_pct, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coll = np.where(coll > 0, coll, np.where(ltv > 0, ead / (ltv / 100.0), np.nan))
+        lgd = 1.0 - (1.0 - COLLATERAL_HAIRCUT) * coll / ead
+    return np.where(np.isnan(lgd), UNSECURED_LGD, np.clip(lgd, LGD_FLOOR, 1.0))
+
+
+def portfolio(path=MASTER_PATH):
+    """
+    Current book: the latest FY per borrower with FH, PD, EAD, LGD.
+    """
+
+    from model.ews_model import load_master, build_features
+
+    features = build_features(load_master(path), entity_col="Company Name")
+    key = "CustomerID" if "CustomerID" in features.columns else "Company Name"
+    book = features.sort_values("FY").groupby(key, observed=True).tail(1)
+
+    def numeric(col):
+        if col not in book.columns:
+            return np.full(len(book), np.nan)
+        return book[col].astype(object).apply(num).to_numpy(dtype=float)
+
+    ead = numeric("Loan Amount")
+    out = pd.DataFrame({
+        key: book[key].astype(str).to_numpy(),
+        "Company Name": book["Company Name"].astype(str).to_numpy(),
+        "Sector": book["Sector"].astype(str).to_numpy() if "Sector" in book.columns else "Unknown",
+        "FH_Score": book["FH_Score"].to_numpy(dtype=float),
+        "PD": pd_from_fh(book["FH_Score"]),
+        "EAD": ead,
+        "LGD": lgd_from_collateral(ead, numeric("Collateral Value"), numeric("LTV Ratio")),
+    })
+    out = out[out["EAD"] > 0].reset_index(drop=True)
+    out["EL"] = out["PD"] * out["LGD"] * out["EAD"]
+    return out
+
+
+# ---------------- Simulation ----------------
+
+def _init_worker(threshold, sector, exposure, n_sectors, rho, sector_corr):
+    _SHARED.update(
+        threshold=threshold, sector=sector, exposure=exposure,
+        n_sectors=n_sectors, rho=rho, sector_corr=sector_corr,
+    )
+
+
+def _simulate_block(seed, n):
+    thr, codes, expo = _SHARED["threshold"], _SHARED["sector"], _SHARED["exposure"]
+    rho, w = _SHARED["rho"], _SHARED["sector_corr"]
+    rng = np.random.default_rng(seed)
+
+    economy = rng.standard_normal(n, dtype=np.float32)
+    # Python-float coefficients keep the arrays float32
+    sector = (
+        math.sqrt(w) * economy[:, None]
+        + math.sqrt(1 - w) * rng.standard_normal((n, _SHARED["n_sectors"]), dtype=np.float32)
+    )
+    systematic = math.sqrt(rho) * sector
+    idio = math.sqrt(1 - rho)
+
+    loss = np.zeros(n)
+    defaults = np.zeros(n, dtype=np.int32)
+    for start in range(0, len(thr), BORROWER_SLICE):
+        sl = slice(start, start + BORROWER_SLICE)
+        latent = rng.standard_normal((n, len(thr[sl])), dtype=np.float32)
+        latent *= idio
+        latent += systematic[:, codes[sl]]
+        hit = latent < thr[sl]
+        loss += hit.astype(np.float32) @ expo[sl]
+        defaults += hit.sum(axis=1, dtype=np.int32)
+    return loss, defaults
+
+
+def _run_blocks(seeds, sizes):
+    parts = [_simulate_block(s, n) for s, n in zip(seeds, sizes)]
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def simulate(book, n_scenarios=1_000_000, seed=DEFAULT_SEED, max_workers=None,
+             memory_mb=MEMORY_BUDGET_MB, rho=ASSET_CORR, sector_corr=SECTOR_CORR):
+    """
+    Simulated portfolio loss (₹ Cr) and default count per scenario, in
+    scenario order. Returns (losses, defaults, workers used).
+    """
+
+    from scipy.special import ndtri
+
+    codes, _ = pd.factorize(book["Sector"])
+    threshold = ndtri(book["PD"].to_numpy()).astype(np.float32)
+    exposure = (book["EAD"] * book["LGD"]).to_numpy(dtype=np.float32)
+    n_sectors = max(int(codes.max()) + 1, 1) if len(codes) else 1
+
+    n_blocks = -(-n_scenarios // SCENARIO_BLOCK)
+    seeds = np.random.SeedSequence(seed).spawn(n_blocks)
+    sizes = [SCENARIO_BLOCK] * n_blocks
+    if n_blocks:
+        sizes[-1] = n_scenarios - SCENARIO_BLOCK * (n_blocks - 1)
+
+    block_bytes = SCENARIO_BLOCK * min(len(threshold), BORROWER_SLICE) * _CELL_BYTES
+    workers = max(1, min(
+        max_workers or os.cpu_count() or 1,
+        memory_mb * 2**20 // max(block_bytes, 1),
+        n_blocks,
+    ))
+
+    # a few tasks per worker keeps the pool balanced
+    n_tasks = min(n_blocks, workers * 4)
+    bounds = np.linspace(0, n_blocks, n_tasks + 1).astype(int)
+    tasks = [(seeds[a:b], sizes[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    initargs = (threshold, codes.astype(np.int32), exposure, n_sectors, rho, sector_corr)
+    if workers == 1:
+        _init_worker(*initargs)
+        parts = [_run_blocks(s, n) for s, n in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            parts = list(pool.map(_run_blocks, *zip(*tasks)))
+
+    if not parts:
+        return np.zeros(0), np.zeros(0, dtype=np.int32), workers
+    return (
+        np.concatenate([p[0] for p in parts]),
+        np.concatenate([p[1] for p in parts]),
+        workers,
+    )
+
+
+def loss_summary(book, losses, defaults):
+    """
+    Expected loss (analytic and simulated), loss quantiles (VaR),
+    expected shortfall at 99% and mean defaults.
+    """
+
+    total_ead = float(book["EAD"].sum())
+    var = np.quantile(losses, QUANTILES) if len(losses) else np.full(len(QUANTILES), np.nan)
+    tail = losses[losses >= var[1]] if len(losses) else losses
+
+    rows = {
+        "borrowers": len(book),
+        "total_ead_cr": total_ead,
+        "expected_loss_cr": float(book["EL"].sum()),
+        "simulated_mean_loss_cr": float(losses.mean()) if len(losses) else np.nan,
+        "loss_std_cr": float(losses.std()) if len(losses) else np.nan,
+        **{f"var_{q * 100:g}_cr": float(v) for q, v in zip(QUANTILES, var)},
+        "es_99_cr": float(tail.mean()) if len(tail) else np.nan,
+        "mean_defaults": float(defaults.mean()) if len(defaults) else np.nan,
+    }
+    return pd.Series(rows).round(4)
+
+
+def sector_summary(book):
+    g = book.groupby("Sector")
+    return pd.DataFrame({
+        "borrowers": g.size(),
+        "ead_cr": g["EAD"].sum(),
+        "mean_pd": g["PD"].mean(),
+        "mean_lgd": g["LGD"].mean(),
+        "expected_loss_cr": g["EL"].sum(),
+    }).sort_values("expected_loss_cr", ascending=False).round(4)
+
+
+def run_simulation(path=MASTER_PATH, n_scenarios=1_000_000, seed=DEFAULT_SEED,
+                   max_workers=None, memory_mb=MEMORY_BUDGET_MB):
+    """
+    Portfolio build + simulation. Returns (summary Series, sector table).
+    """
+
+    book = portfolio(path)
+    t0 = time.perf_counter()
+    losses, defaults, workers = simulate(book, n_scenarios, seed, max_workers, memory_mb)
+    elapsed = time.perf_counter() - t0
+
+    summary = loss_summary(book, losses, defaults)
+    summary["scenarios"] = n_scenarios
+    summary["workers"] = workers
+    summary["simulation_s"] = round(elapsed, 3)
+    return summary, sector_summary(book)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Monte Carlo portfolio credit loss")
+    ap.add_argument("--master", default=MASTER_PATH)
+    ap.add_argument("--scenarios", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET_MB)
+    args = ap.parse_args()
+
+    summary, sectors = run_simulation(
+        args.master, args.scenarios, args.seed, args.workers, args.memory_mb
+    )
+    print(summary.to_string())
+    print()
+    print(sectors.to_string())
@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.backends import make_backend
+
+# ---------------------------------------------------------------
+# Per-sector ensemble
+#
+# One model per Sector plus a global model, all fitted concurrently in
+# a process pool. Sectors with fewer than MIN_SECTOR_ROWS training rows
+# (and sectors never seen in training) are routed to the global model.
+#
+# Same fit/predict interface as the plain backends, except that X
+# carries a "Sector" column next to the features; the ensemble splits
+# it off. Routing is a searchsorted over the sorted sector labels and
+# one predict call per model actually hit, not one per row.
+# ---------------------------------------------------------------
+
+SECTOR_COL = "Sector"
+MIN_SECTOR_ROWS = int(os.environ.get("MODEL_MIN_SECTOR_ROWS", 150))
+
+# below this many rows, process start-up costs more than the fits
+PARALLEL_MIN_ROWS = 20_000
+
+_GLOBAL = 0
+
+
+def _sector_labels(values):
+    labels = np.asarray(values, dtype=object)
+    missing = np.array([v is None or v != v or str(v).strip() == "" for v in labels])
+    labels = np.where(missing, "Unknown", labels)
+    return np.array([str(v).strip() for v in labels], dtype=str)
+
+
+def _fit_one(backend, params, X, y):
+    return make_backend(backend, **params).fit(X, y)
+
+
+class SectorEnsemble:
+
+    uses_sector = True
+
+    def __init__(self, backend=None, min_rows=MIN_SECTOR_ROWS, max_workers=None, **params):
+        self.backend = backend
+        self.min_rows = min_rows
+        self.max_workers = max_workers
+        self.params = params
+
+    @staticmethod
+    def _split(X):
+        sectors = _sector_labels(X[SECTOR_COL]) if SECTOR_COL in X else None
+        features = X.drop(columns=[SECTOR_COL]) if sectors is not None else X
+        return features, sectors
+
+    def fit(self, X, y):
+        features, sectors = self._split(X)
+        if sectors is None:
+            sectors = np.full(len(features), "Unknown")
+        X_arr = features.to_numpy(dtype=np.float64)
+        y_arr = np.asarray(y, dtype=np.float64)
+
+        self.feature_names_ = list(features.columns)
+        self.sectors_, codes, counts = np.unique(sectors, return_inverse=True, return_counts=True)
+
+        # model 0 is global; each sector with enough rows gets its own
+        jobs = [np.arange(len(y_arr))]
+        self.route_ = np.full(len(self.sectors_), _GLOBAL, dtype=np.int64)
+        for code in np.flatnonzero(counts >= self.min_rows):
+            self.route_[code] = len(jobs)
+            jobs.append(np.flatnonzero(codes == code))
+
+        args = [(self.backend, self.params, X_arr[idx], y_arr[idx]) for idx in jobs]
+        workers = min(self.max_workers or os.cpu_count() or 1, len(jobs))
+
+        if workers > 1 and len(y_arr) >= PARALLEL_MIN_ROWS:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self.models_ = list(pool.map(_fit_one, *zip(*args)))
+        else:
+            self.models_ = [_fit_one(*a) for a in args]
+
+        self.sector_rows_ = dict(zip(self.sectors_.tolist(), counts.tolist()))
+        return self
+
+    def route(self, sectors):
+        """
+        Model index per row; unknown or thin sectors -> global (0).
+        """
+
+        codes = np.searchsorted(self.sectors_, sectors)
+        codes = np.minimum(codes, len(self.sectors_) - 1)
+        known = self.sectors_[codes] == sectors
+        return np.where(known, self.route_[codes], _GLOBAL)
+
+    def predict(self, X):
+        features, sectors = self._split(X)
+        X_arr = features[self.feature_names_].to_numpy(dtype=np.float64)
+
+        which = self.route(sectors) if sectors is not None else np.zeros(len(X_arr), dtype=np.int64)
+        out = np.empty(len(X_arr), dtype=np.float64)
+        for m in np.unique(which):
+            mask = which == m
+            out[mask] = self.models_[m].predict(X_arr[mask])
+        return out
+
+    def summary(self):
+        """
+        {sector: (training rows, "sector" | "global")}
+        """
+
+        return {
+            s: (n, "sector" if self.route_[i] != _GLOBAL else "global")
+            for i, (s, n) in enumerate(self.sector_rows_.items())
+        }
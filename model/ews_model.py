@@ -1,8 +1,15 @@
+import os
+
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import Ridge
-from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
+
+from model.ratios import compute_ratios, group_slope, MASTER_COLUMNS
+from model.backends import make_backend, DEFAULT_BACKEND
+from model.ensemble import SectorEnsemble, SECTOR_COL
+from model.scorecard import champion
+from model.text_features import TextRidge, TEXT_FEATURE_COLUMNS, DEFAULT_TEXT, text_rows, text_frame
+from ingest.master_store import load_compact_master
+from telemetry.recorder import timed
 
 # --------------------------------------------------
 # SAFE NUMERIC PARSER
@@ -14,25 +21,6 @@ def num(x):
         return np.nan
 
 
-# --------------------------------------------------
-# PENALTIES
-# --------------------------------------------------
-def dpd_penalty(dpd):
-    if pd.isna(dpd): return 0
-    if dpd >= 90: return 40
-    if dpd >= 60: return 25
-    if dpd >= 30: return 15
-    if dpd > 0: return 5
-    return 0
-
-def sma_penalty(sma):
-    s = str(sma).upper()
-    return 25 if s == "SMA-2" else 15 if s == "SMA-1" else 0
-
-def npa_penalty(tag):
-    return 40 if str(tag).upper() == "YES" else 0
-
-
 # --------------------------------------------------
 # LOAN TYPE EWS
 # --------------------------------------------------
@@ -69,143 +57,172 @@ def loan_ews(row):
 
 
 # --------------------------------------------------
-# MAIN ANALYSIS FUNCTION
+# FEATURE PIPELINE (MASTER AND SINGLE COMPANY)
 # --------------------------------------------------
-def analyze_company(company: str, df_company: pd.DataFrame):
+MASTER_PATH = "data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx"
 
-    # ===============================
-    # LOAD MASTER DATA (TRAINING)
-    # ===============================
-    df_all = pd.read_excel("data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx")
-    df_all.columns = [c.strip() for c in df_all.columns]
+NUM_COLS = [
+    "Turnover (₹ Crore)", "EBITDA (₹ Crore)", "Net Profit (₹ Crore)",
+    "Net Worth (₹ Crore)", "Total Debt (₹ Crore)",
+    "DSCR", "Current Ratio", "ROCE (%)", "ROE (%)",
+    "Credit Utilization (%)", "LTV Ratio", "Maximum DPD Observed"
+]
+
+FEATURES = [
+    "FH_Score", "Trend_Slope", "Growth_1Y",
+    "EBITDA_Margin", "Loan_Type_EWS",
+    "Document_Score", "Maximum DPD Observed"
+]
+
+TARGET = "FH_Next"
+
+# "global": one model; "sector": per-Sector ensemble with global fallback
+DEFAULT_ENSEMBLE = os.environ.get("MODEL_ENSEMBLE", "global")
+
+
+def load_master(path=MASTER_PATH):
+    """
+    Compact master (no free-text columns, float32 / categorical dtypes),
+    indexed by row_id. Notes are fetched via ingest.master_store.
+    """
+
+    df_all = load_compact_master(path)
 
     df_all["FY"] = pd.to_numeric(df_all["FY"], errors="coerce")
-    df_all = df_all.dropna(subset=["Company Name", "FY"])
+    return df_all.dropna(subset=["Company Name", "FY"])
 
-    df_company = df_company.copy()
-    df_company.columns = [c.strip() for c in df_company.columns]
-    df_company = df_company[df_company["Company Name"].str.lower() == company.lower()]
-    df_company["FY"] = pd.to_numeric(df_company["FY"], errors="coerce")
-    df_company = df_company.dropna(subset=["FY"])
 
-    # ===============================
-    # NUMERIC CLEANING (BOTH)
-    # ===============================
-    num_cols = [
-        "Turnover (₹ Crore)", "EBITDA (₹ Crore)", "Net Profit (₹ Crore)",
-        "Net Worth (₹ Crore)", "Total Debt (₹ Crore)",
-        "DSCR", "Current Ratio", "ROCE (%)", "ROE (%)",
-        "Credit Utilization (%)", "LTV Ratio", "Maximum DPD Observed"
-    ]
-
-    for c in num_cols:
-        if c in df_all.columns:
-            df_all[c] = df_all[c].apply(num)
-        if c in df_company.columns:
-            df_company[c] = df_company[c].apply(num)
+def add_doc_score(df):
+    doc_cols = [c for c in df.columns if c.endswith("Uploaded")]
+    df["Document_Score"] = (
+        df[doc_cols].astype(str)
+        .apply(lambda x: x.str.lower().str.contains("yes|true|uploaded"))
+        .mean(axis=1) * 100
+        if doc_cols else 50
+    )
+    return df
 
-    # ===============================
-    # DOCUMENT SCORE (BOTH)
-    # ===============================
-    def add_doc_score(df):
-        doc_cols = [c for c in df.columns if c.endswith("Uploaded")]
-        df["Document_Score"] = (
-            df[doc_cols].astype(str)
-            .apply(lambda x: x.str.lower().str.contains("yes|true|uploaded"))
-            .mean(axis=1) * 100
-            if doc_cols else 50
-        )
-        return df
-
-    df_all = add_doc_score(df_all)
-    df_company = add_doc_score(df_company)
 
-    # ===============================
-    # LOAN TYPE EWS (BOTH)
-    # ===============================
-    df_all["Loan_Type_EWS"] = df_all.apply(loan_ews, axis=1)
-    df_company["Loan_Type_EWS"] = df_company.apply(loan_ews, axis=1)
+def build_features(df, entity_col=None, scorecard=None):
+    """
+    Numeric cleaning, document score, ratios, loan-type EWS, FH score
+    and trend for a master extract (entity_col="Company Name") or a
+    single company's rows (entity_col=None). Returns a new frame
+    sorted by entity / FY. FH uses the live champion scorecard unless
+    a compiled one is passed.
+    """
+
+    df = df.copy()
+
+    for c in NUM_COLS:
+        if c in df.columns:
+            # via object: compact-master categoricals would map to categoricals
+            df[c] = df[c].astype(object).apply(num).astype(float)
+
+    df = add_doc_score(df)
 
     # ===============================
-    # FINANCIAL HEALTH SCORE
+    # RATIOS (SHARED ENGINE)
     # ===============================
-    def scale(v, d, r):
-        if pd.isna(v): v = d[1]
-        return np.clip(np.interp(v, d, r), min(r), max(r))
-
-    def compute_fh(r):
-        leverage = scale(
-            r["Total Debt (₹ Crore)"] / (r["Net Worth (₹ Crore)"] + 1e-6),
-            [0, 1, 3], [100, 80, 40]
-        )
-        liquidity = scale(r["Current Ratio"], [0.5, 1, 2], [40, 70, 100])
-        coverage = scale(r["DSCR"], [0.8, 1.2, 2], [40, 70, 100])
-        profitability = np.mean([
-            scale(r["ROCE (%)"], [5, 10, 20], [40, 70, 100]),
-            scale(r["ROE (%)"], [5, 10, 20], [40, 70, 100])
-        ])
-
-        fh_raw = (
-            0.35 * leverage +
-            0.20 * liquidity +
-            0.20 * coverage +
-            0.15 * profitability +
-            0.10 * r["Loan_Type_EWS"]
-        )
-
-        penalty = (
-            dpd_penalty(r["Maximum DPD Observed"]) +
-            sma_penalty(r.get("SMA Classification")) +
-            npa_penalty(r.get("Cross-Bank NPA Tag"))
-        )
-
-        return np.clip(fh_raw - penalty, 0, 100)
-
-    df_all["FH_Score"] = df_all.apply(compute_fh, axis=1)
-    df_company["FH_Score"] = df_company.apply(compute_fh, axis=1)
+    df = compute_ratios(df, entity_col=entity_col, columns=MASTER_COLUMNS)
+    df["EBITDA_Margin"] = df["ebitda_margin"]
+    df["Growth_1Y"] = df["turnover_yoy"]
+
+    df["Loan_Type_EWS"] = df.apply(loan_ews, axis=1)
+
+    # weights, knots and penalties come from the scorecard definition
+    df["FH_Score"] = (scorecard or champion()).score(df)
 
     # ===============================
     # TRENDS
     # ===============================
-    df_all = df_all.sort_values(["Company Name", "FY"])
-    df_all["EBITDA_Margin"] = df_all["EBITDA (₹ Crore)"] / (df_all["Turnover (₹ Crore)"] + 1e-6)
-    df_all["Growth_1Y"] = df_all.groupby("Company Name")["Turnover (₹ Crore)"].pct_change()
-    df_all["Trend_Slope"] = df_all.groupby("Company Name")["FH_Score"].transform(
-        lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) > 1 else 0
-    )
+    # frame is already sorted by entity / FY by compute_ratios
+    groups = df[entity_col] if entity_col else np.zeros(len(df))
+    df["Trend_Slope"] = group_slope(df["FH_Score"], groups)
 
-    df_company = df_company.sort_values("FY")
-    df_company["EBITDA_Margin"] = df_company["EBITDA (₹ Crore)"] / (df_company["Turnover (₹ Crore)"] + 1e-6)
-    df_company["Growth_1Y"] = df_company["Turnover (₹ Crore)"].pct_change()
-    df_company["Trend_Slope"] = (
-        np.polyfit(range(len(df_company)), df_company["FH_Score"], 1)[0]
-        if len(df_company) > 1 else 0.0
-    )
+    return df
 
-    # ===============================
-    # TRAIN MODEL (MASTER DATA)
-    # ===============================
-    df_all["FH_Next"] = df_all.groupby("Company Name")["FH_Score"].shift(-1)
-    train = df_all.dropna(subset=["FH_Next"])
-
-    FEATURES = [
-        "FH_Score", "Trend_Slope", "Growth_1Y",
-        "EBITDA_Margin", "Loan_Type_EWS",
-        "Document_Score", "Maximum DPD Observed"
-    ]
-
-    pipe = Pipeline([
-        ("imp", SimpleImputer(strategy="median")),
-        ("model", Ridge(alpha=1.2))
-    ])
 
-    pipe.fit(train[FEATURES], train["FH_Next"])
+def training_frame(features):
+    """
+    Master feature rows that have a following year to learn from.
+    """
+
+    features = features.copy()
+    features[TARGET] = features.groupby("Company Name")["FH_Score"].shift(-1)
+    return features.dropna(subset=[TARGET])
+
+
+def fit_model(train, backend=None, ensemble=None, text=None, path=MASTER_PATH, **params):
+    """
+    Fits the configured backend (MODEL_BACKEND, default ridge) on
+    FEATURES -> FH_Next, globally or per sector (MODEL_ENSEMBLE).
+    With text (MODEL_TEXT_FEATURES) it fits TextRidge on FEATURES plus
+    the hashed notes of the master rows at `path`; backend and
+    ensemble do not apply.
+    """
+
+    if DEFAULT_TEXT if text is None else text:
+        model = TextRidge(**params)
+        return model.fit(train[FEATURES], train[TARGET], text=text_rows(path, train.index))
+
+    if (ensemble or DEFAULT_ENSEMBLE).lower() == "sector":
+        model = SectorEnsemble(backend, **params)
+    else:
+        model = make_backend(backend, **params)
+    return model.fit(model_inputs(model, train), train[TARGET])
+
+
+def model_inputs(model, rows, path=None):
+    """
+    The columns `model` expects: FEATURES, plus Sector for the ensemble
+    or the note columns for TextRidge. Master rows without notes get
+    them from the text store when `path` is given.
+    """
+
+    if getattr(model, "uses_text", False):
+        missing = [c for c in TEXT_FEATURE_COLUMNS if c not in rows.columns]
+        rows = rows[FEATURES + [c for c in TEXT_FEATURE_COLUMNS if c in rows.columns]]
+        if missing and path is not None:
+            rows = rows.join(text_frame(path, rows.index).reindex(columns=missing))
+        return rows
+
+    if getattr(model, "uses_sector", False):
+        rows = rows.copy()
+        if SECTOR_COL not in rows.columns:
+            rows[SECTOR_COL] = None
+        return rows[FEATURES + [SECTOR_COL]]
+    return rows[FEATURES]
+
+
+# --------------------------------------------------
+# MAIN ANALYSIS FUNCTION
+# --------------------------------------------------
+@timed("model")
+def analyze_company(company: str, df_company: pd.DataFrame, model=None):
+    """
+    Scores one company's rows. The forecast comes from `model` when
+    given, else from the registry's active version (trained from the
+    master in the background, not per request).
+    """
+
+    df_company = df_company.copy()
+    df_company.columns = [c.strip() for c in df_company.columns]
+    df_company = df_company[df_company["Company Name"].str.lower() == company.lower()]
+    df_company["FY"] = pd.to_numeric(df_company["FY"], errors="coerce")
+    df_company = df_company.dropna(subset=["FY"])
+
+    df_company = build_features(df_company)
+
+    if model is None:
+        from model.registry import get_model_registry
+        model = get_model_registry().current()
 
     # ===============================
     # PREDICT (SELECTED COMPANY ONLY)
     # ===============================
     last = df_company.iloc[-1]
-    forecast = pipe.predict(pd.DataFrame([last[FEATURES]]))[0]
+    forecast = model.pipeline.predict(model_inputs(model.pipeline, df_company.iloc[[-1]]))[0]
 
     return {
         "fh_score": round(last["FH_Score"], 2),
@@ -213,5 +230,6 @@ def analyze_company(company: str, df_company: pd.DataFrame):
         "forecast": round(float(forecast), 2),
         "ebitda": df_company[["FY", "EBITDA_Margin"]],
         "growth": df_company[["FY", "Growth_1Y"]],
-        "latest": last
+        "latest": last,
+        "model_version": model.version
     }
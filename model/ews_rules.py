@@ -0,0 +1,244 @@
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# Early-warning rule engine
+#
+# EWS_RULES is the single declaration of the early-warning signals.
+# compile_rules() validates it once and groups rules by column, so an
+# evaluation coerces each input column once and runs one vectorized
+# comparison per rule: every rule x every borrower in one call.
+#
+# RuleEvaluator keeps a per-row hash of the rule input columns and
+# on update() re-evaluates only rows that are new or changed.
+# ---------------------------------------------------------------
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+EWS_RULES = [
+    # id,                 column,                    op,    value,             severity,   message
+    ("DPD_90",            "Maximum DPD Observed",    ">=",  90,                "critical", "DPD of 90+ days"),
+    ("DPD_60",            "Maximum DPD Observed",    ">=",  60,                "high",     "DPD of 60+ days"),
+    ("DPD_30",            "Maximum DPD Observed",    ">=",  30,                "medium",   "DPD of 30+ days"),
+    ("SMA_2",             "SMA Classification",      "in",  ["SMA-2"],         "high",     "Classified SMA-2"),
+    ("SMA_1",             "SMA Classification",      "in",  ["SMA-1"],         "medium",   "Classified SMA-1"),
+    ("CROSS_BANK_NPA",    "Cross-Bank NPA Tag",      "in",  ["YES"],           "critical", "NPA with another bank"),
+    ("DSCR_BELOW_1",      "DSCR",                    "<",   1.0,               "high",     "DSCR below 1.0"),
+    ("CURRENT_RATIO_LOW", "Current Ratio",           "<",   1.0,               "medium",   "Current ratio below 1.0"),
+    ("HIGH_UTILIZATION",  "Credit Utilization (%)",  ">",   90,                "medium",   "Limit utilization above 90%"),
+    ("BOUNCED_CHEQUES",   "Bounced Cheques (Count)", ">=",  2,                 "medium",   "Two or more bounced cheques"),
+    ("GST_NON_COMPLIANT", "GST Filing Compliance",   "in",  ["NON-COMPLIANT"], "high",     "GST returns not filed"),
+    ("GST_DELAYED",       "GST Filing Compliance",   "in",  ["DELAYED"],       "low",      "GST returns filed late"),
+]
+
+_NUMERIC_OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+}
+
+
+class Rule:
+
+    def __init__(self, rule_id, column, op, value, severity, message):
+        self.id = rule_id
+        self.column = column
+        self.op = op
+        self.value = value
+        self.severity = severity
+        self.message = message
+
+
+class CompiledRules:
+    """
+    Validated rule set. evaluate(df) -> boolean DataFrame, one column
+    per rule id, aligned to df.index. Rules whose column is missing
+    from df evaluate to False.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.ids = [r.id for r in rules]
+        self.columns = sorted({r.column for r in rules})
+        self.severity_rank = np.array([SEVERITIES.index(r.severity) for r in rules])
+
+        # column -> [(position, rule)] so each column is coerced once
+        self._by_column = {}
+        for i, r in enumerate(rules):
+            self._by_column.setdefault(r.column, []).append((i, r))
+
+    def evaluate(self, df):
+        out = np.zeros((len(df), len(self.rules)), dtype=bool)
+
+        for column, rules in self._by_column.items():
+            if column not in df.columns:
+                continue
+            raw = df[column]
+            numeric = text = None
+
+            for i, r in rules:
+                if r.op == "in":
+                    if text is None:
+                        text = raw.astype(str).str.strip().str.upper().to_numpy()
+                    out[:, i] = np.isin(text, r.value)
+                else:
+                    if numeric is None:
+                        numeric = _to_numeric(raw)
+                    # NaN compares False: a missing value never fires a rule
+                    out[:, i] = _NUMERIC_OPS[r.op](numeric, r.value)
+
+        return pd.DataFrame(out, index=df.index, columns=self.ids)
+
+    def evaluate_record(self, record):
+        """
+        Rules fired for one dict of {column: value}. Returns a list of Rule.
+        """
+
+        row = self.evaluate(pd.DataFrame([record])).iloc[0]
+        return [r for r in self.rules if row[r.id]]
+
+    def summarize(self, masks):
+        """
+        Per row: n_flags, worst severity and the fired rule ids.
+        """
+
+        m = masks.to_numpy()
+        ranks = np.where(m, self.severity_rank, -1).max(axis=1) if m.shape[1] else np.full(len(m), -1)
+        ids = np.array(self.ids, dtype=object)
+        return pd.DataFrame({
+            "n_flags": m.sum(axis=1),
+            "worst_severity": np.where(ranks >= 0, np.array(SEVERITIES, dtype=object)[np.maximum(ranks, 0)], None),
+            "rules": [", ".join(ids[row]) for row in m],
+        }, index=masks.index)
+
+
+def _to_numeric(series):
+    if series.dtype.kind in "if":
+        return series.to_numpy(dtype=float)
+    cleaned = series.astype(str).str.replace(",", "", regex=False).str.replace("₹", "", regex=False)
+    return pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=float)
+
+
+def compile_rules(rules=EWS_RULES):
+    """
+    Validates the declaration and returns CompiledRules.
+    Raises ValueError on an unknown operator or severity, a duplicate
+    id, or a value of the wrong shape for its operator.
+    """
+
+    compiled, seen = [], set()
+    for spec in rules:
+        rule = Rule(*spec)
+        if rule.id in seen:
+            raise ValueError(f"Duplicate EWS rule id: {rule.id}")
+        seen.add(rule.id)
+        if rule.severity not in SEVERITIES:
+            raise ValueError(f"{rule.id}: unknown severity '{rule.severity}'")
+        if rule.op == "in":
+            if isinstance(rule.value, str) or not hasattr(rule.value, "__iter__"):
+                raise ValueError(f"{rule.id}: 'in' needs a list of values")
+            rule.value = np.array([str(v).strip().upper() for v in rule.value])
+        elif rule.op in _NUMERIC_OPS:
+            rule.value = float(rule.value)
+        else:
+            raise ValueError(f"{rule.id}: unknown operator '{rule.op}'")
+        compiled.append(rule)
+    return CompiledRules(compiled)
+
+
+DEFAULT_RULES = compile_rules()
+
+
+# ---------------- Incremental evaluation ----------------
+
+class RuleEvaluator:
+    """
+    Holds the last masks per key and re-evaluates only changed rows.
+    """
+
+    def __init__(self, compiled=DEFAULT_RULES):
+        self.compiled = compiled
+        self._index = pd.Index([])
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._masks = np.zeros((0, len(compiled.ids)), dtype=bool)
+        self._lock = threading.Lock()
+
+    def update(self, df, key_cols):
+        """
+        Evaluates df (keyed by key_cols, which must be unique) against
+        the stored state. Returns (masks for every row of df, keys of
+        rows that were re-evaluated).
+        """
+
+        keyed = df.set_index(key_cols)
+        inputs = keyed[[c for c in self.compiled.columns if c in keyed.columns]]
+        hashes = pd.util.hash_pandas_object(inputs, index=False).to_numpy()
+
+        with self._lock:
+            return self._update(keyed, hashes)
+
+    def _update(self, keyed, hashes):
+        # positional lookup keeps the uint64 hashes exact (no NaN upcast)
+        pos = (
+            self._index.get_indexer(keyed.index) if len(self._index)
+            else np.full(len(keyed), -1)
+        )
+        seen = pos >= 0
+        changed = ~seen
+        changed[seen] = self._hashes[pos[seen]] != hashes[seen]
+
+        masks = np.empty((len(keyed), len(self.compiled.ids)), dtype=bool)
+        masks[~changed] = self._masks[pos[~changed]]
+        masks[changed] = self.compiled.evaluate(keyed[changed]).to_numpy()
+
+        self._index, self._hashes, self._masks = keyed.index, hashes, masks
+        return (
+            pd.DataFrame(masks, index=keyed.index, columns=self.compiled.ids),
+            keyed.index[changed],
+        )
+
+
+@lru_cache(maxsize=1)
+def get_portfolio_evaluator():
+    """
+    Process-wide evaluator, so repeat scans only touch changed rows.
+    """
+    return RuleEvaluator()
+
+
+# ---------------- Application data ----------------
+
+# banking_conduct section key -> rule column
+BANKING_FIELDS = {
+    "max_dpd": "Maximum DPD Observed",
+    "sma_classification": "SMA Classification",
+    "cross_bank_npa": "Cross-Bank NPA Tag",
+    "credit_utilization_pct": "Credit Utilization (%)",
+    "bounced_cheques": "Bounced Cheques (Count)",
+    "gst_filing_compliance": "GST Filing Compliance",
+}
+
+# per-FY financials key -> rule column
+FINANCIAL_FIELDS = {
+    "dscr": "DSCR",
+    "current_ratio": "Current Ratio",
+}
+
+
+def application_record(banking=None, financials_fy=None):
+    """
+    Maps an application's banking-conduct section and one FY of
+    financials onto rule columns.
+    """
+
+    record = {}
+    for fields, source in ((BANKING_FIELDS, banking), (FINANCIAL_FIELDS, financials_fy)):
+        for key, column in fields.items():
+            if source and key in source:
+                record[column] = source[key]
+    return record
@@ -0,0 +1,198 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------
+# UNIFIED RATIO ENGINE
+# One set of formulas for the Financial Data page (one borrower,
+# any number of FYs) and the EWS model (whole portfolio).
+# Everything is computed column-wise on NumPy arrays; per-borrower
+# growth uses group boundaries instead of Python loops.
+# --------------------------------------------------
+
+# canonical input -> master workbook column
+MASTER_COLUMNS = {
+    "turnover": "Turnover (₹ Crore)",
+    "ebitda": "EBITDA (₹ Crore)",
+    "net_profit": "Net Profit (₹ Crore)",
+    "net_worth": "Net Worth (₹ Crore)",
+    "total_debt": "Total Debt (₹ Crore)",
+    "dscr": "DSCR",
+    "current_ratio": "Current Ratio",
+}
+
+RATIO_COLUMNS = [
+    "debt_equity", "ebitda_margin", "net_margin", "debt_to_ebitda",
+    "turnover_yoy", "ebitda_yoy", "net_profit_yoy", "turnover_cagr",
+]
+
+
+# --------------------------------------------------
+# ARRAY PRIMITIVES
+# --------------------------------------------------
+def safe_ratio(num, den):
+    """
+    num / den, NaN where den <= 0 or either side is missing.
+    """
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    ok = den > 0
+    np.divide(num, den, out=out, where=ok)
+    return out
+
+
+def leverage(total_debt, net_worth):
+    """
+    Debt / net worth. Non-positive net worth with debt outstanding is
+    infinite leverage (worst case), not a missing value.
+    """
+    total_debt = np.asarray(total_debt, dtype=float)
+    net_worth = np.asarray(net_worth, dtype=float)
+    out = safe_ratio(total_debt, net_worth)
+    out[(net_worth <= 0) & (total_debt > 0)] = np.inf
+    return out
+
+
+def _group_starts(codes):
+    codes = np.asarray(codes)
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = codes[1:] != codes[:-1]
+    return starts
+
+
+def group_shift(values, codes):
+    """
+    Previous value within each group (rows sorted by group, then FY).
+    """
+    values = np.asarray(values, dtype=float)
+    prev = np.empty_like(values)
+    prev[0:1] = np.nan
+    prev[1:] = values[:-1]
+    prev[_group_starts(codes)] = np.nan
+    return prev
+
+
+def growth(values, codes):
+    """
+    Year-on-year growth within each group; NaN when the prior year is
+    missing or non-positive.
+    """
+    values = np.asarray(values, dtype=float)
+    return safe_ratio(values, group_shift(values, codes)) - 1
+
+
+def group_cagr(values, years, codes):
+    """
+    CAGR from each group's first to last positive value, broadcast to
+    every row of the group.
+    """
+    values = np.asarray(values, dtype=float)
+    years = np.asarray(years, dtype=float)
+    codes = np.asarray(codes)
+
+    valid = values > 0
+    frame = pd.DataFrame({"g": codes, "v": np.where(valid, values, np.nan), "y": np.where(valid, years, np.nan)})
+    g = frame.groupby("g", sort=False)
+    first_v, last_v = g["v"].transform("first"), g["v"].transform("last")
+    first_y, last_y = g["y"].transform("first"), g["y"].transform("last")
+
+    span = (last_y - first_y).to_numpy()
+    ratio = safe_ratio(last_v.to_numpy(), first_v.to_numpy())
+    out = np.full(len(values), np.nan)
+    ok = (span > 0) & (ratio > 0)
+    out[ok] = ratio[ok] ** (1 / span[ok]) - 1
+    return out
+
+
+def group_slope(values, codes):
+    """
+    OLS slope of values against 0..n-1 within each group (closed form
+    from group sums), broadcast to every row; 0 for single-row groups.
+    Same result as np.polyfit(range(n), x, 1)[0] per group.
+    """
+    values = np.asarray(values, dtype=float)
+    frame = pd.DataFrame({"g": np.asarray(codes), "y": values})
+    frame["x"] = frame.groupby("g", sort=False).cumcount().astype(float)
+    frame["xy"] = frame["x"] * frame["y"]
+    frame["xx"] = frame["x"] ** 2
+
+    sums = frame.groupby("g", sort=False)[["x", "y", "xy", "xx"]].transform("sum")
+    n = frame.groupby("g", sort=False)["y"].transform("size").to_numpy(dtype=float)
+
+    den = n * sums["xx"].to_numpy() - sums["x"].to_numpy() ** 2
+    num = n * sums["xy"].to_numpy() - sums["x"].to_numpy() * sums["y"].to_numpy()
+    out = np.zeros(len(values))
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+# --------------------------------------------------
+# FRAME API
+# --------------------------------------------------
+def compute_ratios(df, entity_col=None, fy_col="FY", columns=None):
+    """
+    Adds RATIO_COLUMNS to a long frame (one row per entity-FY).
+
+    columns maps canonical names (turnover, ebitda, ...) to the frame's
+    column names; defaults to the canonical names themselves. Use
+    MASTER_COLUMNS for the master workbook. Returns a new frame sorted
+    by entity and FY. Margins and growth are fractions, not percents.
+    """
+
+    columns = {k: k for k in MASTER_COLUMNS} | (columns or {})
+    sort_cols = [entity_col, fy_col] if entity_col else [fy_col]
+    out = df.sort_values(sort_cols, kind="stable").copy()
+
+    def col(name):
+        c = columns[name]
+        return out[c].to_numpy(dtype=float) if c in out.columns else np.full(len(out), np.nan)
+
+    codes = out[entity_col].to_numpy() if entity_col else np.zeros(len(out), dtype=int)
+    years = out[fy_col].to_numpy(dtype=float)
+
+    turnover, ebitda, net_profit = col("turnover"), col("ebitda"), col("net_profit")
+
+    out["debt_equity"] = leverage(col("total_debt"), col("net_worth"))
+    out["ebitda_margin"] = safe_ratio(ebitda, turnover)
+    out["net_margin"] = safe_ratio(net_profit, turnover)
+    out["debt_to_ebitda"] = safe_ratio(col("total_debt"), ebitda)
+    out["turnover_yoy"] = growth(turnover, codes)
+    out["ebitda_yoy"] = growth(ebitda, codes)
+    out["net_profit_yoy"] = growth(net_profit, codes)
+    out["turnover_cagr"] = group_cagr(turnover, years, codes)
+
+    return out
+
+
+# --------------------------------------------------
+# SESSION FINANCIALS (Financial Data page)
+# --------------------------------------------------
+_FY_LABEL = re.compile(r"(\d{4})")
+
+
+def fy_year(label):
+    m = _FY_LABEL.search(str(label))
+    return int(m.group(1)) if m else None
+
+
+def ratios_from_financials(financials):
+    """
+    st.session_state.financials ({"FY 2024": {...}}) -> ratio frame
+    indexed by FY label, oldest first.
+    """
+
+    rows = [
+        {"fy_label": label, "FY": fy_year(label), **values}
+        for label, values in financials.items()
+        if fy_year(label) is not None
+    ]
+    if not rows:
+        return pd.DataFrame(columns=["FY", *RATIO_COLUMNS])
+
+    df = pd.DataFrame(rows)
+    for c in MASTER_COLUMNS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return compute_ratios(df).set_index("fy_label")
@@ -0,0 +1,340 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from functools import lru_cache
+
+# ---------------------------------------------------------------
+# Versioned model registry
+#
+# The EWS pipeline is trained from the master file off the request
+# path and stored as numbered versions under REGISTRY_DIR:
+#
+#   v0001.pkl, v0002.pkl ...   pickled ModelVersion
+#   index.json                 version metadata + active version
+#
+# Serving reads `_active` once per request. Activation replaces that
+# reference in one assignment, so a swap never blocks or disturbs a
+# scoring call already holding the previous version. A watcher thread
+# retrains when the master file's content hash or the live scorecard
+# changes.
+# ---------------------------------------------------------------
+
+REGISTRY_DIR = os.environ.get(
+    "MODEL_REGISTRY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "models")
+)
+WATCH_INTERVAL_S = float(os.environ.get("MODEL_WATCH_S", 30))
+INDEX_FILE = "index.json"
+
+
+class ModelVersion:
+
+    def __init__(self, version, pipeline, meta):
+        self.version = version
+        self.pipeline = pipeline
+        self.meta = meta
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _mae(y_true, y_pred):
+    import numpy as np
+    return float(np.mean(np.abs(np.asarray(y_true) - np.asarray(y_pred))))
+
+
+class ModelRegistry:
+
+    def __init__(self, root=REGISTRY_DIR, master_path=None):
+        from model.ews_model import MASTER_PATH
+
+        self.root = root
+        self.master_path = master_path or MASTER_PATH
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()          # index + activation
+        self._train_lock = threading.Lock()    # one fit at a time
+        self._loaded = {}                      # version -> ModelVersion
+        self._active = None
+        self._watcher = None
+
+        self.training = False
+        self.last_error = None
+
+        self._index = self._read_index()
+
+    # ---------------- Index ----------------
+
+    def _read_index(self):
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return {"active": None, "history": [], "versions": []}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self):
+        _atomic_write(
+            os.path.join(self.root, INDEX_FILE),
+            json.dumps(self._index, indent=2).encode("utf-8")
+        )
+
+    def _path(self, version):
+        return os.path.join(self.root, f"v{version:04d}.pkl")
+
+    def versions(self):
+        """
+        Metadata for every stored version, newest first.
+        """
+
+        with self._lock:
+            active = self._index["active"]
+            return [
+                dict(meta, active=meta["version"] == active)
+                for meta in reversed(self._index["versions"])
+            ]
+
+    def latest_meta(self):
+        with self._lock:
+            return self._index["versions"][-1] if self._index["versions"] else None
+
+    # ---------------- Serving ----------------
+
+    def current(self):
+        """
+        The active ModelVersion. Trains synchronously only when no
+        version exists at all (first start on an empty registry).
+        """
+
+        model = self._active
+        if model is not None:
+            return model
+
+        with self._lock:
+            active = self._index["active"]
+        if active is not None:
+            self.activate(active)
+        else:
+            self.train(reason="bootstrap")
+        return self._active
+
+    def _load(self, version):
+        model = self._loaded.get(version)
+        if model is None:
+            with open(self._path(version), "rb") as f:
+                model = pickle.load(f)
+            self._loaded[version] = model
+        return model
+
+    def activate(self, version):
+        """
+        Makes `version` the serving model. Also the rollback path:
+        any stored version can be re-activated instantly.
+        """
+
+        model = self._load(version)
+        with self._lock:
+            if self._index["active"] != version:
+                self._index["history"].append(version)
+            self._index["active"] = version
+            self._write_index()
+            self._active = model        # single reference swap
+        return model
+
+    def rollback(self):
+        """
+        Re-activates the version that was serving before the current one.
+        Returns the version number, or None when there is nothing to go back to.
+        """
+
+        with self._lock:
+            history = self._index["history"]
+            if len(history) < 2:
+                return None
+            history.pop()
+            previous = history[-1]
+        model = self._load(previous)
+        with self._lock:
+            self._index["active"] = previous
+            self._write_index()
+            self._active = model
+        return previous
+
+    # ---------------- Training ----------------
+
+    def train(self, reason="manual", force=False, activate=True, backend=None, ensemble=None, text=None):
+        """
+        Fits a new version from the master file unless its content hash,
+        backend, ensemble mode, text option and scorecard match the
+        latest version (force=True overrides).
+        Returns the version's metadata.
+        """
+
+        from model.scorecard import champion
+        from model.ews_model import (
+            TARGET, DEFAULT_BACKEND, DEFAULT_ENSEMBLE, DEFAULT_TEXT,
+            load_master, build_features, training_frame, fit_model, model_inputs
+        )
+
+        with self._train_lock:
+            backend = (backend or DEFAULT_BACKEND).lower()
+            ensemble = (ensemble or DEFAULT_ENSEMBLE).lower()
+            text = DEFAULT_TEXT if text is None else bool(text)
+            scorecard = champion().digest
+            data_hash = file_sha256(self.master_path)
+            latest = self.latest_meta()
+            unchanged = (
+                latest is not None
+                and latest["data_hash"] == data_hash
+                and latest.get("backend", "ridge") == backend
+                and latest.get("ensemble", "global") == ensemble
+                and latest.get("text_features", False) == text
+                and latest.get("scorecard") == scorecard
+            )
+            if unchanged and not force:
+                if activate and self._active is None:
+                    # keep a rolled-back choice rather than jumping to latest
+                    self.activate(self._index["active"] or latest["version"])
+                return latest
+
+            self.training = True
+            try:
+                t0 = time.perf_counter()
+                features = build_features(load_master(self.master_path), entity_col="Company Name")
+                train = training_frame(features)
+                prep_s = time.perf_counter() - t0
+
+                # out-of-time check: hold out the latest training year
+                holdout_fy = train["FY"].max()
+                past = train[train["FY"] < holdout_fy]
+                recent = train[train["FY"] == holdout_fy]
+                oot_mae = None
+                if len(past) and len(recent):
+                    oot_model = fit_model(past, backend, ensemble, text, self.master_path)
+                    oot_mae = _mae(
+                        recent[TARGET],
+                        oot_model.predict(model_inputs(oot_model, recent, self.master_path))
+                    )
+
+                t1 = time.perf_counter()
+                pipeline = fit_model(train, backend, ensemble, text, self.master_path)
+                fit_s = time.perf_counter() - t1
+
+                with self._lock:
+                    version = self._index["versions"][-1]["version"] + 1 if self._index["versions"] else 1
+
+                meta = {
+                    "version": version,
+                    "created_at": time.time(),
+                    "reason": reason,
+                    "backend": backend,
+                    "ensemble": ensemble,
+                    "text_features": text,
+                    "scorecard": scorecard,
+                    "data_hash": data_hash,
+                    "master_path": self.master_path,
+                    "training_rows": int(len(train)),
+                    "companies": int(train["Company Name"].nunique()),
+                    "fy_range": [int(train["FY"].min()), int(train["FY"].max())],
+                    "features": list(model_inputs(pipeline, train.head(0), self.master_path).columns),
+                    "metrics": {
+                        "train_mae": round(_mae(train[TARGET], pipeline.predict(model_inputs(pipeline, train, self.master_path))), 4),
+                        "oot_mae": None if oot_mae is None else round(oot_mae, 4),
+                        "oot_fy": int(holdout_fy),
+                    },
+                    "prep_s": round(prep_s, 3),
+                    "fit_s": round(fit_s, 4),
+                }
+
+                model = ModelVersion(version, pipeline, meta)
+                _atomic_write(self._path(version), pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+                self._loaded[version] = model
+
+                with self._lock:
+                    self._index["versions"].append(meta)
+                    self._write_index()
+
+                if activate:
+                    self.activate(version)
+                self.last_error = None
+                return meta
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.training = False
+
+    def retrain_async(self, reason="manual", force=False):
+        """
+        Starts training on a background thread. Returns False if a fit
+        is already running.
+        """
+
+        if self._train_lock.locked():
+            return False
+
+        def run():
+            try:
+                self.train(reason=reason, force=force)
+            except Exception:
+                pass    # kept in last_error; serving stays on the active version
+
+        threading.Thread(target=run, name="model-retrain", daemon=True).start()
+        return True
+
+    # ---------------- Master / scorecard watcher ----------------
+
+    def _watch(self, interval):
+        from model.scorecard import champion
+
+        last_mtime = last_scorecard = None
+        while True:
+            try:
+                mtime = os.stat(self.master_path).st_mtime
+                # champion() hot-reloads the definition; a new digest
+                # changes FH_Score and with it the features and target
+                scorecard = champion().digest
+                if mtime != last_mtime or scorecard != last_scorecard:
+                    reason = "master changed" if mtime != last_mtime else "scorecard changed"
+                    last_mtime, last_scorecard = mtime, scorecard
+                    # no-op unless the content hash, scorecard (or backend) changed
+                    self.train(reason=reason)
+            except Exception:
+                pass
+            time.sleep(interval)
+
+    def start_watcher(self, interval=WATCH_INTERVAL_S):
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+
+@lru_cache(maxsize=1)
+def get_model_registry():
+    """
+    Process-wide registry; starts the master / scorecard watcher
+    (MODEL_WATCH_S=0 disables it).
+    """
+
+    registry = ModelRegistry()
+    registry.start_watcher()
+    return registry
@@ -0,0 +1,261 @@
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+
+# ---------------------------------------------------------------
+# Server-wide model run scheduler
+#
+# Every Streamlit session used to train its own model on its own
+# script thread, so a burst of "Run AI Model" clicks meant N fits
+# competing for the same cores. Jobs now go through one scheduler:
+#
+#   - a fixed number of worker threads (MODEL_WORKERS)
+#   - a priority queue: lower number runs first (interactive before batch)
+#   - per-user fairness inside a priority level: start-time fair
+#     queueing, so a user with ten queued jobs cannot starve a user
+#     with one
+#   - coalescing: a request identical to one queued or running
+#     attaches to the same Future instead of fitting again
+#   - admission control: a bounded queue and a per-user cap; beyond
+#     them a submit fails fast with SchedulerBusy rather than piling
+#     up work the server cannot finish
+# ---------------------------------------------------------------
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+WORKERS = int(os.environ.get("MODEL_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+MAX_QUEUED = int(os.environ.get("MODEL_QUEUE_MAX", 64))
+MAX_PER_USER = int(os.environ.get("MODEL_MAX_PER_USER", 4))
+
+
+class SchedulerBusy(RuntimeError):
+    pass
+
+
+class Job:
+    """
+    Handle returned by submit(). Several callers share one Job when
+    their requests were coalesced.
+    """
+
+    def __init__(self, key, fn, args, kwargs, priority, user, tag):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.tag = tag
+        self.user = user                # the submitter: owns the queue slot
+        # the submitter's context (active telemetry request etc.), so
+        # @timed sections inside fn attribute to the right request
+        self.context = contextvars.copy_context()
+        self.users = {user}             # everyone waiting on the result
+        self.future = Future()
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+
+    def result(self, timeout=None):
+        return self.future.result(timeout=timeout)
+
+    def done(self):
+        return self.future.done()
+
+    @property
+    def state(self):
+        if self.finished_at is not None:
+            return "done"
+        return "running" if self.started_at is not None else "queued"
+
+
+class ModelScheduler:
+
+    def __init__(self, workers=WORKERS, max_queued=MAX_QUEUED, max_per_user=MAX_PER_USER):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_per_user = max_per_user
+
+        self._cv = threading.Condition()
+        self._heap = []                 # (priority, start_tag, seq, job)
+        self._inflight = {}             # key -> Job (queued or running)
+        self._user_tag = {}             # user -> finish tag of their last job
+        self._user_queued = {}          # user -> jobs waiting
+        self._vtime = 0.0               # tag of the job most recently started
+        self._seq = itertools.count()
+        self._running = 0
+        self._closed = False
+
+        self.stats = {
+            "submitted": 0, "coalesced": 0, "rejected": 0,
+            "completed": 0, "failed": 0,
+            "wait_s": 0.0, "run_s": 0.0,
+        }
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"model-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    # ---------------- Submission ----------------
+
+    def submit(self, key, fn, *args, priority=PRIORITY_INTERACTIVE, user="anonymous", **kwargs):
+        """
+        Queues fn(*args, **kwargs) unless an identical job (same key) is
+        already queued or running. Returns a Job.
+        Raises SchedulerBusy when the queue or the user's quota is full.
+        """
+
+        with self._cv:
+            if self._closed:
+                raise SchedulerBusy("Model scheduler is shut down")
+
+            job = self._inflight.get(key)
+            if job is not None:
+                job.users.add(user)
+                self.stats["coalesced"] += 1
+                return job
+
+            if len(self._heap) >= self.max_queued:
+                self.stats["rejected"] += 1
+                raise SchedulerBusy(
+                    f"Model queue is full ({len(self._heap)} waiting). Please retry shortly."
+                )
+            if self._user_queued.get(user, 0) >= self.max_per_user:
+                self.stats["rejected"] += 1
+                raise SchedulerBusy(
+                    f"You already have {self.max_per_user} model runs queued."
+                )
+
+            # start-time fair queueing: a user's next job starts no earlier
+            # than their previous one finished (in virtual time)
+            start = max(self._vtime, self._user_tag.get(user, 0.0))
+            self._user_tag[user] = start + 1.0
+
+            job = Job(key, fn, args, kwargs, priority, user, start)
+            heapq.heappush(self._heap, (priority, start, next(self._seq), job))
+            self._inflight[key] = job
+            self._user_queued[user] = self._user_queued.get(user, 0) + 1
+            self.stats["submitted"] += 1
+            self._cv.notify()
+            return job
+
+    def position(self, job):
+        """
+        1-based queue position, 0 once running, None when finished.
+        """
+
+        with self._cv:
+            if job.started_at is not None:
+                return 0 if job.finished_at is None else None
+            ahead = sum(1 for p, t, _, j in self._heap if (p, t) < (job.priority, job.tag))
+            return ahead + 1
+
+    # ---------------- Workers ----------------
+
+    def _worker(self):
+        while True:
+            with self._cv:
+                while not self._heap and not self._closed:
+                    self._cv.wait()
+                if self._closed and not self._heap:
+                    return
+                _, tag, _, job = heapq.heappop(self._heap)
+                self._vtime = max(self._vtime, tag)
+                self._user_queued[job.user] -= 1
+                if not self._user_queued[job.user]:
+                    del self._user_queued[job.user]
+                self._running += 1
+                job.started_at = time.monotonic()
+
+            try:
+                result = job.context.run(job.fn, *job.args, **job.kwargs)
+            except BaseException as exc:
+                error, result = exc, None
+            else:
+                error = None
+
+            with self._cv:
+                job.finished_at = time.monotonic()
+                self._running -= 1
+                self._inflight.pop(job.key, None)
+                self.stats["completed" if error is None else "failed"] += 1
+                self.stats["wait_s"] += job.started_at - job.submitted_at
+                self.stats["run_s"] += job.finished_at - job.started_at
+
+            # resolve outside the lock: callbacks may submit again
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+
+    def shutdown(self, wait=True):
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    # ---------------- Introspection ----------------
+
+    def snapshot(self):
+        """
+        Returns a dict of queue depth, running count and cumulative counters.
+        """
+
+        with self._cv:
+            s = dict(self.stats)
+            s["queued"] = len(self._heap)
+            s["running"] = self._running
+            s["workers"] = self.workers
+        finished = s["completed"] + s["failed"]
+        s["avg_wait_s"] = s["wait_s"] / finished if finished else 0.0
+        s["avg_run_s"] = s["run_s"] / finished if finished else 0.0
+        return s
+
+
+@lru_cache(maxsize=1)
+def get_scheduler():
+    """
+    Process-wide scheduler shared by every Streamlit session.
+    """
+    return ModelScheduler()
+
+
+# ---------------- Model entry point ----------------
+
+def analysis_key(company, df_company):
+    """
+    Two requests coalesce when they score the same company from the
+    same input rows.
+    """
+
+    import pandas as pd
+
+    digest = int(pd.util.hash_pandas_object(df_company, index=False).sum())
+    return ("analyze_company", str(company).strip().lower(), digest)
+
+
+def submit_analysis(company, df_company, user="anonymous", priority=PRIORITY_INTERACTIVE):
+    """
+    Queues analyze_company on the shared scheduler. Returns a Job.
+    """
+
+    from model.ews_model import analyze_company
+
+    return get_scheduler().submit(
+        analysis_key(company, df_company),
+        analyze_company,
+        company=company,
+        df_company=df_company,
+        priority=priority,
+        user=user,
+    )
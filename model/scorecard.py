@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# FH scorecard definition -> NumPy kernel
+#
+# The weights, interpolation knots and penalty tables live in a JSON
+# definition (model/scorecard.json, or SCORECARD_PATH). It is
+# validated and compiled once; scoring is then a handful of array
+# operations per input column instead of a Python call per row.
+#
+#   components  weight + inputs; an input is interpolated over
+#               knots -> scores (clamped at the ends, `missing`
+#               substituted for NaN) or passed through when it has
+#               no knots. A component is the mean of its inputs.
+#   penalties   ordered [op, value, points] thresholds (first match
+#               wins) or {category: points}, matched case-insensitively
+#
+# FH = clip(sum(weight * component) - sum(penalties), 0, 100)
+#
+# The file is re-read when its mtime changes; a definition that fails
+# validation is reported and the previous one keeps serving.
+# ---------------------------------------------------------------
+
+SCORECARD_PATH = os.environ.get(
+    "SCORECARD_PATH",
+    os.path.join(os.path.dirname(__file__), "scorecard.json")
+)
+CHALLENGER_PATH = os.environ.get("SCORECARD_CHALLENGER_PATH")
+
+WEIGHT_TOLERANCE = 1e-6
+
+_OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+}
+
+
+class ScorecardError(ValueError):
+    pass
+
+
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+# ---------------- Validation ----------------
+
+def validate(defn):
+    """
+    Raises ScorecardError listing every problem in the definition.
+    """
+
+    if not isinstance(defn, dict):
+        raise ScorecardError("definition must be a JSON object")
+
+    errors = []
+    components = defn.get("components")
+    if not isinstance(components, dict) or not components:
+        errors.append("'components' must be a non-empty object")
+        components = {}
+
+    total = 0.0
+    for name, comp in components.items():
+        if not isinstance(comp, dict):
+            errors.append(f"{name}: component must be an object")
+            continue
+        weight = comp.get("weight")
+        if not _is_number(weight) or weight < 0:
+            errors.append(f"{name}: weight must be a non-negative number")
+        else:
+            total += weight
+        inputs = comp.get("inputs") or []
+        if not isinstance(inputs, list) or not inputs:
+            errors.append(f"{name}: needs at least one input")
+        for inp in inputs:
+            col = inp.get("column") if isinstance(inp, dict) else None
+            if not col or not isinstance(col, str):
+                errors.append(f"{name}: input without a column")
+                continue
+            if "missing" in inp and inp["missing"] is not None and not _is_number(inp["missing"]):
+                errors.append(f"{name}/{col}: missing must be a number")
+            knots, scores = inp.get("knots"), inp.get("scores")
+            if knots is None and scores is None:
+                continue
+            if not isinstance(knots, list) or not isinstance(scores, list) or not knots or len(knots) != len(scores):
+                errors.append(f"{name}/{col}: knots and scores must be non-empty and the same length")
+            elif not all(_is_number(v) for v in knots + scores):
+                errors.append(f"{name}/{col}: knots and scores must be numbers")
+            elif any(b <= a for a, b in zip(knots, knots[1:])):
+                errors.append(f"{name}/{col}: knots must be strictly increasing")
+
+    if components and abs(total - 1.0) > WEIGHT_TOLERANCE:
+        errors.append(f"component weights sum to {total:.4f}, expected 1")
+
+    penalties = defn.get("penalties", [])
+    for pen in penalties if isinstance(penalties, list) else [None]:
+        col = pen.get("column") if isinstance(pen, dict) else None
+        if not col:
+            errors.append("penalty without a column")
+        elif "thresholds" in pen:
+            thresholds = pen["thresholds"] if isinstance(pen["thresholds"], list) else [None]
+            for t in thresholds:
+                if (
+                    not isinstance(t, list) or len(t) != 3 or t[0] not in _OPS
+                    or not _is_number(t[1]) or not _is_number(t[2])
+                ):
+                    errors.append(
+                        f"penalty {col}: thresholds are [op, number, points] with op in {list(_OPS)}"
+                    )
+                    break
+        elif not isinstance(pen.get("categories"), dict):
+            errors.append(f"penalty {col}: needs 'thresholds' or 'categories'")
+        elif not all(_is_number(v) for v in pen["categories"].values()):
+            errors.append(f"penalty {col}: category points must be numbers")
+
+    if errors:
+        raise ScorecardError("; ".join(errors))
+
+
+# ---------------- Compiled kernel ----------------
+
+class CompiledScorecard:
+
+    def __init__(self, defn):
+        validate(defn)
+        self.definition = defn
+        self.name = defn.get("name", "scorecard")
+        self.digest = hashlib.sha256(
+            json.dumps(defn, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+
+        # flat list of (column, weight, knots, scores, missing)
+        self.inputs = []
+        for comp in defn["components"].values():
+            share = float(comp["weight"]) / len(comp["inputs"])
+            for inp in comp["inputs"]:
+                knots = np.asarray(inp["knots"], dtype=float) if "knots" in inp else None
+                scores = np.asarray(inp["scores"], dtype=float) if "scores" in inp else None
+                self.inputs.append((inp["column"], share, knots, scores, float(inp.get("missing", np.nan))))
+
+        # (column, conditions [(ufunc, value)], points) or (column, {CATEGORY: points})
+        self.thresholds, self.categories = [], []
+        for pen in defn.get("penalties", []):
+            if "thresholds" in pen:
+                conds = [(_OPS[op], float(v)) for op, v, _ in pen["thresholds"]]
+                points = [float(p) for _, _, p in pen["thresholds"]]
+                self.thresholds.append((pen["column"], conds, points))
+            else:
+                cats = {str(k).strip().upper(): float(v) for k, v in pen["categories"].items()}
+                self.categories.append((pen["column"], cats))
+
+        self.numeric_columns = sorted({c for c, *_ in self.inputs} | {c for c, *_ in self.thresholds})
+        self.categorical_columns = sorted({c for c, _ in self.categories})
+
+    def kernel(self, numeric, categorical):
+        """
+        Scores pre-gathered arrays: numeric {column: float array},
+        categorical {column: upper-cased str array}.
+        """
+
+        n = len(next(iter(numeric.values()))) if numeric else len(next(iter(categorical.values())))
+        total = np.zeros(n)
+
+        for column, share, knots, scores, missing in self.inputs:
+            v = numeric[column]
+            if not np.isnan(missing):
+                v = np.where(np.isnan(v), missing, v)
+            total += share * (np.interp(v, knots, scores) if knots is not None else v)
+
+        penalty = np.zeros(n)
+        for column, conds, points in self.thresholds:
+            if not conds:
+                continue
+            v = numeric[column]
+            # NaN fails every comparison: no penalty for a missing value
+            penalty += np.select([op(v, t) for op, t in conds], points, default=0.0)
+        for column, cats in self.categories:
+            if not cats:
+                continue
+            v = categorical[column]
+            penalty += np.select([v == k for k in cats], list(cats.values()), default=0.0)
+
+        return np.clip(total - penalty, 0, 100)
+
+    def score(self, df):
+        numeric, categorical = gather(df, self.numeric_columns, self.categorical_columns)
+        return self.kernel(numeric, categorical)
+
+
+def gather(df, numeric_columns, categorical_columns):
+    """
+    Coerces each needed column once. A column the frame lacks reads as
+    missing (NaN / empty), like an absent value in any single row.
+    """
+
+    n = len(df)
+    numeric = {
+        c: pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float) if c in df.columns else np.full(n, np.nan)
+        for c in numeric_columns
+    }
+    categorical = {
+        c: df[c].astype(str).str.strip().str.upper().to_numpy() if c in df.columns else np.full(n, "")
+        for c in categorical_columns
+    }
+    return numeric, categorical
+
+
+def score_side_by_side(scorecards, df):
+    """
+    Scores several compiled scorecards over df from one gather of the
+    union of their inputs. Returns a DataFrame, one column per name.
+    """
+
+    numeric_cols = sorted(set().union(*(s.numeric_columns for s in scorecards)))
+    cat_cols = sorted(set().union(*(s.categorical_columns for s in scorecards)))
+    numeric, categorical = gather(df, numeric_cols, cat_cols)
+
+    out = {}
+    for s in scorecards:
+        key = s.name if s.name not in out else f"{s.name} ({s.digest[:6]})"
+        out[key] = s.kernel(numeric, categorical)
+    return pd.DataFrame(out, index=df.index)
+
+
+def compile_scorecard(path):
+    with open(path, encoding="utf-8") as f:
+        try:
+            defn = json.load(f)
+        except ValueError as e:
+            raise ScorecardError(f"{os.path.basename(path)} is not valid JSON: {e}")
+    return CompiledScorecard(defn)
+
+
+# ---------------- Hot reload ----------------
+
+class ScorecardFile:
+    """
+    A definition file that recompiles when its mtime changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._compiled = None
+        self.last_error = None
+
+    def get(self):
+        mtime = os.stat(self.path).st_mtime
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    try:
+                        self._compiled = compile_scorecard(self.path)
+                        self.last_error = None
+                    except Exception as e:
+                        # any failure rejects the edit; the last good
+                        # definition keeps serving
+                        self.last_error = str(e) if isinstance(e, ScorecardError) else f"{type(e).__name__}: {e}"
+                        if self._compiled is None:
+                            raise
+                    self._mtime = mtime
+        return self._compiled
+
+
+@lru_cache(maxsize=8)
+def get_scorecard_file(path=SCORECARD_PATH):
+    return ScorecardFile(path)
+
+
+def champion():
+    """
+    The live FH scorecard (SCORECARD_PATH), reloaded on change.
+    """
+    return get_scorecard_file(SCORECARD_PATH).get()
@@ -0,0 +1,228 @@
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------
+# Hashed text features from the qualitative assessment notes
+#
+# The same notes the Assessment page collects (promoter background,
+# industry outlook, supplier / operational risk, ESG ...) exist as
+# master columns. They are turned into sparse features with a
+# stateless HashingVectorizer: no vocabulary to fit or store, so a
+# new application's notes hash with the model exactly as training
+# rows did. Tokens are tagged with their column, so "weak" in ESG
+# notes and "weak" in market position are different features.
+#
+# The master matrix is built streaming from the text side store
+# (bounded memory) and cached per master content hash.
+# MODEL_TEXT_FEATURES=1 makes the registry train TextRidge.
+# ---------------------------------------------------------------
+
+TEXT_FEATURE_COLUMNS = [
+    "Promoter Background Check",
+    "Promoter Experience & Track Record",
+    "Management Track Record Notes",
+    "Industry Outlook Notes",
+    "Market Position & Competitive Advantage",
+    "Customer Base Analysis",
+    "Supplier Relations & Dependencies",
+    "Operational Risk Assessment",
+    "ESG Compliance Notes",
+]
+
+N_FEATURES = 2 ** 12
+STREAM_BATCH = 5000
+
+DEFAULT_TEXT = os.environ.get("MODEL_TEXT_FEATURES", "0").lower() in ("1", "true", "yes")
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]+")
+
+
+def _analyzer(doc):
+    # doc is a tuple of column texts
+    tokens = []
+    for i, text in enumerate(doc):
+        if text:
+            words = _TOKEN.findall(str(text).lower())
+            tokens += [f"{i}:{w}" for w in words]
+            tokens += [f"{i}:{a}_{b}" for a, b in zip(words, words[1:])]
+    return tokens
+
+
+def _vectorizer(n_features=N_FEATURES):
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        n_features=n_features, analyzer=_analyzer, alternate_sign=False, norm="l2"
+    )
+
+
+def hash_documents(frame, columns=TEXT_FEATURE_COLUMNS, n_features=N_FEATURES):
+    """
+    Sparse CSR (rows x n_features) for the text columns of `frame`;
+    absent columns or values contribute nothing.
+    """
+
+    cols = [frame[c].astype(object) if c in frame.columns else pd.Series(None, index=frame.index) for c in columns]
+    docs = [tuple(None if v is None or v != v else v for v in row) for row in zip(*cols)]
+    return _vectorizer(n_features).transform(docs).tocsr()
+
+
+# ---------------- Master matrix (streamed, cached) ----------------
+
+def master_text_matrix(path, n_features=N_FEATURES, batch=STREAM_BATCH):
+    """
+    (row_ids, CSR) for every master row, built batch by batch from the
+    text store and cached per master content hash.
+    """
+
+    import scipy.sparse as sp
+    from ingest.master_store import CACHE_DIR, get_text_store, _digest
+
+    cache = os.path.join(CACHE_DIR, f"{_digest(path)}.text_{n_features}.npz")
+    if os.path.exists(cache):
+        with np.load(cache) as z:
+            m = sp.csr_matrix((z["data"], z["indices"], z["indptr"]), shape=tuple(z["shape"]))
+            return z["row_ids"], m
+
+    store = get_text_store(path)
+    available = set(store.columns())
+    columns = [c for c in TEXT_FEATURE_COLUMNS if c in available]
+
+    ids, blocks = [], []
+    for batch_ids, text in store.iter_rows(columns=columns, batch=batch):
+        blocks.append(hash_documents(text, TEXT_FEATURE_COLUMNS, n_features))
+        ids += batch_ids
+
+    row_ids = np.asarray(ids, dtype=np.int64)
+    m = sp.vstack(blocks).tocsr() if blocks else sp.csr_matrix((0, n_features))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cache}.tmp.{os.getpid()}.npz"
+    np.savez(tmp, data=m.data, indices=m.indices, indptr=m.indptr, shape=np.array(m.shape), row_ids=row_ids)
+    os.replace(tmp, cache)
+    return row_ids, m
+
+
+def text_rows(path, row_ids, n_features=N_FEATURES):
+    """
+    Master text features for the given row_ids, in that order.
+    """
+
+    ids, m = master_text_matrix(path, n_features)
+    pos = np.searchsorted(ids, np.asarray(row_ids, dtype=np.int64))
+    return m[pos]
+
+
+# ---------------- Model ----------------
+
+class TextRidge:
+    """
+    Ridge over standardised numeric features plus hashed text.
+    fit/predict hash the text columns found in X unless a precomputed
+    matrix is passed as `text`.
+    """
+
+    uses_text = True
+
+    def __init__(self, alpha=1.2, text_weight=1.0, n_features=N_FEATURES):
+        self.alpha = alpha
+        self.text_weight = text_weight
+        self.n_features = n_features
+
+    def _design(self, X, text):
+        import scipy.sparse as sp
+
+        num = X[self.numeric_columns_].to_numpy(dtype=np.float64)
+        num = np.where(np.isnan(num), self.medians_, num)
+        num = (num - self.mean_) / self.scale_
+        if text is None:
+            text = hash_documents(X, TEXT_FEATURE_COLUMNS, self.n_features)
+        return sp.hstack([sp.csr_matrix(num), text * self.text_weight]).tocsr()
+
+    def fit(self, X, y, text=None):
+        from sklearn.linear_model import Ridge
+
+        self.numeric_columns_ = [c for c in X.columns if c not in TEXT_FEATURE_COLUMNS]
+        num = X[self.numeric_columns_].to_numpy(dtype=np.float64)
+        medians = np.nanmedian(num, axis=0)
+        self.medians_ = np.where(np.isnan(medians), 0.0, medians)
+        num = np.where(np.isnan(num), self.medians_, num)
+        self.mean_ = num.mean(axis=0)
+        self.scale_ = num.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+
+        self.model_ = Ridge(alpha=self.alpha).fit(self._design(X, text), np.asarray(y, dtype=np.float64))
+        return self
+
+    def predict(self, X, text=None):
+        return self.model_.predict(self._design(X, text))
+
+
+# ---------------- Does the text help? ----------------
+
+def compare(path, alpha=1.2, text_weight=1.0):
+    """
+    Out-of-time comparison on the latest training FY: numeric-only
+    Ridge vs numeric + hashed text. Returns a DataFrame with oot_mae,
+    fit_s and single-row predict latency (including hashing).
+    """
+
+    from model.ews_model import TARGET, load_master, build_features, training_frame, fit_model, model_inputs
+
+    train = training_frame(build_features(load_master(path), entity_col="Company Name"))
+    test_fy = train["FY"].max()
+    past, test = train[train["FY"] < test_fy], train[train["FY"] == test_fy]
+
+    # untimed warm-up of both paths: sklearn / scipy imports and the
+    # text-matrix cache build are not part of fit_s
+    fit_model(past.head(200), "ridge", "global", text=False, path=path)
+    fit_model(past.head(200), "ridge", "global", text=True, path=path)
+
+    rows = []
+    for label, use_text in (("numeric", False), ("numeric + text", True)):
+        t0 = time.perf_counter()
+        model = fit_model(past, "ridge", "global", text=use_text, path=path, alpha=alpha,
+                          **({"text_weight": text_weight} if use_text else {}))
+        fit_s = time.perf_counter() - t0
+
+        # test rows carry raw notes: hashed at predict time, as in scoring
+        X_test = model_inputs(model, test, path)
+        pred = model.predict(X_test)
+
+        one = X_test.iloc[[0]]
+        t = time.perf_counter()
+        for _ in range(50):
+            model.predict(one)
+        single_ms = (time.perf_counter() - t) / 50 * 1000
+
+        rows.append({
+            "model": label,
+            "oot_mae": round(float(np.mean(np.abs(test[TARGET].to_numpy() - pred))), 4),
+            "fit_s": round(fit_s, 3),
+            "single_ms": round(single_ms, 3),
+        })
+    return pd.DataFrame(rows).set_index("model")
+
+
+def text_frame(path, row_ids):
+    """
+    Raw note text for master rows (for scoring paths that hash at predict time).
+    Every TEXT_FEATURE_COLUMNS column is present; ones the store dropped
+    as empty are all None.
+    """
+
+    from ingest.master_store import get_text_store
+
+    store = get_text_store(path)
+    cols = [c for c in TEXT_FEATURE_COLUMNS if c in set(store.columns())]
+    return store.fetch(row_ids, cols).reindex(columns=TEXT_FEATURE_COLUMNS)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(compare(sys.argv[1] if len(sys.argv) > 1 else "data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx"))
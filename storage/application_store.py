@@ -0,0 +1,407 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from functools import lru_cache
+
+# ---------------------------------------------------------------
+# Persistent application store (SQLite, WAL)
+#
+# One row per application in `applications` holds the columns the
+# worklist filters and sorts on. Each page's data lives in
+# `sections` as JSON, so a page load reads only its own section.
+#
+# Writes from all sessions go through one writer thread that commits
+# them in batches: one transaction and fsync per batch instead of
+# one per "Save & Continue". WAL lets readers run concurrently with
+# that writer, so there is no lock contention between sessions.
+# ---------------------------------------------------------------
+
+DB_PATH = os.environ.get(
+    "APP_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "applications.db")
+)
+
+BATCH_MAX = 200
+BATCH_WAIT_S = 0.005
+
+STATUSES = ["Draft", "Submitted", "Under Review", "Approved", "Rejected"]
+
+WORKLIST_COLUMNS = [
+    "app_id", "company_name", "pan", "sector", "status",
+    "loan_amount_cr", "fh_score", "updated_at",
+]
+SORTABLE = {"updated_at", "created_at", "company_name", "loan_amount_cr", "fh_score", "status", "sector"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    app_id          TEXT PRIMARY KEY,
+    company_name    TEXT,
+    pan             TEXT,
+    sector          TEXT,
+    status          TEXT NOT NULL DEFAULT 'Draft',
+    loan_amount_cr  REAL,
+    fh_score        REAL,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_app_pan ON applications(pan);
+CREATE INDEX IF NOT EXISTS ix_app_status ON applications(status, updated_at);
+CREATE INDEX IF NOT EXISTS ix_app_updated ON applications(updated_at);
+CREATE INDEX IF NOT EXISTS ix_app_sector ON applications(sector, updated_at);
+CREATE INDEX IF NOT EXISTS ix_app_loan ON applications(loan_amount_cr);
+CREATE INDEX IF NOT EXISTS ix_app_fh ON applications(fh_score);
+CREATE INDEX IF NOT EXISTS ix_app_status_fh ON applications(status, fh_score);
+CREATE INDEX IF NOT EXISTS ix_app_sector_loan ON applications(sector, loan_amount_cr);
+
+CREATE TABLE IF NOT EXISTS sections (
+    app_id      TEXT NOT NULL,
+    section     TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (app_id, section)
+) WITHOUT ROWID;
+"""
+
+# section -> {payload key: applications column}
+INDEXED_FIELDS = {
+    "borrower_profile": {"company_name": "company_name", "pan": "pan", "sector": "sector"},
+    "loan_request": {"loan_amount_cr": "loan_amount_cr"},
+}
+
+
+# ---------------- JSON with dates ----------------
+
+def _encode(obj):
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__date__": obj.isoformat()}
+    if hasattr(obj, "item"):          # numpy scalars
+        return obj.item()
+    raise TypeError(f"Cannot store {type(obj).__name__}")
+
+
+def _decode(d):
+    if "__date__" in d:
+        return date.fromisoformat(d["__date__"])
+    if "__datetime__" in d:
+        return datetime.fromisoformat(d["__datetime__"])
+    return d
+
+
+def dumps(payload):
+    return json.dumps(payload, default=_encode, ensure_ascii=False)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+# ---------------- Store ----------------
+
+class ApplicationStore:
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._local = threading.local()
+        self._queue = queue.Queue()
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="app-store-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- connections ----------
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA cache_size=-16000")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---------- batched writer ----------
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_WAIT_S
+            while len(batch) < BATCH_MAX:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            try:
+                self._run(conn, [op for op, _ in batch])
+                errors = [None] * len(batch)
+            except Exception:
+                # isolate the failing write so other sessions' writes still land
+                errors = []
+                for op, _ in batch:
+                    try:
+                        self._run(conn, [op])
+                        errors.append(None)
+                    except Exception as exc:
+                        errors.append(exc)
+
+            for (_, done), error in zip(batch, errors):
+                if done is not None:
+                    done["error"] = error
+                    done["event"].set()
+
+    @staticmethod
+    def _run(conn, ops):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op in ops:
+                op(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _submit(self, op, wait=True):
+        done = {"event": threading.Event(), "error": None} if wait else None
+        self._queue.put((op, done))
+        if wait:
+            done["event"].wait()
+            if done["error"] is not None:
+                raise done["error"]
+
+    # ---------- writes ----------
+
+    def create_application(self, status="Draft", app_id=None, wait=True):
+        app_id = app_id or uuid.uuid4().hex[:12].upper()
+        now = time.time()
+
+        def op(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO applications (app_id, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (app_id, status, now, now),
+            )
+
+        self._submit(op, wait)
+        return app_id
+
+    def save_section(self, app_id, section, payload, wait=True):
+        """
+        Upserts one page's data and refreshes the indexed columns it
+        feeds. wait=False returns as soon as the write is queued.
+        """
+
+        text = dumps(payload)
+        now = time.time()
+        indexed = {
+            col: payload.get(key)
+            for key, col in INDEXED_FIELDS.get(section, {}).items()
+        }
+        if indexed.get("pan"):
+            indexed["pan"] = indexed["pan"].strip().upper()
+
+        def op(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO applications (app_id, status, created_at, updated_at) "
+                "VALUES (?, 'Draft', ?, ?)",
+                (app_id, now, now),
+            )
+            conn.execute(
+                "INSERT INTO sections (app_id, section, payload, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(app_id, section) DO UPDATE SET "
+                "payload = excluded.payload, updated_at = excluded.updated_at",
+                (app_id, section, text, now),
+            )
+            sets = ", ".join(f"{c} = ?" for c in indexed)
+            conn.execute(
+                f"UPDATE applications SET {sets + ', ' if sets else ''}updated_at = ? WHERE app_id = ?",
+                (*indexed.values(), now, app_id),
+            )
+
+        self._submit(op, wait)
+
+    def update_application(self, app_id, wait=True, **fields):
+        """
+        Sets indexed columns directly, e.g. status="Submitted", fh_score=72.5.
+        """
+
+        allowed = {"status", "fh_score", "company_name", "pan", "sector", "loan_amount_cr"}
+        bad = set(fields) - allowed
+        if bad:
+            raise ValueError(f"Unknown application fields: {sorted(bad)}")
+        if "status" in fields and fields["status"] not in STATUSES:
+            raise ValueError(f"Unknown status: {fields['status']}")
+
+        now = time.time()
+        sets = ", ".join(f"{c} = ?" for c in fields)
+
+        def op(conn):
+            conn.execute(
+                f"UPDATE applications SET {sets + ', ' if sets else ''}updated_at = ? WHERE app_id = ?",
+                (*fields.values(), now, app_id),
+            )
+
+        self._submit(op, wait)
+
+    def flush(self):
+        self._submit(lambda conn: None, wait=True)
+
+    # ---------- reads ----------
+
+    def load_section(self, app_id, section):
+        row = self._reader().execute(
+            "SELECT payload FROM sections WHERE app_id = ? AND section = ?",
+            (app_id, section),
+        ).fetchone()
+        return loads(row["payload"]) if row else None
+
+    def get_application(self, app_id):
+        row = self._reader().execute(
+            "SELECT * FROM applications WHERE app_id = ?", (app_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def find_by_pan(self, pan):
+        rows = self._reader().execute(
+            "SELECT * FROM applications WHERE pan = ? ORDER BY updated_at DESC",
+            ((pan or "").strip().upper(),),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def list_applications(
+        self,
+        status=None,
+        sector=None,
+        min_loan=None,
+        max_loan=None,
+        min_fh=None,
+        max_fh=None,
+        sort="updated_at",
+        descending=True,
+        page=1,
+        page_size=25,
+    ):
+        """
+        Server-side filtered / sorted / paginated worklist query.
+        Only the requested page is fetched.
+
+        Returns (rows, total_matching).
+        """
+
+        if sort not in SORTABLE:
+            raise ValueError(f"Cannot sort by {sort}")
+
+        where, args = [], []
+        for clause, value in [
+            ("status = ?", status),
+            ("sector = ?", sector),
+            ("loan_amount_cr >= ?", min_loan),
+            ("loan_amount_cr <= ?", max_loan),
+            ("fh_score >= ?", min_fh),
+            ("fh_score <= ?", max_fh),
+        ]:
+            if value is not None:
+                where.append(clause)
+                args.append(value)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+        conn = self._reader()
+        total = conn.execute(f"SELECT COUNT(*) FROM applications {where_sql}", args).fetchone()[0]
+
+        direction = "DESC" if descending else "ASC"
+        offset = max(page - 1, 0) * page_size
+        rows = conn.execute(
+            f"SELECT {', '.join(WORKLIST_COLUMNS)} FROM applications {where_sql} "
+            f"ORDER BY {sort} {direction}, app_id {direction} LIMIT ? OFFSET ?",
+            (*args, page_size, offset),
+        ).fetchall()
+
+        return [dict(r) for r in rows], total
+
+    def distinct_sectors(self):
+        rows = self._reader().execute(
+            "SELECT DISTINCT sector FROM applications WHERE sector IS NOT NULL ORDER BY sector"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def list_sections(self, app_id):
+        rows = self._reader().execute(
+            "SELECT section FROM sections WHERE app_id = ?", (app_id,)
+        ).fetchall()
+        return [r["section"] for r in rows]
+
+
+@lru_cache(maxsize=1)
+def get_application_store():
+    """
+    Process-wide store shared by every Streamlit session.
+    """
+    return ApplicationStore()
+
+
+# ---------------- Synthetic load for worklist benchmarks ----------------
+
+def seed_synthetic(store, n, seed=7):
+    import random
+
+    rng = random.Random(seed)
+    sectors = ["Manufacturing", "Trading", "Services", "Real Estate", "IT & Technology", "Retail"]
+    now = time.time()
+    rows = [
+        (
+            f"SYN{i:08d}", f"Synthetic Co {i}", None, rng.choice(sectors), rng.choice(STATUSES),
+            round(rng.uniform(0.5, 500), 2), round(rng.uniform(20, 95), 1),
+            now - rng.uniform(0, 3e7), now - rng.uniform(0, 3e6),
+        )
+        for i in range(n)
+    ]
+
+    def op(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO applications (app_id, company_name, pan, sector, status, "
+            "loan_amount_cr, fh_score, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    store._submit(op)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Seed and time worklist queries")
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--seed", type=int, default=100_000)
+    args = ap.parse_args()
+
+    store = ApplicationStore(args.db)
+    seed_synthetic(store, args.seed)
+
+    for label, kwargs in [
+        ("recent", {}),
+        ("status + fh sort", {"status": "Submitted", "sort": "fh_score"}),
+        ("sector + loan range", {"sector": "Retail", "min_loan": 50, "max_loan": 200, "sort": "loan_amount_cr"}),
+        ("deep page", {"page": 2000}),
+    ]:
+        t0 = time.perf_counter()
+        rows, total = store.list_applications(**kwargs)
+        print(f"{label:<22} {len(rows):>3} of {total:>7} in {(time.perf_counter() - t0) * 1000:.1f} ms")
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import tempfile
+
+# ---------------------------------------------------------------
+# Content-addressed document store
+#
+# Uploaded files are copied to disk in fixed-size chunks while the
+# SHA-256 is computed, then stored at objects/<aa>/<sha256>.
+# The same bytes uploaded twice, by any session, are kept once.
+# Session state only holds the small reference dict returned by
+# store_upload().
+#
+# Limit: Streamlit's UploadedFile already holds the whole upload in
+# server memory (up to server.maxUploadSize) before this code sees it.
+# The chunked copy keeps hashing and writing from adding a second full
+# copy, and stops sessions from retaining file bytes across reruns.
+# It does not bound the peak during the upload itself. Only an upload
+# path outside st.file_uploader could do that.
+# ---------------------------------------------------------------
+
+STORE_DIR = os.environ.get(
+    "DOC_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "uploads")
+)
+
+CHUNK_SIZE = 1024 * 1024   # 1 MiB
+
+
+class DocumentTooLarge(ValueError):
+    pass
+
+
+def _object_path(sha256):
+    return os.path.join(STORE_DIR, "objects", sha256[:2], sha256)
+
+
+def store_upload(fileobj, filename, max_bytes=None):
+    """
+    Streams a file-like object into the store.
+
+    Returns:
+        {"sha256", "size", "filename", "ext", "deduplicated"}
+
+    Raises DocumentTooLarge once more than max_bytes have been read;
+    the partial copy is discarded.
+    """
+
+    tmp_dir = os.path.join(STORE_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = fileobj.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise DocumentTooLarge(
+                        f"{filename} exceeds {max_bytes / (1024 * 1024):.0f} MB"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        final_path = _object_path(sha256)
+
+        deduplicated = os.path.exists(final_path)
+        if deduplicated:
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)   # atomic on the same filesystem
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {
+        "sha256": sha256,
+        "size": size,
+        "filename": filename,
+        "ext": os.path.splitext(filename or "")[1].lstrip(".").lower(),
+        "deduplicated": deduplicated,
+    }
+
+
+def document_path(ref):
+    """
+    Resolves a reference (dict or sha256 string) to its file on disk.
+    """
+    sha256 = ref["sha256"] if isinstance(ref, dict) else ref
+    path = _object_path(sha256)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Document {sha256} not found in store")
+    return path
+
+
+def open_document(ref):
+    return open(document_path(ref), "rb")
+
+
+def iter_chunks(ref, chunk_size=CHUNK_SIZE):
+    with open_document(ref) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def store_stats():
+    """
+    Returns {"objects": n, "bytes": total} for the on-disk store.
+    """
+    root = os.path.join(STORE_DIR, "objects")
+    n = total = 0
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            n += 1
+            total += os.path.getsize(os.path.join(dirpath, name))
+    return {"objects": n, "bytes": total}
@@ -0,0 +1,163 @@
+import contextvars
+import functools
+import glob
+import json
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+
+# ---------------------------------------------------------------
+# Render telemetry
+#
+# Each page render is timed, along with the time spent inside
+# functions decorated with @timed("model") / @timed("validation").
+# One JSON line per render goes to a size-rotated local file.
+# The accumulator is a ContextVar, so concurrent sessions (one
+# script thread each) never mix their numbers.
+# ---------------------------------------------------------------
+
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "metrics")
+)
+METRICS_FILE = "renders.jsonl"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+_active = contextvars.ContextVar("telemetry_active", default=None)
+_logger = None
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        logger = logging.getLogger("cuui.telemetry")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(
+                os.path.join(METRICS_DIR, METRICS_FILE),
+                maxBytes=MAX_BYTES,
+                backupCount=BACKUP_COUNT,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+# ---------------- Instrumentation ----------------
+
+def timed(category):
+    """
+    Decorator: adds the call's wall time to `category` of the render
+    currently being recorded (no-op outside a recorded render).
+    """
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            bucket = _active.get()
+            if bucket is None:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                bucket[category] = bucket.get(category, 0.0) + time.perf_counter() - t0
+                bucket[f"{category}_calls"] = bucket.get(f"{category}_calls", 0) + 1
+        return inner
+
+    return wrap
+
+
+def record_render(page, render_fn, trigger=None, state_bytes_fn=None):
+    """
+    Runs render_fn() and writes one metrics line for it.
+    state_bytes_fn is evaluated after the render.
+    """
+
+    bucket = {}
+    token = _active.set(bucket)
+    t0 = time.perf_counter()
+    error = None
+    try:
+        return render_fn()
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        wall = time.perf_counter() - t0
+        _active.reset(token)
+
+        line = {
+            "ts": round(time.time(), 3),
+            "page": page,
+            "trigger": trigger,
+            "render_ms": round(wall * 1000, 2),
+            "model_ms": round(bucket.get("model", 0.0) * 1000, 2),
+            "validation_ms": round(bucket.get("validation", 0.0) * 1000, 2),
+            "model_calls": bucket.get("model_calls", 0),
+            "validation_calls": bucket.get("validation_calls", 0),
+        }
+        if state_bytes_fn is not None:
+            try:
+                line["session_state_bytes"] = state_bytes_fn()
+            except Exception:
+                line["session_state_bytes"] = None
+        if error:
+            line["error"] = error
+        # st.rerun()/st.stop() unwind through here too and are still recorded
+        _get_logger().info(json.dumps(line))
+
+
+# ---------------- Reading back ----------------
+
+def load_metrics(since=None):
+    """
+    Reads all rotated files, oldest first. Returns a list of dicts.
+    """
+
+    base = os.path.join(METRICS_DIR, METRICS_FILE)
+    files = sorted(glob.glob(base + ".*"), key=lambda p: -int(p.rsplit(".", 1)[1]))
+    files += [base] if os.path.exists(base) else []
+
+    rows = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or row.get("ts", 0) >= since:
+                    rows.append(row)
+    return rows
+
+
+def summarize(rows):
+    """
+    p50 / p95 per page for render, model and validation time.
+    Returns a pandas DataFrame.
+    """
+
+    import pandas as pd
+
+    if not rows:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows)
+    if "session_state_bytes" not in df.columns:
+        df["session_state_bytes"] = float("nan")
+    agg = df.groupby("page").agg(
+        renders=("render_ms", "size"),
+        render_p50=("render_ms", lambda s: s.quantile(0.50)),
+        render_p95=("render_ms", lambda s: s.quantile(0.95)),
+        model_p95=("model_ms", lambda s: s.quantile(0.95)),
+        validation_p95=("validation_ms", lambda s: s.quantile(0.95)),
+        state_kb_p50=("session_state_bytes", lambda s: s.dropna().quantile(0.50) / 1024),
+    )
+    return agg.sort_values("render_p95", ascending=False).round(2)
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MASTER = os.path.join("data", "Indian_Companies_EWS_READY_WITH_FY2025.xlsx")
+
+
+@pytest.fixture
+def master_path(monkeypatch):
+    """
+    The bundled master, with the repo root as working directory (the
+    app's paths are relative to it).
+    """
+
+    monkeypatch.chdir(ROOT)
+    if not os.path.exists(MASTER):
+        pytest.skip("bundled master not present")
+    return MASTER
@@ -0,0 +1,63 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from model.amortization import (  # noqa: E402
+    MODES, annual_debt_service, loan_schedule, mode_codes, schedules, yearly_summary,
+)
+
+
+def _batch(n=500, seed=5):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(0.5, 400, n),
+        rng.choice([0.0, 8.5, 10.5, 14.0], n),
+        rng.integers(1, 241, n),
+        rng.integers(0, len(MODES), n),
+    )
+
+
+def test_principal_repaid_sums_to_amount():
+    principal, rate, tenure, mode = _batch()
+    s = schedules(principal, rate, tenure, mode)
+    np.testing.assert_allclose(s["principal"].sum(axis=1), principal, rtol=1e-9)
+    np.testing.assert_allclose(s["payment"], s["interest"] + s["principal"])
+
+
+def test_balance_runs_off_at_tenure():
+    principal, rate, tenure, mode = _batch()
+    s = schedules(principal, rate, tenure, mode)
+    months = np.arange(1, s["opening"].shape[1] + 1)
+    assert (s["opening"][months[None, :] > tenure[:, None]] == 0).all()
+    np.testing.assert_allclose(s["opening"][:, 0], principal)
+
+    # closing = opening - principal, and the next month opens there
+    closing = s["opening"] - s["principal"]
+    inside = months[None, :-1] < tenure[:, None]
+    np.testing.assert_allclose(closing[:, :-1][inside], s["opening"][:, 1:][inside], atol=1e-6)
+
+
+def test_emi_is_level_and_bullet_repays_at_maturity():
+    emi = loan_schedule(100, 60, "EMI", rate_pct=12.0)
+    np.testing.assert_allclose(emi["payment"], emi["payment"].iloc[0])
+    assert emi["payment"].iloc[0] == pytest.approx(2.2244, abs=1e-4)
+
+    bullet = loan_schedule(100, 24, "Interest Only", rate_pct=12.0)
+    assert (bullet["principal"].iloc[:-1] == 0).all()
+    assert bullet["principal"].iloc[-1] == pytest.approx(100)
+    np.testing.assert_allclose(bullet["interest"], 1.0)
+
+
+def test_mode_codes():
+    codes = mode_codes(["EMI", "structured", " Bullet ", "Interest Only", "interest-only", "Balloon", None])
+    assert codes.tolist() == [0, 1, 2, 2, 2, 0, 0]
+
+
+def test_yearly_summary_matches_annual_debt_service():
+    sched = loan_schedule(50, 30, "Structured", rate_pct=10.0)
+    summary = yearly_summary(sched, ebitda_cr=20.0)
+    service = annual_debt_service(sched["payment"].to_numpy()[None, :])[0]
+    np.testing.assert_allclose(summary["debt_service"], service)
+    assert summary["closing"].iloc[-1] == pytest.approx(0, abs=1e-9)
+    np.testing.assert_allclose(summary["projected_dscr"], 20.0 / service)
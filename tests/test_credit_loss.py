@@ -0,0 +1,52 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+from model.credit_loss import SCENARIO_BLOCK, loss_summary, simulate  # noqa: E402
+
+
+def _book(n=300, seed=2):
+    rng = np.random.default_rng(seed)
+    book = pd.DataFrame({
+        "Sector": rng.choice(["Manufacturing", "Trading", "Services", "Retail"], n),
+        "PD": rng.uniform(0.005, 0.2, n),
+        "EAD": rng.uniform(1, 100, n),
+        "LGD": rng.uniform(0.1, 0.9, n),
+    })
+    book["EL"] = book["PD"] * book["LGD"] * book["EAD"]
+    return book
+
+
+N_SCENARIOS = 10 * SCENARIO_BLOCK + 17    # a partial last block
+
+
+def test_results_do_not_depend_on_workers_or_memory_budget():
+    book = _book()
+    serial, serial_defaults, workers = simulate(book, N_SCENARIOS, seed=7, max_workers=1)
+    assert workers == 1
+    assert len(serial) == len(serial_defaults) == N_SCENARIOS
+
+    # 3 workers split the blocks into more, smaller tasks; a 1 MB budget
+    # forces one worker
+    for max_workers, memory_mb in ((3, 512), (4, 1)):
+        losses, defaults, _ = simulate(book, N_SCENARIOS, seed=7, max_workers=max_workers, memory_mb=memory_mb)
+        np.testing.assert_array_equal(losses, serial)
+        np.testing.assert_array_equal(defaults, serial_defaults)
+
+
+def test_seed_changes_the_draws():
+    book = _book()
+    a, _, _ = simulate(book, SCENARIO_BLOCK, seed=1, max_workers=1)
+    b, _, _ = simulate(book, SCENARIO_BLOCK, seed=2, max_workers=1)
+    assert not np.array_equal(a, b)
+
+
+def test_simulated_mean_tracks_expected_loss():
+    book = _book()
+    losses, defaults, _ = simulate(book, 20 * SCENARIO_BLOCK, seed=3, max_workers=1)
+    summary = loss_summary(book, losses, defaults)
+    assert summary["simulated_mean_loss_cr"] == pytest.approx(summary["expected_loss_cr"], rel=0.05)
+    assert summary["var_99_cr"] <= summary["var_99.9_cr"]
+    assert summary["es_99_cr"] >= summary["var_99_cr"]
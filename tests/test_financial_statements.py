@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from ingest.financial_statements import _match_field, parse_fy  # noqa: E402
+
+
+@pytest.mark.parametrize("label, field", [
+    ("Revenue from operations", "turnover"),
+    ("Net Sales (₹ Cr)", "turnover"),
+    ("Total income", None),
+    ("EBITDA", "ebitda"),
+    ("EBITDA margin (%)", None),
+    ("Profit after tax", "net_profit"),
+    ("Total equity", "net_worth"),
+    ("Total Debt", "total_debt"),
+    ("Total borrowings", "total_debt"),
+    ("Debt", "total_debt"),
+    ("Debt service coverage ratio", "dscr"),
+    ("Debt Service Coverage", "dscr"),
+    ("DSCR", "dscr"),
+    ("Debt to equity", None),
+    ("Debt-equity ratio", None),
+    ("Total Debt / Equity", None),
+    ("Borrowings - long term", None),
+    ("Short-term borrowings", None),
+    ("Current ratio", "current_ratio"),
+    ("Sales growth", None),
+    ("", None),
+])
+def test_match_field(label, field):
+    assert _match_field(label) == field
+
+
+@pytest.mark.parametrize("header, year", [
+    ("FY 2024", 2024), ("FY24", 2024), ("2023-24", 2024), ("Mar-24", 2024), (2024, 2024), ("Notes", None),
+])
+def test_parse_fy(header, year):
+    assert parse_fy(header) == year
@@ -0,0 +1,65 @@
+import random
+
+from model.group_exposure import GroupExposureIndex, guarantor_identifiers
+
+
+def _groups(index):
+    out = {}
+    for key in index.borrowers:
+        out.setdefault(index.uf.find(("B", key)), set()).add(key)
+    return sorted(sorted(map(str, keys)) for keys in out.values())
+
+
+def _bulk(rows, max_degree):
+    index = GroupExposureIndex(max_degree)
+    for _, ids, _ in rows:
+        for i in ids:
+            index.degree[i] = index.degree.get(i, 0) + 1
+    for key, ids, outstanding in rows:
+        index.upsert(key, identifiers=ids, outstanding=outstanding, precounted=True)
+    return index
+
+
+def test_shared_guarantor_links_and_totals():
+    index = GroupExposureIndex()
+    index.upsert("A", identifiers=guarantor_identifiers("Ramesh Kumar"), outstanding=10.0)
+    index.upsert("B", identifiers=guarantor_identifiers("RAMESH KUMAR, Suresh Rao"), outstanding=5.0, proposed=2.0)
+    index.upsert("C", identifiers=guarantor_identifiers("Suresh Rao"), outstanding=1.0)
+    index.upsert("D", identifiers=guarantor_identifiers("Nil"), outstanding=7.0)
+
+    group = index.group_of("A")
+    assert group["n_borrowers"] == 3
+    assert group["outstanding_cr"] == 16.0
+    assert group["total_cr"] == 18.0
+    assert index.group_of("D")["n_borrowers"] == 1
+
+    # a re-save moves only the delta
+    index.upsert("B", identifiers=guarantor_identifiers("Ramesh Kumar"), outstanding=5.0, proposed=4.0)
+    assert index.group_of("C")["total_cr"] == 20.0
+
+
+def test_identifier_crossing_the_cap_unlinks_its_group():
+    index = GroupExposureIndex(max_degree=2)
+    for key in "ABC":
+        index.upsert(key, identifiers={"GUARANTOR:RAMESH KUMAR"}, outstanding=1.0)
+
+    assert _groups(index) == [["A"], ["B"], ["C"]]
+    assert index.group_of("A")["outstanding_cr"] == 1.0
+    assert index.noisy_identifiers() == [("GUARANTOR:RAMESH KUMAR", 3)]
+
+
+def test_incremental_groups_match_bulk_build():
+    rng = random.Random(11)
+    for _ in range(50):
+        rows = [
+            (i, {f"GUARANTOR:G{rng.randrange(30)}" for _ in range(rng.randrange(1, 4))}, rng.random())
+            for i in range(60)
+        ]
+        incremental = GroupExposureIndex(max_degree=3)
+        for key, ids, outstanding in rows:
+            incremental.upsert(key, identifiers=ids, outstanding=outstanding)
+        bulk = _bulk(rows, max_degree=3)
+
+        assert _groups(incremental) == _groups(bulk)
+        for key, _, _ in rows:
+            assert incremental.group_of(key)["outstanding_cr"] == bulk.group_of(key)["outstanding_cr"]
@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from model.scorecard import SCORECARD_PATH, ScorecardError, ScorecardFile, compile_scorecard  # noqa: E402
+
+
+# ---------------- The pre-scorecard FH (row-wise), kept as the reference ----------------
+
+def _scale(v, d, r):
+    if pd.isna(v):
+        v = d[1]
+    return np.clip(np.interp(v, d, r), min(r), max(r))
+
+
+def _dpd_penalty(dpd):
+    if pd.isna(dpd): return 0
+    if dpd >= 90: return 40
+    if dpd >= 60: return 25
+    if dpd >= 30: return 15
+    if dpd > 0: return 5
+    return 0
+
+
+def baseline_fh(r):
+    leverage = _scale(r["debt_equity"], [0, 1, 3], [100, 80, 40])
+    liquidity = _scale(r["Current Ratio"], [0.5, 1, 2], [40, 70, 100])
+    coverage = _scale(r["DSCR"], [0.8, 1.2, 2], [40, 70, 100])
+    profitability = np.mean([
+        _scale(r["ROCE (%)"], [5, 10, 20], [40, 70, 100]),
+        _scale(r["ROE (%)"], [5, 10, 20], [40, 70, 100]),
+    ])
+    fh_raw = 0.35 * leverage + 0.20 * liquidity + 0.20 * coverage + 0.15 * profitability + 0.10 * r["Loan_Type_EWS"]
+
+    sma = str(r["SMA Classification"]).upper()
+    penalty = (
+        _dpd_penalty(r["Maximum DPD Observed"])
+        + (25 if sma == "SMA-2" else 15 if sma == "SMA-1" else 0)
+        + (40 if str(r["Cross-Bank NPA Tag"]).upper() == "YES" else 0)
+    )
+    return np.clip(fh_raw - penalty, 0, 100)
+
+
+def _frame(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+
+    def with_gaps(values):
+        values = values.astype(float)
+        values[rng.random(n) < 0.1] = np.nan
+        return values
+
+    return pd.DataFrame({
+        "debt_equity": with_gaps(rng.uniform(-0.5, 5, n)),
+        "Current Ratio": with_gaps(rng.uniform(0, 3, n)),
+        "DSCR": with_gaps(rng.uniform(0, 3, n)),
+        "ROCE (%)": with_gaps(rng.uniform(-10, 30, n)),
+        "ROE (%)": with_gaps(rng.uniform(-10, 30, n)),
+        "Loan_Type_EWS": rng.choice([20.0, 40.0, 70.0, 100.0], n),
+        "Maximum DPD Observed": with_gaps(rng.choice([0, 1, 29, 30, 59, 60, 89, 90, 180], n)),
+        "SMA Classification": rng.choice(["SMA-0", "SMA-1", "sma-2", "Standard", None], n),
+        "Cross-Bank NPA Tag": rng.choice(["Yes", "yes", "No", None], n),
+    })
+
+
+def test_champion_matches_baseline_fh():
+    df = _frame()
+    expected = df.apply(baseline_fh, axis=1).to_numpy()
+    np.testing.assert_allclose(compile_scorecard(SCORECARD_PATH).score(df), expected, atol=1e-9)
+
+
+def test_missing_columns_score_as_missing_values():
+    df = _frame(50)
+    scorecard = compile_scorecard(SCORECARD_PATH)
+    blanked = df.assign(**{"DSCR": np.nan})
+    np.testing.assert_allclose(scorecard.score(df.drop(columns=["DSCR"])), scorecard.score(blanked))
+
+
+# ---------------- Hot reload ----------------
+
+def test_bad_edit_keeps_last_good_definition(tmp_path):
+    path = tmp_path / "scorecard.json"
+    with open(SCORECARD_PATH, encoding="utf-8") as f:
+        good = json.load(f)
+    path.write_text(json.dumps(good))
+
+    live = ScorecardFile(str(path))
+    digest = live.get().digest
+
+    bad = json.loads(json.dumps(good))
+    bad["components"]["leverage"]["weight"] = "0.35"
+    path.write_text(json.dumps(bad))
+    os.utime(path, (1, 1))
+
+    assert live.get().digest == digest
+    assert live.last_error
+
+
+@pytest.mark.parametrize("edit", [
+    lambda d: d["components"]["liquidity"]["inputs"][0].update(knots=[0.5, "1", 2]),
+    lambda d: d["penalties"][0]["thresholds"].append([">=", 120, None]),
+    lambda d: d["penalties"][1]["categories"].update({"SMA-1": "15"}),
+    lambda d: d.update(components=[]),
+])
+def test_validate_rejects_non_numeric_edits(tmp_path, edit):
+    with open(SCORECARD_PATH, encoding="utf-8") as f:
+        defn = json.load(f)
+    edit(defn)
+    path = tmp_path / "scorecard.json"
+    path.write_text(json.dumps(defn))
+    with pytest.raises(ScorecardError):
+        compile_scorecard(str(path))
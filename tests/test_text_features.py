@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("scipy")
+
+from model.text_features import TEXT_FEATURE_COLUMNS, compare, text_frame  # noqa: E402
+
+
+def test_text_frame_has_every_note_column(master_path):
+    # the store drops all-empty note columns; text_frame must not
+    frame = text_frame(master_path, [0, 1, 2])
+    assert list(frame.columns) == TEXT_FEATURE_COLUMNS
+    assert len(frame) == 3
+
+
+def test_model_inputs_fills_notes_from_store(master_path):
+    from model.ews_model import FEATURES, build_features, fit_model, load_master, model_inputs, training_frame
+
+    train = training_frame(build_features(load_master(master_path), entity_col="Company Name"))
+    model = fit_model(train.head(200), text=True, path=master_path)
+    X = model_inputs(model, train.head(5), master_path)
+    assert list(X.columns) == FEATURES + TEXT_FEATURE_COLUMNS
+    assert len(model.predict(X)) == 5
+
+
+def test_compare_runs_with_and_without_text(master_path):
+    report = compare(master_path)
+    assert list(report.index) == ["numeric", "numeric + text"]
+    assert (report["oot_mae"] > 0).all()
@@ -6,7 +6,15 @@ import matplotlib.pyplot as plt
 
 from matplotlib.ticker import MaxNLocator
 
-from model.ews_model import analyze_company
+import time
+
+import uuid
+
+from model.scheduler import submit_analysis, get_scheduler, SchedulerBusy
+
+from model.bands import band_label, band_number, band_ranges
+
+from storage.application_store import get_application_store
  
  
 # --------------------------------------------------
@@ -89,7 +97,34 @@ def render_ai_scorecard():
  
     if st.button("▶ Run AI Model"):
 
-        st.session_state["model_result"] = analyze_company(company = company, df_company=df_ui)
+        # runs on the shared model workers; identical in-flight runs are coalesced
+        user = st.session_state.setdefault("scheduler_user", uuid.uuid4().hex)
+
+        try:
+            job = submit_analysis(company, df_ui, user=user)
+        except SchedulerBusy as e:
+            st.warning(str(e))
+            job = None
+
+        if job is not None:
+            status = st.empty()
+            scheduler = get_scheduler()
+            while not job.done():
+                pos = scheduler.position(job)
+                status.info(
+                    "⏳ Running AI model…" if not pos else f"⏳ Queued for the AI model (position {pos})…"
+                )
+                time.sleep(0.25)
+            status.empty()
+            st.session_state["model_result"] = job.result()
+
+        # latest FH score feeds the worklist
+        if job is not None and "application_id" in st.session_state:
+            get_application_store().update_application(
+                st.session_state.application_id,
+                fh_score=float(st.session_state["model_result"]["fh_score"]),
+                wait=False
+            )
  
     if "model_result" not in st.session_state:
 
@@ -100,10 +135,18 @@ def render_ai_scorecard():
     res = st.session_state["model_result"]
 
     last = res["latest"]
+
+    if res.get("model_version"):
+
+        st.caption(f"Model version v{res['model_version']}")
  
     fh_score = int(round(res["fh_score"]))
 
-    sb_text = "SB3 · Good" if fh_score >= 80 else "SB13 · Poor"
+    sb_text = band_label(fh_score)
+
+    sb_no = int(band_number(fh_score))
+
+    sb_color = "#28a745" if sb_no <= 4 else "#f0ad4e" if sb_no <= 8 else "#d9534f"
  
     # --------------------------------------------------
 
@@ -121,7 +164,7 @@ def render_ai_scorecard():
 <div style="background:#f3f4ff;padding:30px;border-radius:12px;text-align:center">
 <h1 style="color:#5b5ff2;margin-bottom:0">{fh_score}</h1>
 <p>Risk Score</p>
-<span style="color:#d9534f;font-weight:600">{sb_text}</span>
+<span style="color:{sb_color};font-weight:600">{sb_text}</span>
 </div>
 
             """,
@@ -134,29 +177,15 @@ def render_ai_scorecard():
 
         st.markdown("### Risk Band Classification")
 
-        for b, l, r in [
+        current = sb_text.split(" · ")[0]
 
-            ("SB1","Excellent","90–100"),
+        for b, l, r in band_ranges():
 
-            ("SB2","Very Good","85–89"),
-
-            ("SB3","Good","80–84"),
-
-            ("SB4","Good","75–79"),
-
-            ("SB5","Satisfactory","70–74"),
-
-            ("SB6","Satisfactory","65–69"),
-
-            ("SB7","Acceptable","60–64"),
-
-            ("SB8","Acceptable","55–59"),
-
-        ]:
+            marker = " ◀" if b == current else ""
 
             st.markdown(
 
-                f"**{b}** — {l} <span style='float:right;color:gray'>{r}</span>",
+                f"**{b}** — {l}{marker} <span style='float:right;color:gray'>{r}</span>",
 
                 unsafe_allow_html=True
 
@@ -375,6 +404,36 @@ def render_ai_scorecard():
  
     # --------------------------------------------------
 
+    # 📝 QUALITATIVE NOTES (LOADED ON DEMAND FROM THE TEXT STORE)
+
+    # --------------------------------------------------
+
+    with st.expander("📝 Qualitative Notes (Master Record)"):
+
+        if st.button("Load Notes"):
+
+            from model.ews_model import load_master, MASTER_PATH
+
+            from ingest.master_store import get_text_store
+
+            master = load_master()
+
+            rows = master.index[master["Company Name"].str.lower() == company.lower()]
+
+            if len(rows):
+
+                notes = get_text_store(MASTER_PATH).fetch(rows[-1:]).T
+
+                st.dataframe(notes.rename(columns=lambda _: "Latest FY"), width="stretch")
+
+            else:
+
+                st.caption("Company not found in the master data.")
+ 
+    st.divider()
+ 
+    # --------------------------------------------------
+
     # NAVIGATION
 
     # --------------------------------------------------
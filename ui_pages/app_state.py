@@ -0,0 +1,66 @@
+import streamlit as st
+
+from storage.application_store import get_application_store
+
+# -------------------------------------------------
+# SESSION <-> APPLICATION STORE
+# Pages keep working on st.session_state; these helpers write each
+# saved section through to SQLite and lazily read back only the
+# section a page needs.
+# -------------------------------------------------
+
+
+# top-level session keys that belong to the open application
+# (Borrower Profile widgets and its entity registration)
+APPLICATION_SESSION_KEYS = [
+    "financials",
+    "pincode", "city", "state", "phone", "pincode_suggestions",
+    "district_lookup", "district_pincode",
+    "entity_id",
+]
+
+
+def current_application_id(create=True):
+    if "application_id" not in st.session_state:
+        if not create:
+            return None
+        st.session_state.application_id = get_application_store().create_application()
+    return st.session_state.application_id
+
+
+def open_application(app_id):
+    """
+    Switches the session to a stored application. Sections are
+    reloaded lazily by the pages that need them.
+    """
+    st.session_state.application_id = app_id
+    st.session_state.data = {}
+    for key in APPLICATION_SESSION_KEYS:
+        st.session_state.pop(key, None)
+
+
+def persist_section(section, payload, wait=True):
+    get_application_store().save_section(current_application_id(), section, payload, wait=wait)
+
+
+def restore_section(section, default=None):
+    app_id = current_application_id(create=False)
+    if app_id is None:
+        return default
+    payload = get_application_store().load_section(app_id, section)
+    return payload if payload is not None else default
+
+
+def sync_group_exposure():
+    """
+    Re-links the current application in the group-exposure index from
+    its saved profile, loan request and assessment. Returns its group.
+    """
+    from model.group_exposure import register_application
+
+    data = st.session_state.get("data", {})
+    sections = {
+        s: data.get(s) or restore_section(s, {})
+        for s in ("borrower_profile", "loan_request", "assessment")
+    }
+    return register_application(current_application_id(), sections)
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from ui_pages.app_state import persist_section, restore_section, sync_group_exposure
+
 def render_assessment():
 
     st.markdown("### 🧠 Qualitative Assessment")
@@ -11,7 +13,7 @@ def render_assessment():
         st.session_state.data = {}
 
     if "assessment" not in st.session_state.data:
-        st.session_state.data["assessment"] = {}
+        st.session_state.data["assessment"] = restore_section("assessment", {})
 
     a = st.session_state.data["assessment"]
 
@@ -149,5 +151,14 @@ def render_assessment():
             "regulatory_status": regulatory_status,
         }
 
+        persist_section("assessment", st.session_state.data["assessment"])
+
+        group = sync_group_exposure()
+        if group["n_borrowers"] > 1:
+            st.warning(
+                f"Linked to a borrower group of {group['n_borrowers']} "
+                f"(total exposure ₹{group['total_cr']:,.2f} Cr incl. this request)"
+            )
+
         st.success("Qualitative Assessment saved successfully ✅")
         st.session_state.page = "Documents"
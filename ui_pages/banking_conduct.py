@@ -1,5 +1,10 @@
 import streamlit as st
 
+from storage.document_store import document_path
+from ingest.bank_statements import analyze_statement
+from model.ews_rules import DEFAULT_RULES, application_record
+from ui_pages.app_state import persist_section, restore_section
+
 # ============================================================
 # BANKING CONDUCT — SAVE ONLY PAGE
 # ============================================================
@@ -15,10 +20,46 @@ def render_banking_conduct():
         st.session_state.data = {}
 
     if "banking_conduct" not in st.session_state.data:
-        st.session_state.data["banking_conduct"] = {}
+        st.session_state.data["banking_conduct"] = restore_section("banking_conduct", {})
 
     bc = st.session_state.data["banking_conduct"]
 
+    # --------------------------------------------------------
+    # PREFILL FROM UPLOADED BANK STATEMENT
+    # --------------------------------------------------------
+    statement = st.session_state.data.get("documents", {}).get("Bank Statements")
+
+    if statement and statement.get("ext") in ("xlsx", "csv"):
+        with st.expander("📥 Prefill from uploaded Bank Statement"):
+            limit_lakh = st.number_input(
+                "Sanctioned CC/OD Limit (₹ Lakh, for utilization)",
+                min_value=0.0,
+                value=0.0,
+                step=1.0
+            )
+
+            if st.button("Analyze Statement"):
+                try:
+                    with st.spinner("Analyzing transactions..."):
+                        metrics = analyze_statement(
+                            document_path(statement),
+                            sanctioned_limit_lakh=limit_lakh or None,
+                            ext=statement["ext"]
+                        )
+                except ValueError as exc:
+                    st.error(f"Could not analyze statement: {exc}")
+                else:
+                    bc.update({
+                        k: metrics[k] for k in (
+                            "avg_bank_balance_lakh", "bounced_cheques",
+                            "overdrafts", "credit_utilization_pct"
+                        ) if k in metrics
+                    })
+                    st.success(
+                        f"{metrics['transactions']:,} transactions analyzed "
+                        f"({metrics['period_start']} → {metrics['period_end']}) ✅"
+                    )
+
     # --------------------------------------------------------
     # CREDIT BUREAU INFORMATION
     # --------------------------------------------------------
@@ -54,7 +95,7 @@ def render_banking_conduct():
     with c3:
         avg_bank_balance = st.number_input(
             "Average Bank Balance (Last 6 Months) * (₹ Lakh)",
-            min_value=0.0,
+            # negative for an account that ran overdrawn on average
             value=float(bc.get("avg_bank_balance_lakh", 0.0)),
             step=0.1
         )
@@ -159,6 +200,26 @@ def render_banking_conduct():
         )
     )
 
+    # --------------------------------------------------------
+    # EARLY-WARNING SIGNALS (same rule set as the portfolio scan)
+    # --------------------------------------------------------
+    fired = DEFAULT_RULES.evaluate_record(application_record(banking={
+        "max_dpd": max_dpd,
+        "sma_classification": sma_classification,
+        "cross_bank_npa": cross_bank_npa,
+        "credit_utilization_pct": credit_utilization,
+        "bounced_cheques": bounced_cheques,
+        "gst_filing_compliance": gst_filing,
+    }))
+
+    st.markdown("### Early-Warning Signals")
+    if fired:
+        icons = {"critical": "🟥", "high": "🟧", "medium": "🟨", "low": "🟦"}
+        for rule in fired:
+            st.write(f"{icons[rule.severity]} {rule.message} ({rule.severity})")
+    else:
+        st.write("🟩 No early-warning signals")
+
     # --------------------------------------------------------
     # SAVE ONLY
     # --------------------------------------------------------
@@ -186,6 +247,8 @@ def render_banking_conduct():
             "account_type": account_type,
         }
 
+        persist_section("banking_conduct", st.session_state.data["banking_conduct"])
+
         st.success("Banking Conduct details saved successfully ✅")
 
         # navigation handled by app.py
@@ -1,12 +1,19 @@
 import re
+import uuid
 import streamlit as st
 from datetime import date
 
 from validation.pincode_validator import validate_and_resolve_pincode
-from validation.cin_validator import validate_cin
-from validation.pan_validator import validate_pan
-from validation.gstin_validator import validate_gstin
-from validation.aadhaar_validator import validate_aadhaar
+from validation.pincode_index import suggest_pincodes, pincodes_for_district
+from validation.entity_resolution import register_profile
+from validation.registry_client import verify_identifiers
+from ui_pages.app_state import persist_section, restore_section, sync_group_exposure
+from validation.cached_validators import (
+    cached_validate_cin,
+    cached_validate_pan,
+    cached_validate_gstin,
+    cached_validate_aadhaar,
+)
 
 
 # ------------------ Helpers ------------------
@@ -15,9 +22,13 @@ def handle_pincode_change():
     cleaned = "".join(c for c in raw if c.isdigit())[:6]
     st.session_state.pincode = cleaned
 
+    st.session_state.pincode_suggestions = []
+
     if len(cleaned) != 6:
         st.session_state.city = ""
         st.session_state.state = ""
+        if 2 <= len(cleaned) <= 5:
+            st.session_state.pincode_suggestions = suggest_pincodes(cleaned, limit=5)
         return
 
     ok, _, city, state = validate_and_resolve_pincode(cleaned)
@@ -29,6 +40,13 @@ def handle_pincode_change():
         st.session_state.state = ""
 
 
+def handle_district_pick():
+    picked = st.session_state.get("district_pincode")
+    if picked:
+        st.session_state.pincode = picked
+        handle_pincode_change()
+
+
 def handle_phone_change():
     raw = st.session_state.get("phone", "")
     st.session_state.phone = "".join(c for c in raw if c.isdigit())[:10]
@@ -44,13 +62,16 @@ def render_borrower_profile():
         st.session_state.data = {}
 
     if "borrower_profile" not in st.session_state.data:
-        st.session_state.data["borrower_profile"] = {}
+        st.session_state.data["borrower_profile"] = restore_section("borrower_profile", {})
 
     bp = st.session_state.data["borrower_profile"]
 
     for k in ["city", "state", "pincode", "phone"]:
         if k not in st.session_state:
-            st.session_state[k] = ""
+            st.session_state[k] = bp.get(k) or ""
+
+    if "pincode_suggestions" not in st.session_state:
+        st.session_state.pincode_suggestions = []
 
     # ---------------- Company ----------------
     c1, c2 = st.columns(2)
@@ -103,7 +124,7 @@ def render_borrower_profile():
         )
 
         if cin:
-            ok, msg = validate_cin(cin)
+            ok, msg = cached_validate_cin(cin)
             if not ok:
                 st.warning(msg)
 
@@ -128,6 +149,24 @@ def render_borrower_profile():
         max_chars=6,
         on_change=handle_pincode_change
     )
+    for code, city, state in st.session_state.pincode_suggestions:
+        c5.caption(f"{code} · {city}, {state}")
+
+    with st.expander("Don't know the pincode? Look it up by district"):
+        d1, d2 = st.columns([1, 2])
+        district = d1.text_input("District", key="district_lookup")
+        matches = pincodes_for_district(district) if district.strip() else []
+        if matches:
+            d2.selectbox(
+                f"Pincodes in {matches[0][1]}",
+                [code for code, _, _ in matches],
+                index=None,
+                placeholder="Select pincode",
+                key="district_pincode",
+                on_change=handle_district_pick
+            )
+        elif district.strip():
+            d2.caption("No pincodes found for this district.")
 
     # ---------------- Legal Identifiers ----------------
     st.markdown("### Legal Identifiers")
@@ -140,7 +179,7 @@ def render_borrower_profile():
         value=bp.get("pan", "")
     )
     if pan:
-        ok, msg = validate_pan(pan)
+        ok, msg = cached_validate_pan(pan)
         if not ok:
             c9.warning(msg)
 
@@ -150,7 +189,7 @@ def render_borrower_profile():
         value=bp.get("gstin", "")
     )
     if gstin:
-        ok, msg = validate_gstin(gstin, pan)
+        ok, msg = cached_validate_gstin(gstin, pan)
         if not ok:
             c10.warning(msg)
 
@@ -160,7 +199,7 @@ def render_borrower_profile():
         value=bp.get("aadhaar", "")
     )
     if aadhaar:
-        ok, msg = validate_aadhaar(aadhaar)
+        ok, msg = cached_validate_aadhaar(aadhaar)
         if not ok:
             c11.warning(msg)
 
@@ -207,4 +246,44 @@ def render_borrower_profile():
             "phone": st.session_state.get("phone"),
         }
 
+        persist_section("borrower_profile", st.session_state.data["borrower_profile"])
+
+        group = sync_group_exposure()
+        if group["n_borrowers"] > 1:
+            st.warning(
+                f"Linked to a borrower group of {group['n_borrowers']} "
+                f"(total exposure ₹{group['total_cr']:,.2f} Cr incl. this request)"
+            )
+
         st.success("Borrower Profile saved successfully ✅")
+
+        # ---------------- Registry check (REGISTRY_API_URL) ----------------
+        # one short shared wait; a slow registry never blocks the save
+        well_formed = {
+            kind: value
+            for kind, value, ok in (
+                ("cin", cin, cin and cached_validate_cin(cin)[0]),
+                ("pan", pan, pan and cached_validate_pan(pan)[0]),
+                ("gstin", gstin, gstin and cached_validate_gstin(gstin, pan)[0]),
+            )
+            if ok
+        }
+        for kind, (status, msg) in verify_identifiers(well_formed).items():
+            if status == "rejected":
+                st.error(msg)
+            elif status == "unverified":
+                st.info(f"{kind.upper()} not verified against the registry: {msg}")
+
+        # ---------------- Duplicate entity check ----------------
+        if "entity_id" not in st.session_state:
+            st.session_state.entity_id = f"session:{uuid.uuid4().hex}"
+
+        matches = register_profile(
+            st.session_state.entity_id,
+            st.session_state.data["borrower_profile"]
+        )
+        for m in matches[:5]:
+            st.warning(
+                f"Possible existing borrower: {m['company_name']} "
+                f"(matched on {m['reason']}, score {m['score']:.2f})"
+            )
@@ -1,5 +1,9 @@
 import streamlit as st
 
+from storage.document_store import store_upload, document_path, DocumentTooLarge
+from ingest.financial_statements import extract_financials
+from ui_pages.app_state import persist_section, restore_section
+
 # -------------------------------------------------
 # DOCUMENT DEFINITIONS
 # -------------------------------------------------
@@ -36,9 +40,17 @@ DOCUMENT_SECTIONS = {
     ],
 }
 
-ALLOWED_TYPES = ["pdf", "docx", "xlsx"]
+ALLOWED_TYPES = ["pdf", "docx", "xlsx", "csv"]
 MAX_SIZE_MB = 25
 
+# parsed for line items, in order of precedence
+FINANCIAL_STATEMENT_DOCS = [
+    "Audited Financial Statements",
+    "Provisional Financial Statements",
+    "Management Accounts",
+    "Cash Flow Statements",
+]
+
 
 def render_documents():
 
@@ -52,7 +64,7 @@ def render_documents():
         st.session_state.data = {}
 
     if "documents" not in st.session_state.data:
-        st.session_state.data["documents"] = {}
+        st.session_state.data["documents"] = restore_section("documents", {})
 
     docs_state = st.session_state.data["documents"]
 
@@ -84,15 +96,34 @@ def render_documents():
 
                 if uploaded_file:
                     size_mb = uploaded_file.size / (1024 * 1024)
+                    ref = docs_state.get(doc_name)
 
                     if size_mb > MAX_SIZE_MB:
                         st.error("❌ File exceeds 25MB")
                         docs_state[doc_name] = False
-                    else:
+                    elif ref and ref.get("file_id") == uploaded_file.file_id:
+                        # already stored on a previous rerun
                         st.success("✅ Uploaded")
-                        docs_state[doc_name] = True
                         if required:
                             uploaded_required += 1
+                    else:
+                        # copy to the on-disk store (the upload itself is already in
+                        # memory, see storage/document_store.py); session keeps only the reference
+                        try:
+                            ref = store_upload(
+                                uploaded_file,
+                                uploaded_file.name,
+                                max_bytes=MAX_SIZE_MB * 1024 * 1024
+                            )
+                            ref["file_id"] = uploaded_file.file_id
+                            docs_state[doc_name] = ref
+                            persist_section("documents", docs_state, wait=False)
+                            st.success("✅ Uploaded")
+                            if required:
+                                uploaded_required += 1
+                        except DocumentTooLarge:
+                            st.error("❌ File exceeds 25MB")
+                            docs_state[doc_name] = False
                 else:
                     docs_state.setdefault(doc_name, False)
 
@@ -109,6 +140,44 @@ def render_documents():
     st.write(f"**Uploaded Required:** {uploaded_required}")
     st.write(f"**Total Required:** {total_required}")
 
+    # -------------------------------------------------
+    # AUTO-FILL FINANCIALS FROM STATEMENTS
+    # -------------------------------------------------
+    statement_refs = [
+        docs_state[d] for d in FINANCIAL_STATEMENT_DOCS
+        if docs_state.get(d) and docs_state[d].get("ext") == "xlsx"
+    ]
+
+    if statement_refs:
+        st.divider()
+        st.markdown("### 🧾 Financial Statement Extraction")
+
+        if st.button("Extract Financials from Uploaded Statements", use_container_width=True):
+            with st.spinner("Parsing statements..."):
+                extracted, errors = extract_financials(
+                    [document_path(r) for r in statement_refs]
+                )
+
+            if "financials" not in st.session_state:
+                st.session_state.financials = restore_section("financials", {})
+
+            for fy, fields in extracted.items():
+                st.session_state.financials.setdefault(fy, {}).update(fields)
+                # drop widget state so Financial Data shows the new values
+                for field in fields:
+                    st.session_state.pop(f"{fy}_{field}", None)
+
+            if extracted:
+                persist_section("financials", st.session_state.financials)
+
+            for _, msg in errors.items():
+                st.warning(f"Could not parse a statement: {msg}")
+
+            if extracted:
+                st.success(f"Financials extracted for {', '.join(extracted)} ✅")
+            else:
+                st.info("No standard line items found in the uploaded statements.")
+
     # -------------------------------------------------
     # NAVIGATION
     # -------------------------------------------------
@@ -117,8 +186,10 @@ def render_documents():
 
     with c1:
         if st.button("⬅ Back to Assessment", use_container_width=True):
+            persist_section("documents", docs_state)
             st.session_state.page = "Assessment"
 
     with c2:
         if st.button("Continue to AI Scorecard ➡️", use_container_width=True):
+            persist_section("documents", docs_state)
             st.session_state.page = "AI Scorecard"
@@ -1,28 +1,58 @@
 import streamlit as st
 import pandas as pd
 
+from model.ratios import ratios_from_financials, fy_year
+from model.ews_rules import DEFAULT_RULES, application_record
+from ui_pages.app_state import persist_section, restore_section
+
+COMPARISON_ITEMS = [
+    ("Turnover", "turnover"),
+    ("EBITDA", "ebitda"),
+    ("Net Profit", "net_profit"),
+    ("Net Worth", "net_worth"),
+    ("Total Debt", "total_debt"),
+]
+
+
+def _fmt(v, pattern):
+    return pattern.format(v) if pd.notna(v) else "N/A"
+
+
 def render_financial_data():
 
     st.subheader("📊 Financial Input Section")
 
     # ---------- INIT SESSION ----------
     if "financials" not in st.session_state:
-        st.session_state.financials = {
+        st.session_state.financials = restore_section("financials") or {
             "FY 2022": {},
             "FY 2023": {},
             "FY 2024": {},
         }
 
+    financials = st.session_state.financials
+
     # ---------- FY SELECTION ----------
-    fy = st.radio(
-        "Select Financial Year",
-        ["FY 2022", "FY 2023", "FY 2024"],
-        horizontal=True
-    )
+    fy_labels = sorted(financials, key=lambda f: fy_year(f) or 0)
+
+    f1, f2 = st.columns([4, 1])
+
+    with f1:
+        fy = st.radio(
+            "Select Financial Year",
+            fy_labels,
+            horizontal=True
+        )
+
+    with f2:
+        if st.button("➕ Add FY", width="stretch"):
+            years = [fy_year(f) for f in fy_labels if fy_year(f)]
+            financials[f"FY {max(years) + 1 if years else 2024}"] = {}
+            st.rerun()
 
     st.markdown(f"### Financial Year: {fy}")
 
-    data = st.session_state.financials[fy]
+    data = financials[fy]
 
     # ---------- LAYOUT ----------
     left, right = st.columns([2, 1])
@@ -38,7 +68,6 @@ def render_financial_data():
 
         data["ebitda"] = st.number_input(
             "EBITDA (₹ Crore)",
-            min_value=0.0,
             value=data.get("ebitda", 0.0),
             key=f"{fy}_ebitda"
         )
@@ -51,7 +80,6 @@ def render_financial_data():
 
         data["net_worth"] = st.number_input(
             "Net Worth (₹ Crore)",
-            min_value=0.0,
             value=data.get("net_worth", 0.0),
             key=f"{fy}_net_worth"
         )
@@ -91,18 +119,13 @@ def render_financial_data():
         )
 
 
-    # ---------- CALCULATIONS ----------
+    # ---------- CALCULATIONS (shared ratio engine, all FYs at once) ----------
+    ratios = ratios_from_financials(financials)
+    r = ratios.loc[fy]
+
     turnover = data["turnover"]
     ebitda = data["ebitda"]
     net_profit = data["net_profit"]
-    net_worth = data["net_worth"]
-    total_debt = data["total_debt"]
-    dscr = data["dscr"]
-    current_ratio = data["current_ratio"]
-
-    debt_equity = total_debt / net_worth if net_worth > 0 else None
-    ebitda_margin = (ebitda / turnover * 100) if turnover > 0 else None
-    net_margin = (net_profit / turnover * 100) if turnover > 0 else None
 
     # ---------- SUMMARY ----------
     with right:
@@ -113,58 +136,39 @@ def render_financial_data():
 
         st.divider()
         st.markdown("### Key Ratios")
-        st.metric("Debt-to-Equity", f"{debt_equity:.2f}" if debt_equity else "N/A")
-        st.metric("EBITDA Margin", f"{ebitda_margin:.2f}%" if ebitda_margin else "N/A")
-        st.metric("Net Profit Margin", f"{net_margin:.2f}%" if net_margin else "N/A")
+        st.metric("Debt-to-Equity", _fmt(r["debt_equity"], "{:.2f}"))
+        st.metric("EBITDA Margin", _fmt(r["ebitda_margin"] * 100, "{:.2f}%"))
+        st.metric("Net Profit Margin", _fmt(r["net_margin"] * 100, "{:.2f}%"))
+        st.metric("Turnover Growth (YoY)", _fmt(r["turnover_yoy"] * 100, "{:+.2f}%"))
 
         st.divider()
         st.markdown("### Risk Indicators")
-        st.write("DSCR Status:", "🟥 Poor" if dscr < 1 else "🟩 Healthy")
-        st.write("Liquidity:", "🟥 Weak" if current_ratio < 1 else "🟩 Adequate")
+        fired = {r.id for r in DEFAULT_RULES.evaluate_record(application_record(financials_fy=data))}
+        st.write("DSCR Status:", "🟥 Poor" if "DSCR_BELOW_1" in fired else "🟩 Healthy")
+        st.write("Liquidity:", "🟥 Weak" if "CURRENT_RATIO_LOW" in fired else "🟩 Adequate")
 
-    # ---------- CAGR (TURNOVER FY22–FY24) ----------
+    # ---------- CAGR (TURNOVER, FIRST TO LAST FY) ----------
     st.markdown("### 📈 Growth Indicators (Turnover)")
 
-    def calc_cagr(start, end, years=2):
-        if start > 0 and end > 0:
-            return ((end / start) ** (1 / years) - 1) * 100
-        return None
-
-    fy22 = st.session_state.financials["FY 2022"].get("turnover")
-    fy24 = st.session_state.financials["FY 2024"].get("turnover")
-
-    cagr = calc_cagr(fy22, fy24)
+    cagr = ratios["turnover_cagr"].iloc[-1] * 100 if len(ratios) else float("nan")
+    span = f"{fy_labels[0]}–{fy_labels[-1]}" if fy_labels else ""
 
     c1, c2 = st.columns(2)
-    c1.metric("Turnover CAGR (FY22–FY24)", f"{cagr:.2f}%" if cagr else "N/A")
-    c2.metric("Growth Trend", "🟩 Positive" if cagr and cagr > 0 else "🟥 Negative" if cagr else "N/A")
+    c1.metric(f"Turnover CAGR ({span})", _fmt(cagr, "{:.2f}%"))
+    c2.metric(
+        "Growth Trend",
+        "N/A" if pd.isna(cagr) else "🟩 Positive" if cagr > 0 else "🟥 Negative"
+    )
 
-    # ---------- 3-YEAR COMPARISON ----------
-    st.markdown("### 3-Year Financial Comparison")
+    # ---------- MULTI-YEAR COMPARISON ----------
+    st.markdown(f"### {len(fy_labels)}-Year Financial Comparison")
 
     df = pd.DataFrame({
-        "Particulars": ["Turnover", "EBITDA", "Net Profit", "Net Worth", "Total Debt"],
-        "FY 2022": [
-            st.session_state.financials["FY 2022"].get("turnover", "-"),
-            st.session_state.financials["FY 2022"].get("ebitda", "-"),
-            st.session_state.financials["FY 2022"].get("net_profit", "-"),
-            st.session_state.financials["FY 2022"].get("net_worth", "-"),
-            st.session_state.financials["FY 2022"].get("total_debt", "-"),
-        ],
-        "FY 2023": [
-            st.session_state.financials["FY 2023"].get("turnover", "-"),
-            st.session_state.financials["FY 2023"].get("ebitda", "-"),
-            st.session_state.financials["FY 2023"].get("net_profit", "-"),
-            st.session_state.financials["FY 2023"].get("net_worth", "-"),
-            st.session_state.financials["FY 2023"].get("total_debt", "-"),
-        ],
-        "FY 2024": [
-            st.session_state.financials["FY 2024"].get("turnover", "-"),
-            st.session_state.financials["FY 2024"].get("ebitda", "-"),
-            st.session_state.financials["FY 2024"].get("net_profit", "-"),
-            st.session_state.financials["FY 2024"].get("net_worth", "-"),
-            st.session_state.financials["FY 2024"].get("total_debt", "-"),
-        ],
+        "Particulars": [label for label, _ in COMPARISON_ITEMS],
+        **{
+            label: [financials[label].get(key, "-") for _, key in COMPARISON_ITEMS]
+            for label in fy_labels
+        },
     })
 
     st.dataframe(df, width="stretch")
@@ -174,8 +178,10 @@ def render_financial_data():
 
     with nav1:
         if st.button("⬅ Back to Borrower Profile", width="stretch"):
+            persist_section("financials", st.session_state.financials)
             st.session_state.page = "Borrower Profile"
 
     with nav2:
         if st.button("Continue to Banking Conduct ➡️", width="stretch"):
+            persist_section("financials", st.session_state.financials)
             st.session_state.page = "Banking Conduct"
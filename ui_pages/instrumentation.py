@@ -0,0 +1,94 @@
+import os
+import sys
+
+import streamlit as st
+
+from telemetry.recorder import record_render
+
+# -------------------------------------------------
+# PAGE RENDER INSTRUMENTATION
+# Wraps a page's render_* call: works out what triggered the rerun
+# and how big the session state is, then hands off to the recorder.
+# The state size is an estimate (array / frame buffers, string
+# lengths, shallow object sizes), not a pickle, and is taken on every
+# TELEMETRY_STATE_SAMPLE-th render of a session only, so measuring it
+# adds next to nothing to the reruns being measured.
+# -------------------------------------------------
+
+_SNAPSHOT_KEY = "_telemetry_snapshot"
+_RENDERS_KEY = "_telemetry_renders"
+_SCALARS = (str, int, float, bool, type(None))
+
+STATE_SAMPLE_EVERY = max(int(os.environ.get("TELEMETRY_STATE_SAMPLE", "20")), 1)
+
+
+def _snapshot():
+    return {
+        k: v for k, v in st.session_state.items()
+        if isinstance(k, str) and not k.startswith("_") and isinstance(v, _SCALARS)
+    }
+
+
+def detect_trigger(page):
+    """
+    Names what caused this rerun by diffing scalar widget/session values
+    against the previous run: "navigation", the changed keys, or "rerun".
+    """
+
+    prev = st.session_state.get(_SNAPSHOT_KEY)
+    current = _snapshot()
+    st.session_state[_SNAPSHOT_KEY] = current
+
+    if prev is None:
+        return "session_start"
+    if prev.get("page") != page:
+        return "navigation"
+
+    changed = sorted(k for k in current if k != "page" and prev.get(k) != current[k])
+    return ",".join(changed[:5]) if changed else "rerun"
+
+
+def approx_bytes(value, depth=0):
+    """
+    Cheap size estimate: buffer sizes for frames and arrays (object
+    cells counted as pointers), lengths for strings, containers summed
+    a few levels deep, sys.getsizeof for anything else.
+    """
+
+    if hasattr(value, "memory_usage") and hasattr(value, "index"):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if depth < 4 and isinstance(value, dict):
+        return sum(approx_bytes(k, depth + 1) + approx_bytes(v, depth + 1) for k, v in value.items())
+    if depth < 4 and isinstance(value, (list, tuple, set)):
+        return sum(approx_bytes(v, depth + 1) for v in value)
+    return sys.getsizeof(value)
+
+
+def session_state_bytes():
+    total = 0
+    for k, v in st.session_state.items():
+        if k in (_SNAPSHOT_KEY, _RENDERS_KEY):
+            continue
+        try:
+            total += approx_bytes(v)
+        except Exception:
+            pass
+    return total
+
+
+def render_page(page, render_fn):
+    renders = st.session_state.get(_RENDERS_KEY, 0)
+    st.session_state[_RENDERS_KEY] = renders + 1
+    sampled = renders % STATE_SAMPLE_EVERY == 0
+
+    return record_render(
+        page,
+        render_fn,
+        trigger=detect_trigger(page),
+        state_bytes_fn=session_state_bytes if sampled else None,
+    )
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from ui_pages.app_state import persist_section, restore_section, sync_group_exposure
+
 def render_loan_request():
 
     st.markdown("### 💼 Loan Request Details")
@@ -11,7 +13,7 @@ def render_loan_request():
         st.session_state.data = {}
 
     if "loan_request" not in st.session_state.data:
-        st.session_state.data["loan_request"] = {}
+        st.session_state.data["loan_request"] = restore_section("loan_request", {})
 
     lr = st.session_state.data["loan_request"]
 
@@ -122,6 +124,36 @@ def render_loan_request():
             value=lr.get("business_plan", "")
         )
 
+    # -------------------------------
+    # PROJECTED DEBT SERVICE
+    # -------------------------------
+    if loan_amount > 0 and repayment_mode != "Select mode":
+        from model.amortization import RATES, loan_schedule, yearly_summary
+
+        with st.expander("📅 Projected Repayment Schedule & DSCR"):
+            financials = st.session_state.get("financials") or restore_section("financials", {})
+            # latest FY with EBITDA entered, not just the latest FY key
+            latest_fy = max(
+                (fy for fy, d in financials.items() if (d or {}).get("ebitda")),
+                key=lambda fy: int(fy.split()[-1]),
+                default=None,
+            )
+            ebitda = (financials.get(latest_fy) or {}).get("ebitda") if latest_fy else None
+
+            schedule = loan_schedule(loan_amount, tenure, repayment_mode, interest_type)
+            summary = yearly_summary(schedule, ebitda_cr=ebitda or None)
+
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Rate (assumed)", f"{RATES.get(interest_type.upper(), 0):.2f}%")
+            c2.metric("First Payment", f"₹ {schedule['payment'].iloc[0]:.3f} Cr")
+            c3.metric("Total Interest", f"₹ {schedule['interest'].sum():.2f} Cr")
+
+            if "projected_dscr" in summary:
+                st.caption(f"DSCR against {latest_fy} EBITDA of ₹ {ebitda:.2f} Cr, held flat.")
+            else:
+                st.caption("Enter EBITDA on the Financial Data page to project DSCR.")
+            st.dataframe(summary.round(3), width="stretch")
+
     st.divider()
 
     # -------------------------------
@@ -145,5 +177,14 @@ def render_loan_request():
             "business_plan": business_plan,
         }
 
+        persist_section("loan_request", st.session_state.data["loan_request"])
+
+        group = sync_group_exposure()
+        if group["n_borrowers"] > 1:
+            st.warning(
+                f"Linked to a borrower group of {group['n_borrowers']} "
+                f"(total exposure ₹{group['total_cr']:,.2f} Cr incl. this request)"
+            )
+
         st.success("Loan Request details saved successfully ✅")
         st.session_state.page = "Assessment"
@@ -0,0 +1,87 @@
+import importlib
+import os
+import threading
+import time
+
+# -------------------------------------------------
+# LAZY PAGE REGISTRY
+# Page modules (and what they pull in: pandas, scikit-learn,
+# matplotlib via the AI Scorecard) are imported on first navigation
+# rather than at app start. After the first paint a background thread
+# can pre-warm the rest:
+#   PAGE_PREWARM=forms  (default) form-entry pages only
+#   PAGE_PREWARM=all    every page, including the model stack
+#   PAGE_PREWARM=off    nothing
+# -------------------------------------------------
+
+PAGE_MODULES = {
+    "Worklist": ("ui_pages.worklist", "render_worklist"),
+    "Borrower Profile": ("ui_pages.borrower_profile", "render_borrower_profile"),
+    "Financial Data": ("ui_pages.financial_data", "render_financial_data"),
+    "Banking Conduct": ("ui_pages.banking_conduct", "render_banking_conduct"),
+    "Loan Request": ("ui_pages.loan_request", "render_loan_request"),
+    "Assessment": ("ui_pages.assessment", "render_assessment"),
+    "Documents": ("ui_pages.documents", "render_documents"),
+    "AI Scorecard": ("ui_pages.ai_scorecard", "render_ai_scorecard"),
+    "Tools": ("ui_pages.tools", "render_tools"),
+}
+
+HEAVY_PAGES = {"AI Scorecard"}
+
+PAGES = list(PAGE_MODULES)
+
+# page -> seconds spent importing it (first import only)
+IMPORT_TIMES = {}
+
+_lock = threading.Lock()
+_prewarm_started = False
+
+
+def get_renderer(page):
+    """
+    Returns the page's render function, importing its module on first use.
+    """
+
+    module_name, func_name = PAGE_MODULES[page]
+
+    if page not in IMPORT_TIMES:
+        # no registry lock here: the import system already serializes
+        # per module, and a pre-warm import must not block the UI thread
+        t0 = time.perf_counter()
+        importlib.import_module(module_name)
+        IMPORT_TIMES.setdefault(page, time.perf_counter() - t0)
+
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _prewarm(pages):
+    for page in pages:
+        try:
+            get_renderer(page)
+        except Exception:
+            # a broken page should still fail loudly when it is opened
+            pass
+
+
+def start_prewarm(mode=None):
+    """
+    Imports the remaining pages on a daemon thread, once per process.
+    Call after the first page has rendered.
+    """
+
+    global _prewarm_started
+
+    mode = (mode or os.environ.get("PAGE_PREWARM", "forms")).lower()
+    if mode == "off":
+        return
+
+    with _lock:
+        if _prewarm_started:
+            return
+        _prewarm_started = True
+
+    pages = [
+        p for p in PAGES
+        if p not in IMPORT_TIMES and (mode == "all" or p not in HEAVY_PAGES)
+    ]
+    threading.Thread(target=_prewarm, args=(pages,), name="page-prewarm", daemon=True).start()
@@ -1,5 +1,375 @@
+import time
+
 import streamlit as st
+import numpy as np
+import pandas as pd
+
+from telemetry.recorder import load_metrics, summarize
+from validation.cached_validators import cache_stats
+from ui_pages.registry import IMPORT_TIMES
+from model.scheduler import get_scheduler
+from model.registry import get_model_registry
+
 
 def render_tools():
     st.subheader("🧰 Tools")
-    st.info("To be implemented.")
+
+    # -------------------------------------------------
+    # RENDER TELEMETRY (ADMIN)
+    # -------------------------------------------------
+    st.markdown("### ⏱️ Page Render Telemetry")
+
+    window = st.selectbox(
+        "Window",
+        ["Last hour", "Last 24 hours", "All"],
+        index=1
+    )
+    since = {
+        "Last hour": time.time() - 3600,
+        "Last 24 hours": time.time() - 86400,
+        "All": None,
+    }[window]
+
+    rows = load_metrics(since=since)
+
+    if not rows:
+        st.info("No renders recorded yet.")
+    else:
+        st.caption(f"{len(rows):,} renders")
+        st.dataframe(summarize(rows), width="stretch")
+
+        st.markdown("#### Slowest Triggers")
+        df = pd.DataFrame(rows)
+        triggers = (
+            df.groupby(["page", "trigger"])["render_ms"]
+            .agg(renders="size", p95=lambda s: s.quantile(0.95))
+            .sort_values("p95", ascending=False)
+            .head(15)
+            .round(2)
+        )
+        st.dataframe(triggers, width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # PAGE IMPORT COST (this worker process)
+    # -------------------------------------------------
+    st.markdown("### 📦 Page Import Times")
+
+    if IMPORT_TIMES:
+        st.dataframe(
+            pd.DataFrame(
+                {"import_ms": {p: round(t * 1000, 1) for p, t in IMPORT_TIMES.items()}}
+            ).sort_values("import_ms", ascending=False),
+            width="stretch"
+        )
+
+    st.divider()
+
+    # -------------------------------------------------
+    # MODEL SCHEDULER
+    # -------------------------------------------------
+    st.markdown("### 🧵 Model Run Queue")
+
+    snap = get_scheduler().snapshot()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Running", f"{snap['running']} / {snap['workers']}")
+    c2.metric("Queued", snap["queued"])
+    c3.metric("Avg Wait (s)", f"{snap['avg_wait_s']:.2f}")
+    c4.metric("Avg Run (s)", f"{snap['avg_run_s']:.2f}")
+    st.caption(
+        f"Completed {snap['completed']:,} · failed {snap['failed']:,} · "
+        f"coalesced {snap['coalesced']:,} · rejected {snap['rejected']:,}"
+    )
+
+    st.divider()
+
+    # -------------------------------------------------
+    # MODEL REGISTRY
+    # -------------------------------------------------
+    st.markdown("### 🗂️ Model Versions")
+
+    registry = get_model_registry()
+    versions = registry.versions()
+
+    if registry.training:
+        st.info("Training a new version in the background…")
+    if registry.last_error:
+        st.error(f"Last training run failed: {registry.last_error}")
+
+    if versions:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "version": v["version"],
+                    "active": "✅" if v["active"] else "",
+                    "created": time.strftime("%Y-%m-%d %H:%M", time.localtime(v["created_at"])),
+                    "reason": v["reason"],
+                    "backend": v.get("backend", "ridge"),
+                    "ensemble": v.get("ensemble", "global"),
+                    "rows": v["training_rows"],
+                    "train_mae": v["metrics"]["train_mae"],
+                    "oot_mae": v["metrics"]["oot_mae"],
+                    "fit_s": v["fit_s"],
+                    "data_hash": v["data_hash"][:12],
+                }
+                for v in versions
+            ]).set_index("version"),
+            width="stretch"
+        )
+    else:
+        st.caption("No model trained yet.")
+
+    m1, m2, m3 = st.columns([1, 2, 1])
+    with m1:
+        if st.button("🔁 Retrain Now"):
+            if registry.retrain_async(reason="manual", force=True):
+                st.success("Retraining started.")
+            else:
+                st.warning("A training run is already in progress.")
+    with m2:
+        if versions:
+            target = st.selectbox("Version", [v["version"] for v in versions], label_visibility="collapsed")
+            if st.button("Activate Version"):
+                registry.activate(target)
+                st.success(f"Serving model v{target}.")
+    with m3:
+        if st.button("↩ Roll Back"):
+            previous = registry.rollback()
+            if previous is None:
+                st.warning("No earlier version to roll back to.")
+            else:
+                st.success(f"Rolled back to v{previous}.")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # FORECAST BACKTEST
+    # -------------------------------------------------
+    st.markdown("### 🧪 Walk-Forward Backtest")
+    st.caption("Each fold trains on what was known at FY t and forecasts FY t+1.")
+
+    if st.button("Run Backtest"):
+        from model.backtest import run_backtest
+
+        with st.spinner("Backtesting…"):
+            t0 = time.perf_counter()
+            st.session_state["backtest_report"] = run_backtest()
+            st.session_state["backtest_s"] = time.perf_counter() - t0
+
+    if "backtest_report" in st.session_state:
+        st.dataframe(st.session_state["backtest_report"], width="stretch")
+        st.caption(f"Completed in {st.session_state['backtest_s']:.1f} s")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # TEXT FEATURES
+    # -------------------------------------------------
+    st.markdown("### 📝 Qualitative Notes as Features")
+    st.caption(
+        "Out-of-time MAE and latency with and without hashed assessment notes. "
+        "Set MODEL_TEXT_FEATURES=1 to train the registry model with them."
+    )
+
+    if st.button("Compare With / Without Notes"):
+        from model.ews_model import MASTER_PATH
+        from model.text_features import compare
+
+        with st.spinner("Hashing notes and fitting both models…"):
+            st.session_state["text_compare"] = compare(MASTER_PATH)
+
+    if "text_compare" in st.session_state:
+        st.dataframe(st.session_state["text_compare"], width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # BAND MIGRATION
+    # -------------------------------------------------
+    st.markdown("### 🔀 SB Band Migration (Master Portfolio)")
+
+    if st.button("Compute Band Migration"):
+        from model.bands import migration_counts
+        from model.ews_model import load_master, build_features
+
+        with st.spinner("Scoring master history…"):
+            st.session_state["band_migration"] = migration_counts(
+                build_features(load_master(), entity_col="Company Name")
+            )
+
+    if "band_migration" in st.session_state:
+        from model.bands import migration_matrix, migration_summary
+
+        counts = st.session_state["band_migration"]
+        st.dataframe(migration_summary(counts), width="stretch")
+
+        years = ["All years"] + sorted(counts.index.get_level_values("to_fy").unique().tolist())
+        fy = st.selectbox("Transition into FY", years)
+        matrix = migration_matrix(counts, fy=None if fy == "All years" else fy)
+        st.dataframe((matrix * 100).round(1), width="stretch")
+        st.caption("Rows: band in the prior FY · Columns: band in the selected FY · % of row")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # PORTFOLIO EARLY-WARNING SCAN
+    # -------------------------------------------------
+    st.markdown("### 🚨 Portfolio Early-Warning Scan")
+
+    if st.button("Scan Master Portfolio"):
+        from model.ews_rules import DEFAULT_RULES, get_portfolio_evaluator
+        from model.ews_model import load_master
+
+        master = load_master().drop_duplicates(["CustomerID", "FY"], keep="last")
+        t0 = time.perf_counter()
+        masks, changed = get_portfolio_evaluator().update(master, ["CustomerID", "FY"])
+        st.session_state["ews_scan"] = (
+            masks.sum().rename("borrower_years").to_frame(),
+            DEFAULT_RULES.summarize(masks).query("n_flags > 0"),
+            len(changed),
+            time.perf_counter() - t0,
+        )
+
+    if "ews_scan" in st.session_state:
+        per_rule, flagged, n_changed, secs = st.session_state["ews_scan"]
+        st.caption(f"Re-evaluated {n_changed:,} changed rows in {secs * 1000:.0f} ms")
+        c1, c2 = st.columns([1, 2])
+        c1.dataframe(per_rule, width="stretch")
+        c2.dataframe(flagged.sort_values("n_flags", ascending=False), width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # BATCH REPAYMENT SCHEDULES
+    # -------------------------------------------------
+    st.markdown("### 📅 Master Loan Schedules & Projected DSCR")
+
+    if st.button("Build All Schedules"):
+        from model.amortization import run_master_batch
+
+        t0 = time.perf_counter()
+        st.session_state["loan_batch"] = (run_master_batch(), time.perf_counter() - t0)
+
+    if "loan_batch" in st.session_state:
+        batch, secs = st.session_state["loan_batch"]
+        st.caption(f"{batch['first_payment'].notna().sum():,} schedules in {secs:.2f} s")
+        st.dataframe(batch.sort_values("min_dscr"), width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # PORTFOLIO CREDIT LOSS
+    # -------------------------------------------------
+    st.markdown("### 🎲 Portfolio Credit-Loss Simulation")
+    st.caption("PD from FH, LGD from collateral / LTV, sector one-factor correlated defaults.")
+
+    c1, c2 = st.columns(2)
+    n_scenarios = c1.number_input("Scenarios", min_value=10_000, value=1_000_000, step=100_000)
+    seed = c2.number_input("Seed", min_value=0, value=20240331, step=1)
+
+    if st.button("Run Simulation"):
+        from model.credit_loss import run_simulation
+
+        with st.spinner("Simulating…"):
+            st.session_state["credit_loss"] = run_simulation(n_scenarios=int(n_scenarios), seed=int(seed))
+
+    if "credit_loss" in st.session_state:
+        summary, sectors = st.session_state["credit_loss"]
+        c1, c2 = st.columns([1, 2])
+        c1.dataframe(summary.rename("value").to_frame(), width="stretch")
+        c2.dataframe(sectors, width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # GROUP EXPOSURE
+    # -------------------------------------------------
+    st.markdown("### 🕸️ Group Exposure")
+    st.caption("Borrowers linked through shared PAN, guarantor or promoter identifiers.")
+
+    if st.button("Show Borrower Groups"):
+        from model.group_exposure import get_group_index
+
+        with st.spinner("Linking borrowers…"):
+            t0 = time.perf_counter()
+            index = get_group_index()
+            st.session_state["group_exposure"] = (
+                index.groups(), len(index), index.noisy_identifiers()[:20], time.perf_counter() - t0
+            )
+
+    if "group_exposure" in st.session_state:
+        groups, n_borrowers, noisy, secs = st.session_state["group_exposure"]
+        st.caption(f"{len(groups):,} linked groups across {n_borrowers:,} borrowers ({secs:.2f} s)")
+        if groups.empty:
+            st.info(
+                "No borrowers share an identifier. In the current master, guarantor "
+                "entries are only Yes/No, promoter notes carry no PAN or DIN, and "
+                "no PAN repeats across borrowers. Groups appear as applications "
+                "with named guarantors are saved."
+            )
+        else:
+            st.dataframe(groups, width="stretch")
+        if noisy:
+            with st.expander("Identifiers ignored as too common"):
+                st.dataframe(pd.DataFrame(noisy, columns=["identifier", "borrowers"]), width="stretch")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # SCORECARD CHAMPION / CHALLENGER
+    # -------------------------------------------------
+    st.markdown("### 🏆 Scorecard Champion vs Challenger")
+
+    from model.scorecard import SCORECARD_PATH, CHALLENGER_PATH, get_scorecard_file
+
+    champion_file = get_scorecard_file(SCORECARD_PATH)
+    try:
+        live = champion_file.get()
+        st.caption(f"Live scorecard: {live.name} ({live.digest}) from {SCORECARD_PATH}")
+    except Exception as e:
+        live = None
+        st.error(f"Scorecard failed to load: {e}")
+    if champion_file.last_error:
+        st.warning(f"Latest edit rejected, still serving the previous definition: {champion_file.last_error}")
+
+    challenger_path = st.text_input("Challenger definition (JSON path)", value=CHALLENGER_PATH or "")
+
+    if live is not None and challenger_path and st.button("Compare on Master Portfolio"):
+        from model.scorecard import score_side_by_side
+        from model.bands import band_number
+        from model.ews_model import load_master, build_features
+
+        try:
+            challenger = get_scorecard_file(challenger_path).get()
+        except Exception as e:
+            st.error(f"Challenger failed to load: {e}")
+        else:
+            with st.spinner("Scoring portfolio with both scorecards…"):
+                features = build_features(load_master(), entity_col="Company Name", scorecard=live)
+                both = score_side_by_side([live, challenger], features)
+
+            champ, chall = both.iloc[:, 0].to_numpy(), both.iloc[:, 1].to_numpy()
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Mean FH (champion)", f"{np.nanmean(champ):.1f}")
+            c2.metric("Mean FH (challenger)", f"{np.nanmean(chall):.1f}", f"{np.nanmean(chall - champ):+.2f}")
+            c3.metric("Band changed", f"{np.mean(band_number(champ) != band_number(chall)) * 100:.1f}%")
+
+            st.dataframe(
+                pd.crosstab(
+                    pd.Series(band_number(champ), name="champion band"),
+                    pd.Series(band_number(chall), name="challenger band"),
+                ),
+                width="stretch"
+            )
+
+    st.divider()
+
+    # -------------------------------------------------
+    # VALIDATION CACHE
+    # -------------------------------------------------
+    st.markdown("### 🧮 Identifier Validation Cache")
+
+    stats = pd.DataFrame(cache_stats()).T
+    stats["hit_rate"] = (stats["hit_rate"] * 100).round(1)
+    st.dataframe(stats.rename(columns={"hit_rate": "hit_rate (%)"}), width="stretch")
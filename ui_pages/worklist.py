@@ -0,0 +1,142 @@
+import math
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+from storage.application_store import get_application_store, STATUSES
+from ui_pages.app_state import open_application
+
+PAGE_SIZE = 25
+
+SORT_OPTIONS = {
+    "Last Updated": "updated_at",
+    "Created": "created_at",
+    "Company Name": "company_name",
+    "Loan Amount": "loan_amount_cr",
+    "FH Score": "fh_score",
+    "Status": "status",
+}
+
+
+def render_worklist():
+
+    st.subheader("🗂️ Underwriter Worklist")
+
+    store = get_application_store()
+
+    # --------------------------------------------------
+    # FILTERS
+    # --------------------------------------------------
+    f1, f2, f3, f4 = st.columns(4)
+
+    with f1:
+        status = st.selectbox("Status", ["All"] + STATUSES, key="wl_status")
+
+    with f2:
+        sector = st.selectbox("Sector", ["All"] + store.distinct_sectors(), key="wl_sector")
+
+    with f3:
+        loan_min, loan_max = st.slider(
+            "Loan Amount (₹ Cr)", 0.0, 1000.0, (0.0, 1000.0), key="wl_loan"
+        )
+
+    with f4:
+        fh_min, fh_max = st.slider("FH Score", 0, 100, (0, 100), key="wl_fh")
+
+    s1, s2, s3 = st.columns([2, 1, 1])
+
+    with s1:
+        sort_label = st.selectbox("Sort by", list(SORT_OPTIONS), key="wl_sort")
+
+    with s2:
+        descending = st.radio("Order", ["Desc", "Asc"], horizontal=True, key="wl_order") == "Desc"
+
+    # open-ended range ends mean "no filter", so NULL amounts / scores still show
+    query = dict(
+        status=None if status == "All" else status,
+        sector=None if sector == "All" else sector,
+        min_loan=loan_min or None,
+        max_loan=loan_max if loan_max < 1000.0 else None,
+        min_fh=fh_min or None,
+        max_fh=fh_max if fh_max < 100 else None,
+        sort=SORT_OPTIONS[sort_label],
+        descending=descending,
+    )
+
+    # reset to page 1 whenever the query changes
+    if st.session_state.get("wl_query") != query:
+        st.session_state.wl_query = query
+        st.session_state.wl_page = 1
+
+    # --------------------------------------------------
+    # PAGE QUERY (only the visible page is materialized)
+    # --------------------------------------------------
+    rows, total = store.list_applications(
+        **query, page=st.session_state.wl_page, page_size=PAGE_SIZE
+    )
+    pages = max(math.ceil(total / PAGE_SIZE), 1)
+
+    with s3:
+        st.metric("Applications", f"{total:,}")
+
+    if not rows:
+        st.info("No applications match the filters.")
+        return
+
+    df = pd.DataFrame(rows)
+    df["updated_at"] = df["updated_at"].map(
+        lambda t: datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M")
+    )
+    df = df.rename(columns={
+        "app_id": "Application",
+        "company_name": "Company",
+        "pan": "PAN",
+        "sector": "Sector",
+        "status": "Status",
+        "loan_amount_cr": "Loan (₹ Cr)",
+        "fh_score": "FH Score",
+        "updated_at": "Updated",
+    })
+
+    st.dataframe(df, hide_index=True, width="stretch")
+
+    # --------------------------------------------------
+    # PAGINATION
+    # --------------------------------------------------
+    p1, p2, p3 = st.columns([1, 2, 1])
+
+    with p1:
+        if st.button("⬅ Prev", disabled=st.session_state.wl_page <= 1, width="stretch"):
+            st.session_state.wl_page -= 1
+            st.rerun()
+
+    with p2:
+        st.caption(f"Page {st.session_state.wl_page} of {pages:,}")
+
+    with p3:
+        if st.button("Next ➡", disabled=st.session_state.wl_page >= pages, width="stretch"):
+            st.session_state.wl_page += 1
+            st.rerun()
+
+    # --------------------------------------------------
+    # OPEN APPLICATION
+    # --------------------------------------------------
+    st.divider()
+    o1, o2 = st.columns([3, 1])
+
+    with o1:
+        app_id = st.selectbox(
+            "Open application",
+            [r["app_id"] for r in rows],
+            format_func=lambda a: next(
+                f"{a} · {r['company_name'] or 'Unnamed'}" for r in rows if r["app_id"] == a
+            )
+        )
+
+    with o2:
+        st.write("")
+        if st.button("Open ➡️", width="stretch"):
+            open_application(app_id)
+            st.session_state.page = "Borrower Profile"
+            st.rerun()
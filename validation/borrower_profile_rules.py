@@ -1,8 +1,14 @@
 import re
-from .cin_validator import validate_cin
-from .pan_validator import validate_pan
-from .gstin_validator import validate_gstin
+from .cached_validators import (
+    cached_validate_cin,
+    cached_validate_pan,
+    cached_validate_gstin,
+)
 from .pincode_validator import validate_and_resolve_pincode
+from .registry_client import verify_identifiers
+
+EMAIL_PATTERN = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+PHONE_PATTERN = re.compile(r"\d{10}")
 
 
 def validate_borrower_profile(data: dict):
@@ -23,23 +29,38 @@ def validate_borrower_profile(data: dict):
         errors.append("Registration Date is mandatory")
 
     # ---------------- CIN ----------------
-    cin_ok, cin_msg = validate_cin(data.get("cin"))
+    cin_ok, cin_msg = cached_validate_cin(data.get("cin"))
     if not cin_ok:
         errors.append(cin_msg)
 
     # ---------------- PAN ----------------
-    pan_ok, pan_msg = validate_pan(data.get("pan"))
+    pan_ok, pan_msg = cached_validate_pan(data.get("pan"))
     if not pan_ok:
         errors.append(pan_msg)
 
     # ---------------- GSTIN ----------------
-    gst_ok, gst_msg = validate_gstin(
+    gst_ok, gst_msg = cached_validate_gstin(
         data.get("gstin"),
         data.get("pan")
     )
     if not gst_ok:
         errors.append(gst_msg)
 
+    # ---------------- Registry (REGISTRY_API_URL) ----------------
+    # only well-formed identifiers are looked up; a registry that is
+    # slow or down leaves them unverified rather than failing the form
+    warnings = []
+    checked = {
+        kind: data.get(kind)
+        for kind, ok in (("cin", cin_ok), ("pan", pan_ok), ("gstin", gst_ok))
+        if ok and data.get(kind)
+    }
+    for kind, (status, msg) in verify_identifiers(checked).items():
+        if status == "rejected":
+            errors.append(msg)
+        elif status == "unverified":
+            warnings.append(f"{kind.upper()} not verified against the registry: {msg}")
+
     # ---------------- Address ----------------
     if not data.get("address"):
         errors.append("Registered Address is mandatory")
@@ -66,16 +87,16 @@ def validate_borrower_profile(data: dict):
     if not email:
         errors.append("Email is mandatory")
     else:
-        email_regex = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
-        if not re.fullmatch(email_regex, email.strip()):
+        if not EMAIL_PATTERN.fullmatch(email.strip()):
             errors.append("Invalid Email format")
 
     # ---------------- Phone ----------------
-    if not re.fullmatch(r"\d{10}", data.get("phone") or ""):
+    if not PHONE_PATTERN.fullmatch(data.get("phone") or ""):
         errors.append("Phone number must be exactly 10 digits")
 
     return {
         "is_valid": len(errors) == 0,
         "errors": errors,
+        "warnings": warnings,
         "normalized_data": data
     }
@@ -0,0 +1,109 @@
+from datetime import date
+from functools import lru_cache
+
+from .cin_validator import validate_cin
+from .pan_validator import validate_pan
+from .gstin_validator import validate_gstin
+from .aadhaar_validator import validate_aadhaar
+from telemetry.recorder import timed
+
+# ---------------------------------------------------------------
+# Memoized identifier validation
+#
+# Streamlit reruns the whole page on every widget change, so the
+# same identifiers get validated over and over. Results are cached
+# at module level (shared by every session in the server process)
+# and keyed by the normalized identifier.
+# ---------------------------------------------------------------
+
+CACHE_SIZE = 4096
+
+
+# ---------------- Normalization ----------------
+
+def normalize_identifier(value: str):
+    return (value or "").strip().upper()
+
+
+def normalize_aadhaar(value: str):
+    return (value or "").strip().replace(" ", "")
+
+
+# ---------------- Cached cores ----------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cin(cin: str, current_year: int):
+    return validate_cin(cin, current_year=current_year)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _pan(pan: str):
+    return validate_pan(pan)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _gstin(gstin: str, pan: str):
+    return validate_gstin(gstin, pan)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _aadhaar(aadhaar: str):
+    return validate_aadhaar(aadhaar)
+
+
+# ---------------- Public API (same (bool, message) contract) ----------------
+
+@timed("validation")
+def cached_validate_cin(cin: str):
+    # the year is part of the key so results roll over on 1 January
+    return _cin(normalize_identifier(cin), date.today().year)
+
+
+@timed("validation")
+def cached_validate_pan(pan: str):
+    return _pan(normalize_identifier(pan))
+
+
+@timed("validation")
+def cached_validate_gstin(gstin: str, pan: str):
+    return _gstin(normalize_identifier(gstin), normalize_identifier(pan))
+
+
+@timed("validation")
+def cached_validate_aadhaar(aadhaar: str):
+    return _aadhaar(normalize_aadhaar(aadhaar))
+
+
+# ---------------- Statistics ----------------
+
+_CACHES = {
+    "cin": _cin,
+    "pan": _pan,
+    "gstin": _gstin,
+    "aadhaar": _aadhaar,
+}
+
+
+def cache_stats():
+    """
+    Returns per-validator cache statistics:
+    {name: {hits, misses, hit_rate, size, maxsize}}
+    """
+
+    stats = {}
+    for name, fn in _CACHES.items():
+        info = fn.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def clear_validation_cache():
+    for fn in _CACHES.values():
+        fn.cache_clear()
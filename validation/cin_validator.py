@@ -26,13 +26,18 @@ VALID_COMPANY_TYPES = {
     "LLP"   # Limited Liability Partnership
 }
 
+CIN_PATTERN = re.compile(r"^[LU]\d{5}[A-Z]{2}\d{4}[A-Z]{3}\d{6}$")
+
 
 # ---------------- Validator ----------------
 
-def validate_cin(cin: str):
+def validate_cin(cin: str, current_year: int = None):
     """
     Validates Corporate Identification Number (CIN)
 
+    current_year defaults to date.today().year; callers that memoize
+    results pass it explicitly so the cache key rolls over with the year.
+
     Returns:
         (bool, message)
     """
@@ -47,8 +52,7 @@ def validate_cin(cin: str):
         return False, "CIN must be exactly 21 characters"
 
     # ---------------- Structural Pattern ----------------
-    pattern = r"^[LU]\d{5}[A-Z]{2}\d{4}[A-Z]{3}\d{6}$"
-    if not re.fullmatch(pattern, cin):
+    if not CIN_PATTERN.fullmatch(cin):
         return False, "CIN format is invalid"
 
     # ---------------- Listing Status ----------------
@@ -73,7 +77,8 @@ def validate_cin(cin: str):
         return False, "Year of incorporation in CIN must be numeric"
 
     year = int(year_str)
-    current_year = date.today().year
+    if current_year is None:
+        current_year = date.today().year
 
     if year < 1950:
         return False, "Year of incorporation cannot be before 1950"
@@ -0,0 +1,280 @@
+import re
+import threading
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# ---------------------------------------------------------------
+# Entity resolution for borrowers
+#
+# Hash indexes on PAN, the PAN embedded in GSTIN and CIN give exact
+# collisions in O(1). Company names are normalized and bucketed by a
+# blocking key, so fuzzy comparison only runs inside small blocks.
+# Building the index over the master is O(n). Each saved profile
+# costs O(block size), not a pairwise pass over every entity.
+# ---------------------------------------------------------------
+
+MASTER_PATH = "data/Indian_Companies_EWS_READY_WITH_FY2025.xlsx"
+
+NAME_MATCH_THRESHOLD = 0.88
+MAX_BLOCK_COMPARISONS = 200
+
+LEGAL_SUFFIXES = {
+    "PVT", "PRIVATE", "LTD", "LIMITED", "LLP", "CO", "COMPANY",
+    "CORP", "CORPORATION", "INC", "THE", "AND", "OPC", "PLC",
+}
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+# ---------------- Normalization ----------------
+
+def normalize_company_name(name):
+    s = _NON_ALNUM.sub(" ", str(name or "").upper().replace("&", " AND "))
+    tokens = [t for t in _SPACES.split(s) if t and t not in LEGAL_SUFFIXES]
+    return " ".join(tokens)
+
+
+def _clean_id(value):
+    if value is None or (isinstance(value, float) and value != value):   # NaN
+        return ""
+    return str(value).strip().upper()
+
+
+def gstin_pan(gstin):
+    gstin = _clean_id(gstin)
+    return gstin[2:12] if len(gstin) == 15 else ""
+
+
+def _block_keys(norm):
+    """
+    Two blocking keys per name: the first 4 characters of the name and
+    the sorted token set ("AARNA AGRO" == "AGRO AARNA").
+    """
+    if not norm:
+        return []
+    return ["P:" + norm[:4], "T:" + " ".join(sorted(norm.split()))]
+
+
+def name_similarity(a, b):
+    return SequenceMatcher(None, a, b).ratio()
+
+
+# ---------------- Index ----------------
+
+class EntityIndex:
+
+    def __init__(self):
+        self.records = {}        # record_id -> dict
+        self.by_pan = {}         # PAN -> set(record_id), incl. GSTIN-embedded PAN
+        self.by_cin = {}
+        self.by_gstin = {}
+        self.blocks = {}         # block key -> [record_id]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.records)
+
+    # ---------- matching ----------
+
+    def match(self, company_name=None, pan=None, gstin=None, cin=None, exclude=None):
+        """
+        Returns candidate duplicates for a profile as a list of
+        {record_id, company_name, reason, score}, best first.
+        """
+
+        pan = _clean_id(pan)
+        cin = _clean_id(cin)
+        gstin = _clean_id(gstin)
+        g_pan = gstin_pan(gstin)
+        norm = normalize_company_name(company_name)
+
+        hits = {}
+
+        def hit(rid, reason, score):
+            if rid == exclude:
+                return
+            prev = hits.get(rid)
+            if prev is None or score > prev[1]:
+                hits[rid] = (reason, score)
+
+        for key, index, reason in [
+            (pan, self.by_pan, "PAN"),
+            (g_pan, self.by_pan, "GSTIN-embedded PAN"),
+            (gstin, self.by_gstin, "GSTIN"),
+            (cin, self.by_cin, "CIN"),
+        ]:
+            if key:
+                for rid in index.get(key, ()):
+                    hit(rid, reason, 1.0)
+
+        seen = set()
+        for bk in _block_keys(norm):
+            for rid in self.blocks.get(bk, ())[-MAX_BLOCK_COMPARISONS:]:
+                if rid in seen:
+                    continue
+                seen.add(rid)
+                other = self.records[rid]["norm"]
+                score = 1.0 if other == norm else name_similarity(norm, other)
+                if score >= NAME_MATCH_THRESHOLD:
+                    hit(rid, "Company name", round(score, 3))
+
+        out = [
+            {
+                "record_id": rid,
+                "company_name": self.records[rid]["company_name"],
+                "reason": reason,
+                "score": score,
+            }
+            for rid, (reason, score) in hits.items()
+        ]
+        return sorted(out, key=lambda m: -m["score"])
+
+    # ---------- incremental insert ----------
+
+    def add(self, record_id, company_name=None, pan=None, gstin=None, cin=None, check=True):
+        """
+        Indexes (or re-indexes) one entity and returns the matches it
+        collided with at insert time (skipped when check=False).
+        """
+
+        with self._lock:
+            if record_id in self.records:
+                self._remove(record_id)
+
+            matches = (
+                self.match(company_name, pan, gstin, cin, exclude=record_id)
+                if check else []
+            )
+
+            rec = {
+                "company_name": company_name,
+                "norm": normalize_company_name(company_name),
+                "pan": _clean_id(pan),
+                "gstin": _clean_id(gstin),
+                "cin": _clean_id(cin),
+            }
+            self.records[record_id] = rec
+
+            for key in {rec["pan"], gstin_pan(rec["gstin"])} - {""}:
+                self.by_pan.setdefault(key, set()).add(record_id)
+            if rec["gstin"]:
+                self.by_gstin.setdefault(rec["gstin"], set()).add(record_id)
+            if rec["cin"]:
+                self.by_cin.setdefault(rec["cin"], set()).add(record_id)
+            for bk in _block_keys(rec["norm"]):
+                self.blocks.setdefault(bk, []).append(record_id)
+
+            return matches
+
+    def _remove(self, record_id):
+        rec = self.records.pop(record_id)
+        for key in {rec["pan"], gstin_pan(rec["gstin"])} - {""}:
+            self.by_pan.get(key, set()).discard(record_id)
+        self.by_gstin.get(rec["gstin"], set()).discard(record_id)
+        self.by_cin.get(rec["cin"], set()).discard(record_id)
+        for bk in _block_keys(rec["norm"]):
+            ids = self.blocks.get(bk, [])
+            if record_id in ids:
+                ids.remove(record_id)
+
+    # ---------- portfolio reports ----------
+
+    def identifier_conflicts(self):
+        """
+        PAN / CIN keys shared by more than one distinct company name.
+        Returns a DataFrame: key_type, key, n_names, company_names.
+        """
+
+        import pandas as pd
+
+        rows = []
+        for key_type, index in [("PAN", self.by_pan), ("CIN", self.by_cin)]:
+            for key, ids in index.items():
+                names = {self.records[i]["norm"] for i in ids}
+                if len(names) > 1:
+                    rows.append({
+                        "key_type": key_type,
+                        "key": key,
+                        "n_names": len(names),
+                        "company_names": sorted(self.records[i]["company_name"] for i in ids),
+                    })
+        return pd.DataFrame(rows, columns=["key_type", "key", "n_names", "company_names"])
+
+    def fuzzy_duplicates(self):
+        """
+        Near-identical company names, compared only within blocks.
+        Returns a DataFrame: record_a, record_b, score.
+        """
+
+        import pandas as pd
+
+        pairs = {}
+        for ids in self.blocks.values():
+            ids = ids[-MAX_BLOCK_COMPARISONS:]
+            for i, a in enumerate(ids):
+                na = self.records[a]["norm"]
+                for b in ids[i + 1:]:
+                    key = (a, b) if str(a) < str(b) else (b, a)
+                    if key in pairs:
+                        continue
+                    score = name_similarity(na, self.records[b]["norm"])
+                    if score >= NAME_MATCH_THRESHOLD:
+                        pairs[key] = round(score, 3)
+
+        return pd.DataFrame(
+            [(a, b, s) for (a, b), s in pairs.items()],
+            columns=["record_a", "record_b", "score"],
+        )
+
+
+# ---------------- Bulk build over the master ----------------
+
+def build_entity_index(df):
+    """
+    Bulk-indexes a master-style frame. Rows are collapsed to distinct
+    (Company Name, PAN, GSTIN, CIN) entities first, because the master
+    repeats identifiers across FY rows.
+    """
+
+    df = df.copy()
+    df.columns = [c.strip() for c in df.columns]
+    cols = [c for c in ["Company Name", "PAN", "GSTIN", "CIN Number"] if c in df.columns]
+    entities = df[cols].dropna(subset=["Company Name"]).drop_duplicates()
+
+    index = EntityIndex()
+    for i, row in enumerate(entities.itertuples(index=False)):
+        r = dict(zip(cols, row))
+        index.add(
+            f"master:{i}",
+            company_name=r.get("Company Name"),
+            pan=r.get("PAN"),
+            gstin=r.get("GSTIN"),
+            cin=r.get("CIN Number"),
+            check=False,
+        )
+    return index
+
+
+@lru_cache(maxsize=1)
+def get_entity_index():
+    """
+    Process-wide index over the master, shared by every session.
+    """
+    from ingest.master_store import load_compact_master
+
+    return build_entity_index(load_compact_master(MASTER_PATH))
+
+
+def register_profile(record_id, profile: dict):
+    """
+    Incremental hook for Borrower Profile "Save & Continue".
+    Returns the list of colliding entities (empty when unique).
+    """
+    return get_entity_index().add(
+        record_id,
+        company_name=profile.get("company_name"),
+        pan=profile.get("pan"),
+        gstin=profile.get("gstin"),
+        cin=profile.get("cin"),
+    )
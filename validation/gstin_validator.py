@@ -6,6 +6,7 @@ GSTIN_REGEX = (
     r"[A-Z]{3}[PCHFTABGJKLE][A-Z][0-9]{4}[A-Z]"
     r"[0-9A-Z]Z[0-9A-Z]"
 )
+GSTIN_PATTERN = re.compile(GSTIN_REGEX)
 
 def validate_gstin(gstin: str, pan: str):
     if not gstin:
@@ -13,7 +14,7 @@ def validate_gstin(gstin: str, pan: str):
 
     gstin = gstin.upper().strip()
 
-    if not re.fullmatch(GSTIN_REGEX, gstin):
+    if not GSTIN_PATTERN.fullmatch(gstin):
         return False, "Invalid GSTIN format"
 
     embedded_pan = gstin[2:12]
@@ -1,6 +1,7 @@
 import re
 
 PAN_REGEX = r"^[A-Z]{3}[PCHFTABGJKLE][A-Z][0-9]{4}[A-Z]$"
+PAN_PATTERN = re.compile(PAN_REGEX)
 
 def validate_pan(pan: str):
     if not pan:
@@ -8,7 +9,7 @@ def validate_pan(pan: str):
 
     pan = pan.strip().upper()
 
-    if not re.fullmatch(PAN_REGEX, pan):
+    if not PAN_PATTERN.fullmatch(pan):
         return False, "Invalid PAN format (e.g. AAACR5055K)"
 
     return True, "VALID"
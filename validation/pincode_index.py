@@ -0,0 +1,100 @@
+from bisect import bisect_left
+from functools import lru_cache
+
+from .pincode_master import load_pincode_master
+
+# ---------------------------------------------------------------
+# Pincode prefix index
+#
+# The India Post master is loaded once per process into sorted
+# parallel arrays. A typed prefix maps to a contiguous slice of the
+# sorted codes, found with two binary searches, so autocomplete
+# after 2-5 digits costs O(log n + k) instead of a full scan.
+# ---------------------------------------------------------------
+
+
+class PincodeIndex:
+
+    def __init__(self, df):
+        df = (
+            df.dropna(subset=["pincode"])
+            .drop_duplicates(subset=["pincode"])
+            .sort_values("pincode")
+        )
+
+        self._codes = df["pincode"].tolist()
+        self._cities = [str(c).title() for c in df["city"]]
+        self._states = [str(s).title() for s in df["state"]]
+
+        # reverse lookup: district -> pincodes (sorted)
+        self._by_district = {}
+        for code, city, state in zip(self._codes, self._cities, self._states):
+            self._by_district.setdefault(city.lower(), []).append((code, city, state))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _range(self, prefix):
+        lo = bisect_left(self._codes, prefix)
+        # next string after every code starting with prefix
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        hi = bisect_left(self._codes, upper, lo)
+        return lo, hi
+
+    def lookup(self, pincode):
+        """
+        Exact match. Returns (city, state) or None.
+        """
+        i = bisect_left(self._codes, pincode)
+        if i < len(self._codes) and self._codes[i] == pincode:
+            return self._cities[i], self._states[i]
+        return None
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to `limit` (pincode, city, state) tuples whose
+        pincode starts with the typed digits.
+        """
+        if not prefix:
+            return []
+        lo, hi = self._range(prefix)
+        hi = min(hi, lo + limit)
+        return [
+            (self._codes[i], self._cities[i], self._states[i])
+            for i in range(lo, hi)
+        ]
+
+    def count_prefix(self, prefix):
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def by_district(self, district):
+        """
+        Reverse lookup for address entry: all pincodes of a district.
+        """
+        return list(self._by_district.get((district or "").strip().lower(), []))
+
+    def districts(self):
+        return sorted(set(self._cities))
+
+
+@lru_cache(maxsize=1)
+def get_pincode_index():
+    return PincodeIndex(load_pincode_master())
+
+
+def suggest_pincodes(prefix, limit=10):
+    """
+    Autocomplete helper: no suggestions when the pincode master is absent.
+    """
+    try:
+        return get_pincode_index().prefix(prefix, limit)
+    except FileNotFoundError:
+        return []
+
+
+def pincodes_for_district(district):
+    try:
+        return get_pincode_index().by_district(district)
+    except FileNotFoundError:
+        return []
@@ -1,8 +1,9 @@
-import pandas as pd
 import os
 import csv
 
 def load_pincode_master():
+    import pandas as pd   # deferred: keeps the form pages' import light
+
     base_dir = os.path.dirname(os.path.dirname(__file__))
     file_path = os.path.join(base_dir, "data", "india_pincode.csv")
 
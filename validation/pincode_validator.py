@@ -1,6 +1,10 @@
 import re
-from .pincode_master import load_pincode_master
+from .pincode_index import get_pincode_index
+from telemetry.recorder import timed
 
+PINCODE_PATTERN = re.compile(r"\d{6}")
+
+@timed("validation")
 def validate_and_resolve_pincode(pincode: str):
     """
     Returns:
@@ -10,16 +14,14 @@ def validate_and_resolve_pincode(pincode: str):
     if not pincode:
         return False, "Pincode is mandatory", None, None
 
-    if not re.fullmatch(r"\d{6}", pincode):
+    if not PINCODE_PATTERN.fullmatch(pincode):
         return False, "Pincode must be exactly 6 digits", None, None
 
-    df = load_pincode_master()
-    row = df[df["pincode"] == pincode]
+    match = get_pincode_index().lookup(pincode)
 
-    if row.empty:
+    if match is None:
         return False, "Pincode not found in India Post records", None, None
 
-    city = row.iloc[0]["city"].title()
-    state = row.iloc[0]["state"].title()
+    city, state = match
 
     return True, None, city, state
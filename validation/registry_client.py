@@ -0,0 +1,434 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# ---------------------------------------------------------------
+# Registry verification client (CIN / GSTIN / PAN)
+#
+# The syntactic validators only tell us an identifier *looks* right.
+# This client checks it against the registry APIs without blocking
+# the Streamlit script thread: all I/O runs on one background
+# asyncio loop shared by every session in the process.
+#
+#   - keep-alive HTTP/1.1 connection pool
+#   - lookups for the same kind are batched into one request
+#   - a semaphore caps in-flight requests
+#   - retry with exponential backoff on network / 5xx errors
+#   - TTL cache of registry answers
+#
+# Forms call verify_identifiers(): every lookup runs in parallel
+# against one short deadline (REGISTRY_VERIFY_TIMEOUT_S). A slow or
+# unreachable registry leaves the identifier "unverified" instead of
+# holding up the save.
+#
+# Wire format (see registry_stub.py):
+#   POST /verify   {"kind": "cin", "ids": ["...", ...]}
+#   200            {"results": {"<id>": {"valid": bool, "message": str}}}
+# ---------------------------------------------------------------
+
+REGISTRY_URL_ENV = "REGISTRY_API_URL"
+SUPPORTED_KINDS = {"cin", "gstin", "pan"}
+
+# total wait for the form-save check; slower answers stay "unverified"
+VERIFY_TIMEOUT_S = float(os.environ.get("REGISTRY_VERIFY_TIMEOUT_S", "1.0"))
+
+
+class RegistryError(Exception):
+    pass
+
+
+# ---------------- Connection pool ----------------
+
+class _ConnectionPool:
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle = asyncio.LifoQueue()
+        self._opened = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self._idle.empty():
+            async with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return await asyncio.open_connection(self.host, self.port)
+                    except Exception:
+                        self._opened -= 1
+                        raise
+        return await self._idle.get()
+
+    def release(self, conn, reusable=True):
+        if reusable:
+            self._idle.put_nowait(conn)
+        else:
+            conn[1].close()
+            self._opened -= 1
+
+    async def close(self):
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+        self._opened = 0
+
+
+# ---------------- Client ----------------
+
+class RegistryClient:
+
+    def __init__(
+        self,
+        base_url,
+        pool_size=8,
+        max_concurrency=16,
+        batch_size=50,
+        batch_window=0.01,
+        retries=3,
+        backoff=0.2,
+        cache_ttl=3600,
+        timeout=5.0,
+    ):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only http:// registry endpoints are supported")
+
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = (parts.path.rstrip("/") or "") + "/verify"
+
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+
+        self._pool = None
+        self._semaphore = None
+        self._pending = {}     # kind -> {id: [futures]}
+        self._flushers = {}    # kind -> scheduled flush task
+        self._cache = {}       # (kind, id) -> (expires_at, (bool, message))
+
+        self.stats = {"requests": 0, "retries": 0, "cache_hits": 0, "lookups": 0}
+
+    # ---------- lifecycle (must run on the client's loop) ----------
+
+    def _ensure_started(self):
+        if self._pool is None:
+            self._pool = _ConnectionPool(self.host, self.port, self.pool_size)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+
+    # ---------- HTTP ----------
+
+    async def _post_once(self, payload):
+        body = json.dumps(payload).encode()
+        head = (
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode()
+
+        reader, writer = conn = await self._pool.acquire()
+        reusable = False
+        try:
+            writer.write(head + body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Registry closed the connection")
+            status = int(status_line.split()[1])
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = line.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+
+            data = await reader.readexactly(int(headers.get("content-length", 0)))
+            reusable = headers.get("connection", "").lower() != "close"
+        finally:
+            self._pool.release(conn, reusable)
+
+        if status >= 500:
+            raise ConnectionError(f"Registry returned HTTP {status}")
+        if status != 200:
+            raise RegistryError(f"Registry returned HTTP {status}")
+
+        return json.loads(data)
+
+    async def _post(self, payload):
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.stats["requests"] += 1
+                    return await asyncio.wait_for(self._post_once(payload), self.timeout)
+                except (ConnectionError, OSError, asyncio.TimeoutError,
+                        asyncio.IncompleteReadError) as exc:
+                    if attempt == self.retries:
+                        raise RegistryError(f"Registry unreachable: {exc}") from exc
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * (2 ** attempt))
+
+    # ---------- batching ----------
+
+    async def _flush(self, kind):
+        await asyncio.sleep(self.batch_window)
+        self._flushers.pop(kind, None)
+        pending = self._pending.pop(kind, {})
+
+        ids = list(pending)
+        for i in range(0, len(ids), self.batch_size):
+            chunk = ids[i:i + self.batch_size]
+            asyncio.ensure_future(self._send_batch(kind, chunk, pending))
+
+    def _flush_now(self, kind):
+        pending = self._pending.pop(kind, {})
+        asyncio.ensure_future(self._send_batch(kind, list(pending), pending))
+
+    async def _send_batch(self, kind, ids, pending):
+        try:
+            response = await self._post({"kind": kind, "ids": ids})
+            results = response.get("results", {})
+        except Exception as exc:
+            if not isinstance(exc, RegistryError):
+                exc = RegistryError(f"Registry verification failed: {exc}")
+            for ident in ids:
+                for fut in pending[ident]:
+                    if not fut.done():
+                        fut.set_exception(exc)
+            return
+
+        expires = time.monotonic() + self.cache_ttl
+        for ident in ids:
+            r = results.get(ident)
+            if r is None:
+                answer = (False, "Not found in registry")
+            else:
+                answer = (bool(r.get("valid")), r.get("message", ""))
+                self._cache[(kind, ident)] = (expires, answer)
+            for fut in pending[ident]:
+                if not fut.done():
+                    fut.set_result(answer)
+
+    # ---------- public (coroutines) ----------
+
+    async def verify(self, kind, identifier):
+        """
+        Verifies one identifier against the registry.
+        Returns (bool, message)
+        """
+
+        try:
+            return await self.lookup(kind, identifier)
+        except RegistryError as exc:
+            return False, str(exc)
+
+    async def lookup(self, kind, identifier):
+        """
+        As verify(), but an unreachable registry raises RegistryError
+        instead of reading as an invalid identifier.
+        """
+
+        kind = kind.lower()
+        if kind not in SUPPORTED_KINDS:
+            raise ValueError(f"Unsupported identifier kind: {kind}")
+
+        identifier = (identifier or "").strip().upper()
+        if not identifier:
+            return False, f"{kind.upper()} is mandatory"
+
+        self._ensure_started()
+        self.stats["lookups"] += 1
+
+        cached = self._cache.get((kind, identifier))
+        if cached and cached[0] > time.monotonic():
+            self.stats["cache_hits"] += 1
+            return cached[1]
+
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(kind, {}).setdefault(identifier, []).append(fut)
+
+        if len(self._pending[kind]) >= self.batch_size:
+            task = self._flushers.pop(kind, None)
+            if task:
+                task.cancel()
+            self._flush_now(kind)
+        elif kind not in self._flushers:
+            self._flushers[kind] = asyncio.ensure_future(self._flush(kind))
+
+        return await fut
+
+    async def verify_many(self, kind, identifiers):
+        return await asyncio.gather(*(self.verify(kind, i) for i in identifiers))
+
+
+# ---------------------------------------------------------------
+# Background loop + sync facade for the Streamlit thread
+# ---------------------------------------------------------------
+
+_loop = None
+_client = None
+_lock = threading.Lock()
+
+
+def _start_loop():
+    loop = asyncio.new_event_loop()
+    t = threading.Thread(target=loop.run_forever, name="registry-client", daemon=True)
+    t.start()
+    return loop
+
+
+def get_registry_client(base_url=None, **kwargs):
+    """
+    Returns the process-wide client, or None when no registry URL is
+    configured (REGISTRY_API_URL).
+    """
+
+    global _loop, _client
+
+    with _lock:
+        if _client is None:
+            base_url = base_url or os.environ.get(REGISTRY_URL_ENV)
+            if not base_url:
+                return None
+            _loop = _start_loop()
+            _client = RegistryClient(base_url, **kwargs)
+    return _client
+
+
+def submit_verification(kind, identifier):
+    """
+    Schedules a registry lookup without blocking.
+    Returns a concurrent.futures.Future resolving to (bool, message),
+    or None when no registry is configured.
+    """
+
+    client = get_registry_client()
+    if client is None:
+        return None
+    return asyncio.run_coroutine_threadsafe(client.verify(kind, identifier), _loop)
+
+
+def verify_identifier(kind, identifier, timeout=5.0):
+    """
+    Blocking registry check with the validators' (bool, message) contract.
+    """
+
+    fut = submit_verification(kind, identifier)
+    if fut is None:
+        return True, "Registry verification not configured"
+
+    try:
+        return fut.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        return False, "Registry verification timed out"
+    except RegistryError as exc:
+        return False, str(exc)
+    except Exception as exc:
+        return False, f"Registry verification failed ({type(exc).__name__}: {exc})"
+
+
+def verify_identifiers(identifiers, timeout=VERIFY_TIMEOUT_S):
+    """
+    Checks {kind: identifier} against the registry in parallel, waiting
+    at most `timeout` seconds in total. Never raises.
+    Returns {kind: (status, message)} with status "verified", "rejected"
+    or "unverified" (slow or unreachable registry); empty when no
+    registry is configured.
+    """
+
+    client = get_registry_client()
+    if client is None:
+        return {}
+
+    futures = {
+        kind: asyncio.run_coroutine_threadsafe(client.lookup(kind, ident), _loop)
+        for kind, ident in identifiers.items()
+    }
+    done, _ = concurrent.futures.wait(futures.values(), timeout=timeout)
+
+    out = {}
+    for kind, fut in futures.items():
+        if fut not in done:
+            # left running: a late answer still lands in the client's cache
+            out[kind] = ("unverified", "Registry verification timed out")
+        elif fut.exception() is not None:
+            exc = fut.exception()
+            out[kind] = ("unverified", str(exc) if isinstance(exc, RegistryError)
+                         else f"Registry verification failed ({type(exc).__name__}: {exc})")
+        else:
+            ok, msg = fut.result()
+            out[kind] = ("verified" if ok else "rejected", msg)
+    return out
+
+
+def verify_cin(cin: str):
+    return verify_identifier("cin", cin)
+
+
+def verify_gstin(gstin: str):
+    return verify_identifier("gstin", gstin)
+
+
+def verify_pan(pan: str):
+    return verify_identifier("pan", pan)
+
+
+# ---------------------------------------------------------------
+# Offline load test against registry_stub
+# ---------------------------------------------------------------
+
+async def _load_test(base_url, n, kind, **kwargs):
+    from .registry_stub import sample_identifiers
+
+    client = RegistryClient(base_url, **kwargs)
+    ids = sample_identifiers(kind, n)
+
+    t0 = time.perf_counter()
+    results = await client.verify_many(kind, ids)
+    elapsed = time.perf_counter() - t0
+    await client.close()
+
+    ok = sum(1 for v, _ in results if v)
+    print(
+        f"{n} {kind.upper()} lookups in {elapsed:.3f}s "
+        f"({n / elapsed:,.0f}/s) | valid={ok} | "
+        f"http_requests={client.stats['requests']} retries={client.stats['retries']}"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Load-test the registry client")
+    ap.add_argument("--url", default="http://127.0.0.1:8765")
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--kind", default="pan", choices=sorted(SUPPORTED_KINDS))
+    ap.add_argument("--pool", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--batch", type=int, default=50)
+    args = ap.parse_args()
+
+    asyncio.run(_load_test(
+        args.url, args.n, args.kind,
+        pool_size=args.pool, max_concurrency=args.concurrency, batch_size=args.batch,
+    ))
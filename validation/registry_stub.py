@@ -0,0 +1,154 @@
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cin_validator import validate_cin
+from .pan_validator import validate_pan
+from .gstin_validator import validate_gstin
+
+# ---------------------------------------------------------------
+# Local stand-in for the CIN / GSTIN / PAN registry APIs.
+#
+# Speaks the same wire format as registry_client.py so the client
+# can be exercised and load-tested offline:
+#
+#   python -m validation.registry_stub --port 8765
+#   python -m validation.registry_client --url http://127.0.0.1:8765
+#
+# An identifier is "registered" when it passes the syntactic
+# validator and its hash does not fall in the unregistered slice.
+# ---------------------------------------------------------------
+
+UNREGISTERED_SHARE = 0.05
+
+
+def _registered(ident):
+    return (zlib.crc32(ident.encode()) % 1000) / 1000 >= UNREGISTERED_SHARE
+
+
+def _lookup(kind, ident):
+    if kind == "cin":
+        ok, msg = validate_cin(ident)
+    elif kind == "pan":
+        ok, msg = validate_pan(ident)
+    elif kind == "gstin":
+        ok, msg = validate_gstin(ident, ident[2:12])
+    else:
+        return {"valid": False, "message": f"Unknown kind: {kind}"}
+
+    if not ok:
+        return {"valid": False, "message": msg}
+    if not _registered(ident):
+        return {"valid": False, "message": f"{kind.upper()} not found in registry"}
+    return {"valid": True, "message": f"{kind.upper()} active in registry"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so the client pool is exercised
+
+    latency = 0.0
+    failure_rate = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not self.path.rstrip("/").endswith("/verify"):
+            return self._reply(404, {"error": "not found"})
+
+        if self.failure_rate and random.random() < self.failure_rate:
+            return self._reply(503, {"error": "registry unavailable"})
+
+        try:
+            req = json.loads(body)
+            kind = str(req["kind"]).lower()
+            ids = list(req["ids"])
+        except (ValueError, KeyError, TypeError):
+            return self._reply(400, {"error": "bad request"})
+
+        self._reply(200, {"results": {i: _lookup(kind, i) for i in ids}})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, latency=0.0, failure_rate=0.0):
+    handler = type("StubHandler", (_Handler,), {
+        "latency": latency,
+        "failure_rate": failure_rate,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(**kwargs):
+    """
+    Starts the stub on a daemon thread. Returns (server, base_url).
+    Pass port=0 to bind a free port.
+    """
+
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+# ---------------- Synthetic identifiers for load tests ----------------
+
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _pan(rng):
+    return (
+        "".join(rng.choice(_LETTERS) for _ in range(3))
+        + rng.choice("PCHFTABGJKLE")
+        + rng.choice(_LETTERS)
+        + f"{rng.randrange(10000):04d}"
+        + rng.choice(_LETTERS)
+    )
+
+
+def sample_identifiers(kind, n, seed=7):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        pan = _pan(rng)
+        if kind == "pan":
+            out.append(pan)
+        elif kind == "gstin":
+            out.append(f"{rng.randrange(1, 38):02d}{pan}{rng.randrange(1, 10)}Z{rng.choice(_LETTERS)}")
+        else:
+            out.append(
+                f"{rng.choice('LU')}{rng.randrange(100000):05d}MH"
+                f"{rng.randrange(1950, 2024)}PTC{rng.randrange(1000000):06d}"
+            )
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Local registry stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    ap.add_argument("--failure-rate", type=float, default=0.0, help="share of 503 replies")
+    args = ap.parse_args()
+
+    srv = make_server(args.host, args.port, args.latency, args.failure_rate)
+    print(f"Registry stub listening on http://{args.host}:{args.port}")
+    srv.serve_forever()